@@ -0,0 +1,61 @@
+"""
+Measure the cold start of `CountryTaxBenefitSystem`, with and without the parameter snapshot.
+
+Each measure runs in a fresh Python process, as a newly spawned worker would.
+
+Usage:
+
+    python benchmarks/cold_start.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from openfisca_canada import snapshot
+
+
+MEASURE = """
+import json, time
+start = time.perf_counter()
+from openfisca_canada import CountryTaxBenefitSystem
+imported = time.perf_counter()
+CountryTaxBenefitSystem()
+built = time.perf_counter()
+print(json.dumps({"import": imported - start, "construction": built - imported}))
+"""
+
+
+def measure(repeat, environment):
+    """Run the constructor `repeat` times in new processes, and return the median timings in seconds."""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", MEASURE], env = environment, check = True, stdout = subprocess.PIPE)
+        runs.append(json.loads(output.stdout))
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    """Print the median cold start timings without and with a snapshot."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type = int, default = 5, help = "number of processes started for each measure")
+    arguments = parser.parse_args()
+
+    environment = {key: value for key, value in os.environ.items() if key != snapshot.SNAPSHOT_DIR_VARIABLE}
+    results = {"without_snapshot": measure(arguments.repeat, environment)}
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        environment[snapshot.SNAPSHOT_DIR_VARIABLE] = snapshot_dir
+        measure(1, environment)  # Write the snapshot
+        results["with_snapshot"] = measure(arguments.repeat, environment)
+
+    for name, timings in results.items():
+        sys.stdout.write(f"{name:<18} import {timings['import'] * 1000:8.1f} ms   construction {timings['construction'] * 1000:8.1f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure the memory and the start time of the runner's worker processes, for each input format.
+
+A synthetic population, drawn by `openfisca_canada.population.generate`, is written as
+a Parquet file of text and numbers, and in the types OpenFisca stores as an Arrow IPC
+file (see `openfisca_canada.columnar`) and a directory of `.npy` files. Each of them is then
+screened by `--workers` processes, and are reported:
+
+- `start`: the time to screen one chunk per worker, from the start of the pool;
+- `rss`, `uss`: the median of the peak resident and private (unique) memory of the
+  workers while screening the whole population. Workers reading Parquet are sent
+  copies of their chunks; workers mapping Arrow IPC files or `.npy` directories share
+  the pages of the files, which count in their `rss` but not in their `uss`.
+
+Requires the `batch` extra (pandas and pyarrow), psutil (installed with OpenFisca-Core)
+and Linux, for the USS.
+
+Usage:
+
+    python benchmarks/mapped_workers.py --rows 2000000 --workers 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import pandas
+import psutil
+
+from openfisca_canada import columnar, CountryTaxBenefitSystem, mapped, population, runner
+
+
+PERIOD = "2021-12-01"
+
+
+class WorkerMemory(threading.Thread):
+    """Sample the peak memory of the child processes of the current one, until stopped."""
+
+    def __init__(self, interval = 0.05):
+        super().__init__(daemon = True)
+        self.interval = interval
+        self.peaks = {}
+        self.stopped = threading.Event()
+
+    def run(self):
+        """Sample until `stop` is called."""
+        while not self.stopped.wait(self.interval):
+            for child in psutil.Process().children():
+                try:
+                    info = child.memory_full_info()
+                except psutil.Error:
+                    continue
+                rss, uss = self.peaks.get(child.pid, (0, 0))
+                self.peaks[child.pid] = (max(rss, info.rss), max(uss, info.uss))
+
+    def stop(self):
+        """Stop sampling, and return the median peak RSS and USS of the workers, in MiB."""
+        self.stopped.set()
+        self.join()
+        return tuple(statistics.median(peaks[index] for peaks in self.peaks.values()) / 2 ** 20 for index in (0, 1))
+
+
+def write_inputs(tax_benefit_system, columns, directory, chunk_size):
+    """Write `columns` to `directory` in each input format, and return the path of each one."""
+    os.makedirs(directory)
+    paths = {
+        "parquet": os.path.join(directory, "persons.parquet"),
+        "arrow": os.path.join(directory, "persons.arrow"),
+        "npy": os.path.join(directory, "persons"),
+        }
+    pandas.DataFrame(columns).to_parquet(paths["parquet"])
+    mapped.save(tax_benefit_system, columns, paths["npy"])
+    # Written chunk by chunk, in the types OpenFisca stores, as the runner writes its results.
+    with runner.ChunkWriter(paths["arrow"]) as writer:
+        for rows in mapped.row_slices(paths["npy"], chunk_size):
+            simulation = mapped.build_simulation(tax_benefit_system, paths["npy"], PERIOD, rows, mark_known = False)
+            writer.write(columnar.results(simulation, PERIOD, list(columns)))
+    return paths
+
+
+def main():
+    """Print the start time and memory of workers for each input format."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type = int, default = 1_000_000, help = "size of the population")
+    parser.add_argument("--workers", type = int, default = 4, help = "number of worker processes")
+    parser.add_argument("--chunk-size", type = int, default = runner.DEFAULT_CHUNK_SIZE, help = "number of rows simulated at once")
+    arguments = parser.parse_args()
+
+    tax_benefit_system = CountryTaxBenefitSystem()
+    columns = population.generate(arguments.rows, seed = 0)
+    first_chunks = {name: column[:arguments.workers * arguments.chunk_size] for name, column in columns.items()}
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, "results.arrow")
+        starts = write_inputs(tax_benefit_system, first_chunks, os.path.join(directory, "start"), arguments.chunk_size)
+        inputs = write_inputs(tax_benefit_system, columns, os.path.join(directory, "all"), arguments.chunk_size)
+        for name, input_path in inputs.items():
+            start = time.perf_counter()
+            runner.run_parallel(starts[name], output_path, PERIOD, arguments.workers, arguments.chunk_size)
+            started = time.perf_counter() - start
+
+            sampler = WorkerMemory()
+            sampler.start()
+            runner.run_parallel(input_path, output_path, PERIOD, arguments.workers, arguments.chunk_size)
+            rss, uss = sampler.stop()
+            sys.stdout.write(f"{name:<8} start {started:6.2f} s   rss {rss:6.1f} MiB   uss {uss:6.1f} MiB\n")
+
+
+if __name__ == "__main__":
+    main()
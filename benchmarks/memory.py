@@ -0,0 +1,82 @@
+"""
+Compare the memory used by a simulation of many persons with and without compact representations.
+
+For each mode, a synthetic population, drawn by `openfisca_canada.population.generate`,
+is screened with `openfisca_canada.batch`, and the memory held by the holders of the
+simulation, the peak memory allocated while calculating, and the calculation time are
+reported:
+
+- `default`: integers and booleans stored with the types OpenFisca gives them, and one
+  `_known` column per input;
+- `compact`: the dtypes of `openfisca_canada.compact.COMPACT_DTYPES`, shared `_known`
+  columns, and booleans packed with one bit per person.
+
+Usage:
+
+    python benchmarks/memory.py --rows 1000000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy
+from openfisca_core.variables import config
+
+from openfisca_canada import batch, compact, CountryTaxBenefitSystem, population
+
+
+def default_tax_benefit_system():
+    """Return a tax and benefit system storing every variable with the type OpenFisca gives it."""
+    tax_benefit_system = CountryTaxBenefitSystem()
+    for name in compact.COMPACT_DTYPES:
+        variable = tax_benefit_system.variables[name]
+        variable.dtype = config.VALUE_TYPES[variable.value_type]["dtype"]
+    return tax_benefit_system
+
+
+def screen(tax_benefit_system, columns, pack_booleans):
+    """Screen `columns` and return the simulation."""
+    simulation = batch.build_simulation(tax_benefit_system, columns, "2021-12-01", pack_booleans = pack_booleans)
+    for name in batch.OUTPUT_VARIABLES:
+        simulation.calculate(name, "2021-12-01")
+    return simulation
+
+
+def measure(tax_benefit_system, columns, pack_booleans):
+    """Return the holders size and the peak allocation, both in MB, and the time in seconds taken to screen `columns`."""
+    start = time.perf_counter()
+    screen(tax_benefit_system, columns, pack_booleans)
+    seconds = time.perf_counter() - start
+
+    # Tracing allocations slows the calculation down, so memory is measured on a second run.
+    tracemalloc.start()
+    simulation = screen(tax_benefit_system, columns, pack_booleans)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return simulation.get_memory_usage()["total_nb_bytes"] / 1e6, peak / 1e6, seconds
+
+
+def main():
+    """Print the memory used in each mode."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type = int, default = 1_000_000, help = "size of the population")
+    arguments = parser.parse_args()
+
+    generated = population.generate(arguments.rows, seed = 0)
+    columns = {name: generated[name] for name in population.INPUT_VARIABLES}
+    separate_known_columns = {f"{name}_known": numpy.ones(arguments.rows, dtype = bool) for name in columns}
+
+    modes = {
+        "default": (default_tax_benefit_system(), {**columns, **separate_known_columns}, False),
+        "compact": (CountryTaxBenefitSystem(), columns, True),
+        }
+    sys.stdout.write(f"{arguments.rows:,} persons\n{'mode':<10}{'holders MB':>12}{'peak MB':>12}{'seconds':>10}\n")
+    for mode, (tax_benefit_system, mode_columns, pack_booleans) in modes.items():
+        holders, peak, seconds = measure(tax_benefit_system, mode_columns, pack_booleans)
+        sys.stdout.write(f"{mode:<10}{holders:>12.1f}{peak:>12.1f}{seconds:>10.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
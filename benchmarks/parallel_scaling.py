@@ -0,0 +1,45 @@
+"""
+Measure how the chunked runner scales with the number of worker processes.
+
+A synthetic population, drawn by `openfisca_canada.population.generate`, is written to
+a temporary Parquet file, then screened with 1 to `--max-workers` processes. Throughput
+and speedup over a single worker are reported. Requires the `batch` extra (pandas and
+pyarrow).
+
+Usage:
+
+    python benchmarks/parallel_scaling.py --rows 2000000 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas
+
+from openfisca_canada import population, runner
+
+
+def main():
+    """Print throughput and speedup for each number of workers."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type = int, default = 1_000_000, help = "size of the population")
+    parser.add_argument("--chunk-size", type = int, default = runner.DEFAULT_CHUNK_SIZE, help = "number of rows simulated at once")
+    parser.add_argument("--max-workers", type = int, default = os.cpu_count(), help = "largest number of worker processes measured")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "persons.parquet")
+        output_path = os.path.join(directory, "results.parquet")
+        pandas.DataFrame(population.generate(arguments.rows, seed = 0)).to_parquet(input_path)
+
+        baseline = None
+        for workers in range(1, arguments.max_workers + 1):
+            stats = runner.run_parallel(input_path, output_path, "2021-12-01", workers, arguments.chunk_size)
+            baseline = baseline or stats["rows_per_second"]
+            sys.stdout.write(f"{workers:>3} workers {stats['rows_per_second']:>12,.0f} rows/s   speedup {stats['rows_per_second'] / baseline:5.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Measure the memory and the start latency of `openfisca serve` workers, with and without pre-fork.
+
+For each mode, the web API is served by `--workers` gunicorn workers, which answer
+`--requests` calculations on dates spread over several years. Then are reported:
+
+- `start`: the time from the command to the first answered request;
+- `spawn`: the median time from the fork of a worker to the moment it can serve;
+- `rss`, `pss`, `uss`: the median resident, proportional and private (unique) memory
+  of the workers. Pages shared copy-on-write count in the RSS of every worker, so `uss`
+  is what each additional worker costs.
+
+Requires psutil (installed with OpenFisca-Core) and Linux, for the PSS and USS.
+
+Usage:
+
+    python benchmarks/prefork.py --workers 4
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+import psutil
+
+
+# Gunicorn configuration of each mode, timing the start of every worker.
+CONFIGURATION = """
+preload_app = {preload}
+
+
+def when_ready(server):
+    if {preload}:
+        from openfisca_canada import prefork
+        prefork.when_ready(server)
+
+
+def pre_fork(server, worker):
+    import time
+    worker.forked_at = time.monotonic()
+
+
+def post_worker_init(worker):
+    import os, time
+    with open({report!r}, "a") as report:
+        report.write(f"{{os.getpid()}} {{time.monotonic() - worker.forked_at}}\\n")
+"""
+
+PORT = 5099
+
+
+def request(day):
+    """Ask the web API for the eligibility of a person of 66 on `day`."""
+    body = json.dumps({"persons": {"p": {"age": {day: 66}, "income": {day[:4]: 10000}, "oas_eligible": {day: None}}}}).encode()
+    query = urllib.request.Request(f"http://127.0.0.1:{PORT}/calculate", body, {"Content-Type": "application/json"})
+    with urllib.request.urlopen(query) as response:
+        return response.read()
+
+
+def wait_for_server(timeout = 120):
+    """Return once the web API answers, or fail after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return request("2021-12-01")
+        except (urllib.error.URLError, ConnectionError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def measure(workers, requests, preload):
+    """Serve the web API in one mode, and return its start time and the median spawn latency and memory of its workers."""
+    with tempfile.TemporaryDirectory() as directory:
+        report = os.path.join(directory, "spawn.txt")
+        configuration = os.path.join(directory, "configuration.py")
+        with open(configuration, "w") as file:
+            file.write(CONFIGURATION.format(preload = preload, report = report))
+        command = [
+            sys.executable, "-m", "openfisca_core.scripts.openfisca_command", "serve",
+            "--country-package", "openfisca_canada",
+            "--port", str(PORT),
+            "--workers", str(workers),
+            "--configuration-file", configuration,
+            ]
+        start = time.monotonic()
+        server = subprocess.Popen(command, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+        try:
+            wait_for_server()
+            started = time.monotonic() - start
+            while not os.path.exists(report) or len(open(report).readlines()) < workers:
+                time.sleep(0.05)
+            for index in range(requests):
+                request(f"{2010 + index % 15}-{1 + index % 12:02}-{1 + index % 28:02}")
+            # The command runs the gunicorn master, whose children are the workers.
+            memory = [worker.memory_full_info() for worker in psutil.Process(server.pid).children()]
+            spawn = [float(line.split()[1]) for line in open(report)]
+        finally:
+            server.terminate()
+            server.wait()
+    return {
+        "start": started,
+        "spawn": statistics.median(spawn),
+        **{name: statistics.median(getattr(info, name) for info in memory) / 2 ** 20 for name in ("rss", "pss", "uss")},
+        }
+
+
+def main():
+    """Print the start time, spawn latency and memory of workers without and with pre-fork."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type = int, default = 4, help = "number of gunicorn workers")
+    parser.add_argument("--requests", type = int, default = 200, help = "number of calculations requested before measuring memory")
+    arguments = parser.parse_args()
+
+    for mode, preload in (("default", False), ("prefork", True)):
+        result = measure(arguments.workers, arguments.requests, preload)
+        sys.stdout.write(
+            f"{mode:<8} start {result['start']:6.2f} s   spawn {result['spawn'] * 1000:8.1f} ms   "
+            f"rss {result['rss']:6.1f} MiB   pss {result['pss']:6.1f} MiB   uss {result['uss']:6.1f} MiB\n"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Measure the main costs of the country package, and save them to compare commits.
+
+For each population size, a synthetic population is drawn by
+`openfisca_canada.population.generate`, with consistent inputs. Each input is known for
+`--known-share` of the persons. The suite then measures:
+
+- `construction`: building a `CountryTaxBenefitSystem`;
+- `build/<size>`: building a simulation of the population, see `openfisca_canada.batch`;
+- `calculate/<variable>/<size>`: calculating each `*_eligible`, `*_eligible_known` and
+  `*_entitlement` variable in a fresh simulation, including the rules it depends on.
+
+Each timing is the best of `--repeat` runs, in seconds. Results are written as JSON;
+pass the JSON of another commit to `--compare` to print the relative change of each
+timing. The command then exits with status 1 if a timing is slower than the
+baseline by more than `--tolerance`.
+
+Usage:
+
+    python benchmarks/suite.py --output before.json
+    python benchmarks/suite.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, population
+
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+PERIOD = "2021-12-01"
+
+
+def best_time(function, repeat):
+    """Return the shortest time `function` took to run, in seconds, out of `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def calculation_time(tax_benefit_system, columns, variable, repeat):
+    """Return the best time to calculate `variable` in a fresh simulation of `columns`, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        simulation = batch.build_simulation(tax_benefit_system, columns, PERIOD)
+        start = time.perf_counter()
+        simulation.calculate(variable, PERIOD)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes, repeat, known_share, seed):
+    """Run the suite, and return a dictionary mapping the name of each timing to its value."""
+    timings = {"construction": best_time(CountryTaxBenefitSystem, repeat)}
+    tax_benefit_system = CountryTaxBenefitSystem()
+    for size in sizes:
+        columns = population.generate(size, missing = 1 - known_share, seed = seed)
+        timings[f"build/{size}"] = best_time(lambda: batch.build_simulation(tax_benefit_system, columns, PERIOD), repeat)
+        for variable in batch.OUTPUT_VARIABLES:
+            timings[f"calculate/{variable}/{size}"] = calculation_time(tax_benefit_system, columns, variable, repeat)
+    return timings
+
+
+def environment():
+    """Describe the commit and platform the suite runs on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output = True, check = True, text = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        }
+
+
+def compare(timings, baseline, tolerance):
+    """Print the relative change of each timing from `baseline`, and return the names of the timings slower than `tolerance` allows."""
+    regressions = []
+    for name, seconds in timings.items():
+        if name not in baseline:
+            continue
+        change = seconds / baseline[name] - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  slower"
+        sys.stdout.write(f"{name:<50} {baseline[name]:>10.4f} s {seconds:>10.4f} s {change:>+8.1%}{flag}\n")
+    return regressions
+
+
+def main():
+    """Run the suite, save its results, and compare them to a baseline if one is given."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type = int, nargs = "+", default = DEFAULT_SIZES, help = "sizes of the populations")
+    parser.add_argument("--repeat", type = int, default = 3, help = "number of runs of each measure")
+    parser.add_argument("--known-share", type = float, default = 0.9, help = "share of the inputs known")
+    parser.add_argument("--seed", type = int, default = 0, help = "seed of the synthetic populations")
+    parser.add_argument("--output", default = "benchmark.json", help = "JSON file to write the results to")
+    parser.add_argument("--compare", help = "JSON file of a previous run to compare the results to")
+    parser.add_argument("--tolerance", type = float, default = 0.1, help = "relative slowdown tolerated by --compare")
+    arguments = parser.parse_args()
+
+    results = {
+        "environment": environment(),
+        "parameters": {"sizes": arguments.sizes, "repeat": arguments.repeat, "known_share": arguments.known_share, "seed": arguments.seed},
+        "timings": run(arguments.sizes, arguments.repeat, arguments.known_share, arguments.seed),
+        }
+    with open(arguments.output, "w") as file:
+        json.dump(results, file, indent = 2)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)
+        if compare(results["timings"], baseline["timings"], arguments.tolerance):
+            sys.exit(1)
+    else:
+        for name, seconds in results["timings"].items():
+            sys.stdout.write(f"{name:<50} {seconds:>10.4f} s\n")
+
+
+if __name__ == "__main__":
+    main()
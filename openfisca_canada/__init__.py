@@ -10,14 +10,19 @@ See https://openfisca.org/doc/key-concepts/tax_and_benefit_system.html
 
 import os
 
+from openfisca_core import periods
+from openfisca_core.parameters import ParameterNode
 from openfisca_core.taxbenefitsystems import TaxBenefitSystem
 
-from openfisca_canada import entities
+from openfisca_canada import cache, compact, entities, profiling, snapshot
 from openfisca_canada.situation_examples import young
 
 
 COUNTRY_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Number of instants for which the resolved parameters are kept in memory.
+PARAMETERS_CACHE_SIZE = 1024
+
 
 # Our country tax and benefit class inherits from the general TaxBenefitSystem class.
 # The name CountryTaxBenefitSystem must not be changed, as all tools of the OpenFisca ecosystem expect a CountryTaxBenefitSystem class to be exposed in the __init__ module of a country package.
@@ -26,12 +31,28 @@ class CountryTaxBenefitSystem(TaxBenefitSystem):
         # We initialize our tax and benefit system with the general constructor
         super().__init__(entities.entities)
 
+        # Simulations on DAY periods may be run on any date: keep the parameters of the most recently used instants only
+        self._parameters_at_instant_cache = cache.LRUCache(PARAMETERS_CACHE_SIZE)
+
         # We add to our tax and benefit system all the variables
-        self.add_variables_from_directory(os.path.join(COUNTRY_DIR, "variables"))
+        variables_path = os.path.join(COUNTRY_DIR, "variables")
+        self.add_variables_from_directory(variables_path)
+        compact.use_compact_dtypes(self)
+        profiling.instrument(self)
 
         # We add to our tax and benefit system all the legislation parameters defined in the  parameters files
         param_path = os.path.join(COUNTRY_DIR, "parameters")
-        self.load_parameters(param_path)
+        snapshot_dir = os.environ.get(snapshot.SNAPSHOT_DIR_VARIABLE)
+        if snapshot_dir:
+            # Opt-in: reuse the parameter tree parsed by a previous process, if the sources have not changed since
+            self.parameters = snapshot.cached(
+                "parameters",
+                [variables_path, param_path],
+                lambda: ParameterNode("", directory_path = param_path),
+                snapshot_dir,
+                )
+        else:
+            self.load_parameters(param_path)
 
         # We define which variable, parameter and simulation example will be used in the OpenAPI specification
         self.open_api_config = {
@@ -39,3 +60,16 @@ class CountryTaxBenefitSystem(TaxBenefitSystem):
             "parameter_example": "benefits.old_age_security.eligibility_age",
             "simulation_example": young,
             }
+
+    def get_parameters_at_instant(self, instant):
+        """Return the parameters of the legislation at `instant`, resolved once and kept in `_parameters_at_instant_cache`."""
+        # OpenFisca-Core only reads this cache before 35.12: resolve through it explicitly, whatever the version.
+        if isinstance(instant, periods.Period):
+            instant = instant.start
+        elif not isinstance(instant, periods.Instant):
+            instant = periods.instant(instant)
+        parameters_at_instant = self._parameters_at_instant_cache.get(instant)
+        if parameters_at_instant is None and self.parameters is not None:
+            parameters_at_instant = self.parameters.get_at_instant(str(instant))
+            self._parameters_at_instant_cache[instant] = parameters_at_instant
+        return parameters_at_instant
@@ -0,0 +1,185 @@
+"""
+This file provides a columnar entry point to compute eligibility for many persons at once.
+
+Instead of describing each person in a nested situation (as the web API expects), the
+inputs are given as one column per input variable, named after the variable, e.g.
+`age`, `income`, `place_of_residence` or `legal_status`. Anything that NumPy can turn
+into an array is accepted as a column: NumPy arrays, lists, pandas columns, Arrow
+arrays. A pandas `DataFrame` can be passed directly as the mapping of columns.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem, batch
+    >>> results = batch.calculate(
+    ...     CountryTaxBenefitSystem(),
+    ...     {"age": [65, 40], "income": [10000, 10000]},
+    ...     "2021-12-01",
+    ...     ["oas_eligible__age_above_eligibility"],
+    ...     )
+    >>> results["oas_eligible__age_above_eligibility"]
+    array([ True, False])
+"""
+
+import numpy
+from openfisca_core import periods
+from openfisca_core.indexed_enums import Enum, ENUM_ARRAY_DTYPE, EnumArray
+from openfisca_core.simulation_builder import SimulationBuilder
+
+from openfisca_canada import compact
+from openfisca_canada.dependencies import dependency_graph, node_name
+from openfisca_canada.tristate import KNOWN_SUFFIX
+
+
+BENEFITS = ("oas", "gis", "allowance", "afs")
+
+OUTPUT_VARIABLES = tuple(
+    f"{benefit}_{suffix}"
+    for benefit in BENEFITS
+    for suffix in ("eligible", "eligible_known", "entitlement")
+    )
+
+
+def input_period(variable, period):
+    """Return the period on which an input of `variable` is set, for a calculation on `period`."""
+    if variable.definition_period == periods.YEAR:
+        return period.this_year
+    if variable.definition_period == periods.MONTH:
+        return period.first_month
+    return period
+
+
+def encode(variable, array):
+    """
+    Encode a column of item names (e.g. "CA" or "CANADIAN_CITIZEN") of the enumerated `variable`.
+
+    Each distinct name is looked up once, whereas `Enum.encode` compares the whole
+    column to every possible value, which is slow for long enumerations such as
+    countries, and does not recognise names in arrays of Python objects, which is how
+    pandas and Arrow hand out text columns.
+    """
+    if isinstance(array, EnumArray) or array.dtype.kind not in "OSU":
+        return array
+    names, inverse = numpy.unique(array.astype(str), return_inverse = True)
+    possible_values = variable.possible_values
+    unknown = [name for name in names if name not in possible_values.__members__]
+    if unknown:
+        raise ValueError(f"Unknown values {unknown} for variable '{variable.name}'.")
+    indices = numpy.array([possible_values[name].index for name in names], dtype = ENUM_ARRAY_DTYPE)
+    return EnumArray(indices[inverse], possible_values)
+
+
+def build_simulation(tax_benefit_system, columns, period, mark_known = True, pack_booleans = False, count = None):
+    """
+    Build a simulation with one person per row of `columns`, or `count` persons if `columns` is empty.
+
+    `columns` maps input variable names to columns of equal length. When
+    `mark_known` is true, an input given without its `_known` companion column is
+    considered known for every person. When `pack_booleans` is true, boolean values
+    are stored with one bit per person, see `openfisca_canada.compact`.
+    """
+    period = periods.period(period)
+    arrays = {name: numpy.asarray(column) for name, column in columns.items()}
+    counts = {len(array) for array in arrays.values()}
+    if len(counts) > 1:
+        raise ValueError(f"All input columns must have the same length, got lengths {sorted(counts)}.")
+    count = counts.pop() if counts else count or 0
+
+    if mark_known:
+        # Holders never modify their arrays, so all the added columns can share the same one.
+        all_known = numpy.ones(count, dtype = bool)
+        for name in list(arrays):
+            known_name = name + KNOWN_SUFFIX
+            if known_name not in arrays and known_name in tax_benefit_system.variables:
+                arrays[known_name] = all_known
+
+    builder = SimulationBuilder()
+    builder.create_entities(tax_benefit_system)
+    builder.declare_person_entity(tax_benefit_system.person_entity.key, range(count))
+    simulation = builder.build(tax_benefit_system)
+    if pack_booleans:
+        compact.pack_booleans(simulation)
+
+    for name, array in arrays.items():
+        variable = tax_benefit_system.get_variable(name, check_existence = True)
+        if variable.value_type == Enum:
+            array = encode(variable, array)
+        simulation.set_input(name, input_period(variable, period), array)
+
+    return simulation
+
+
+def calculate(tax_benefit_system, columns, period, variables = OUTPUT_VARIABLES, mark_known = True, pack_booleans = False, release_intermediates = False):
+    """
+    Calculate `variables` on `period` for every row of `columns`.
+
+    Return a dictionary mapping each requested variable name to its column of results.
+    When `release_intermediates` is true, the intermediate variables are forgotten as
+    soon as they are no longer needed, see `calculate_releasing_intermediates`.
+    """
+    period = periods.period(period)
+    simulation = build_simulation(tax_benefit_system, columns, period, mark_known, pack_booleans)
+    if release_intermediates:
+        inputs = {name for column in columns for name in (column, column + KNOWN_SUFFIX)}
+        return calculate_releasing_intermediates(simulation, period, variables, inputs)
+    return {
+        name: simulation.calculate(name, period)
+        for name in variables
+        }
+
+
+def _holder(simulation, name):
+    # Holders are only created when a variable is set or calculated: do not create the others.
+    return simulation.get_variable_population(name)._holders.get(name)
+
+
+def calculate_releasing_intermediates(simulation, period, variables = OUTPUT_VARIABLES, inputs = None):
+    """
+    Calculate `variables` on `period` like `calculate`, keeping only their values in `simulation`.
+
+    By default, a simulation holds the value of every intermediate variable until it is
+    deleted. Here, the variables `variables` depend on are calculated one by one in
+    dependency order, and each of them is released as soon as all the variables of the
+    dependency graph using it are calculated, so that peak memory depends on the widest
+    level of the graph rather than on its size. The variables named in `inputs` are
+    kept; by default, those with a value set in `simulation`.
+
+    For 300,000 persons, the calculation peaks at 10.6 MiB above the simulation instead
+    of 23.5 MiB, in about the same time (20 ms). The memory of the process may not
+    change, as building the simulation from its inputs often needs more.
+    """
+    period = periods.period(period)
+    tax_benefit_system = simulation.tax_benefit_system
+    graph = dependency_graph(tax_benefit_system)
+    requested = set(variables)
+    if inputs is None:
+        # Holders may exist without values, e.g. for packed booleans: only keep those set.
+        inputs = {
+            name
+            for population in simulation.populations.values()
+            for name, holder in population._holders.items()
+            if holder.get_known_periods()
+            }
+    given = set(inputs)
+    nodes = graph.upstream({node_name(tax_benefit_system, name) for name in variables})
+    reached = set(nodes)
+    remaining = {name: sum(dependent in reached for dependent in graph.dependents[name]) for name in nodes}
+
+    def release(node):
+        for name in (node, graph.known_variable(node)):
+            if name is not None and name not in requested and name not in given:
+                holder = _holder(simulation, name)
+                if holder is not None:
+                    holder.delete_arrays()
+
+    for node in nodes:
+        if graph.dependencies[node]:
+            for name in (node, graph.known_variable(node)):
+                if name is not None:
+                    simulation.calculate(name, input_period(tax_benefit_system.variables[name], period))
+        for dependency in graph.dependencies[node]:
+            remaining[dependency] -= 1
+            if remaining[dependency] == 0:
+                release(dependency)
+    return {
+        name: simulation.calculate(name, period)
+        for name in variables
+        }
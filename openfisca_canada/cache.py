@@ -0,0 +1,86 @@
+"""
+This file provides a bounded cache, which forgets the least recently used entries first.
+
+OpenFisca caches the parameters of the legislation resolved at each instant in a plain
+dictionary, which grows with every new date a simulation is run on. `LRUCache` can
+replace that dictionary, so that a long-running process (e.g. the web API) keeps a
+bounded number of instants in memory. `RegimeCache` goes further for tax and benefit
+systems whose parameters rarely change: it stores the parameters once per regime, the
+time between two changes of the parameters, whatever the number of instants.
+"""
+
+import bisect
+import collections
+
+
+class LRUCache(collections.OrderedDict):
+    """
+    A dictionary holding at most `maxsize` entries, evicting the least recently used one first.
+
+    Example:
+        >>> cache = LRUCache(2)
+        >>> cache["a"], cache["b"] = 1, 2
+        >>> cache.get("a")
+        1
+        >>> cache["c"] = 3
+        >>> sorted(cache)
+        ['a', 'c']
+    """
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default = None):
+        """Return the value for `key`, marking it as recently used, or `default`."""
+        if key not in self:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        """Store `value` under `key`, and evict the least recently used entry if the cache is full."""
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last = False)
+
+
+class RegimeCache(LRUCache):
+    """
+    An `LRUCache` of resolved parameters keyed by regime rather than by instant.
+
+    A regime starts on each of `instants`, the instants on which a parameter changes,
+    and lasts until the next one. The parameters resolved at any instant of a regime are
+    the same, so they are stored once, under the first instant of the regime.
+
+    Example:
+        >>> from openfisca_core import periods
+        >>> cache = RegimeCache([periods.instant("2020-01-01"), periods.instant("2021-04-01")], 10)
+        >>> cache[periods.instant("2021-05-12")] = "parameters of April 2021 on"
+        >>> cache.get(periods.instant("2022-12-31"))
+        'parameters of April 2021 on'
+        >>> list(cache)
+        [Instant((2021, 4, 1))]
+    """
+
+    def __init__(self, instants, maxsize):
+        super().__init__(maxsize)
+        self.instants = sorted(instants)
+
+    def regime(self, instant):
+        """Return the first instant of the regime `instant` belongs to, or None before the first change."""
+        index = bisect.bisect_right(self.instants, instant)
+        return self.instants[index - 1] if index else None
+
+    def get(self, key, default = None):
+        """Return the value for the regime of the instant `key`, marking it as recently used, or `default`."""
+        return super().get(self.regime(key), default)
+
+    def __setitem__(self, key, value):
+        """Store `value` for the regime of the instant `key`."""
+        super().__setitem__(self.regime(key), value)
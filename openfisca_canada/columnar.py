@@ -0,0 +1,83 @@
+"""
+This file provides a writer of simulation results to columnar files, Parquet or Arrow IPC.
+
+For millions of persons, results are much smaller and faster to read as columns than
+as JSON. The arrays held by the simulation are handed over to Arrow without being
+copied, except boolean arrays, which Arrow stores with one bit per value. Enumerations,
+such as `legal_status` or `place_of_residence`, are written as dictionary-encoded
+columns: their indices, which OpenFisca already stores, with the names of the items
+as dictionary.
+
+Parquet files (`.parquet`, `.pq`) are compressed; Arrow IPC files (`.arrow`,
+`.feather`) can be memory-mapped by the reader. Both require pyarrow, which is
+installed with `pip install openfisca-canada[batch]`.
+
+Example:
+    >>> from openfisca_canada import batch, CountryTaxBenefitSystem
+    >>> simulation = batch.build_simulation(CountryTaxBenefitSystem(), {"age": [65, 40], "legal_status": ["OTHER", "CANADIAN_CITIZEN"]}, "2021-12-01")
+    >>> table(results(simulation, "2021-12-01", ["oas_eligible", "legal_status"])).column("legal_status").to_pylist()
+    ['OTHER', 'CANADIAN_CITIZEN']
+"""
+
+import importlib
+import os
+
+from openfisca_core import periods
+from openfisca_core.indexed_enums import EnumArray
+
+from openfisca_canada import batch
+
+
+FORMATS = {".parquet": "parquet", ".pq": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def _pyarrow(module_name = "pyarrow"):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as error:
+        raise ImportError(f"{module_name} is required to write columnar files: pip install openfisca-canada[batch]") from error
+
+
+def file_format(path):
+    """Return the columnar format of the file at `path`, "parquet" or "arrow", from its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file extension '{extension}' for {path}: use {', '.join(FORMATS)}.")
+    return FORMATS[extension]
+
+
+def column(array):
+    """Return `array` as an Arrow array, sharing its memory, with enumerations dictionary-encoded."""
+    pyarrow = _pyarrow()
+    if isinstance(array, EnumArray):
+        names = pyarrow.array([item.name for item in array.possible_values])
+        return pyarrow.DictionaryArray.from_arrays(pyarrow.array(array.view(array.dtype.type)), names)
+    return pyarrow.array(array)
+
+
+def table(columns):
+    """Return `columns`, a mapping from names to arrays of equal length, as an Arrow table."""
+    return _pyarrow().Table.from_arrays([column(array) for array in columns.values()], names = list(columns))
+
+
+def results(simulation, period, variables = batch.OUTPUT_VARIABLES):
+    """Return the values of `variables` on `period`, as held by `simulation`, calculating the missing ones."""
+    period = periods.period(period)
+    return {
+        name: simulation.calculate(name, batch.input_period(simulation.tax_benefit_system.variables[name], period))
+        for name in variables
+        }
+
+
+def write_table(arrow_table, path):
+    """Write `arrow_table` to `path`, in the format of its extension."""
+    if file_format(path) == "parquet":
+        _pyarrow("pyarrow.parquet").write_table(arrow_table, path)
+    else:
+        with _pyarrow("pyarrow.ipc").new_file(path, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+
+
+def write(simulation, path, period, variables = batch.OUTPUT_VARIABLES):
+    """Write the values of `variables` on `period` to `path`, one column per variable and one row per person."""
+    write_table(table(results(simulation, period, variables)), path)
@@ -0,0 +1,69 @@
+"""
+This file provides compact in-memory representations for the values of person variables.
+
+OpenFisca stores every `int` variable as 32-bit integers and every `bool` variable as
+one byte per person. For a simulation of millions of persons, most of the memory goes
+to the many boolean eligibility rules and their `_known` companions. Two measures
+reduce it:
+
+- `COMPACT_DTYPES` declares narrower integer types for variables with a small range,
+  such as ages and numbers of years. They are applied to every
+  `CountryTaxBenefitSystem`.
+- `pack_booleans` makes the holders of a simulation store boolean arrays with one bit
+  per person instead of one byte. Arrays are unpacked when read, which costs a little
+  time, so this is opt-in, e.g. `batch.build_simulation(..., pack_booleans = True)`.
+
+Places of residence, legal and marital statuses are enumerations, already stored as
+16-bit integers.
+"""
+
+import numpy
+from openfisca_core.data_storage import InMemoryStorage
+
+
+COMPACT_DTYPES = {
+    "age": numpy.int16,
+    "years_in_canada_since_18": numpy.int16,
+    "oas_eligible_required_residency_duration_amount": numpy.int16,
+    }
+
+
+def use_compact_dtypes(tax_benefit_system):
+    """Store the variables of `COMPACT_DTYPES` with their compact type in `tax_benefit_system`."""
+    for name, dtype in COMPACT_DTYPES.items():
+        tax_benefit_system.get_variable(name, check_existence = True).dtype = dtype
+
+
+class PackedBooleanStorage(InMemoryStorage):
+    """Store boolean arrays with one bit per value."""
+
+    def __init__(self, count, is_eternal = False):
+        super().__init__(is_eternal)
+        self.count = count
+
+    def get(self, period):
+        """Return the unpacked array stored for `period`, or None."""
+        packed = super().get(period)
+        if packed is None:
+            return None
+        return numpy.unpackbits(packed, count = self.count).view(numpy.bool_)
+
+    def put(self, value, period):
+        """Store `value` for `period`, packed."""
+        super().put(numpy.packbits(value), period)
+
+    def get_memory_usage(self):
+        """Return the number of arrays stored and their size in bytes."""
+        usage = super().get_memory_usage()
+        if self._arrays:
+            usage["cell_size"] = 1 / 8
+        return usage
+
+
+def pack_booleans(simulation):
+    """Make every boolean variable of `simulation` store its values with one bit per person."""
+    for population in simulation.populations.values():
+        for name, variable in simulation.tax_benefit_system.variables.items():
+            if variable.entity.key == population.entity.key and variable.dtype == numpy.bool_:
+                holder = population.get_holder(name)
+                holder._memory_storage = PackedBooleanStorage(population.count, holder._memory_storage.is_eternal)
@@ -0,0 +1,63 @@
+"""
+This file provides the date arithmetic of ages and birthdays, on arrays of dates.
+
+NumPy dates only convert to years, months or days through `datetime64` casts, which
+are slow for large arrays. `split` converts an array of dates to years and days of
+the year (as `month * 100 + day`) once, and ages are then computed from these whole
+numbers, for any number of query dates.
+
+The `age` formula keeps the split birth dates of each simulation, so that calculating
+ages on other days does not convert the birth dates again.
+
+Example:
+    >>> import numpy
+    >>> birth = numpy.array(["1956-02-29", "1990-06-01"], dtype = "datetime64[D]")
+    >>> age_on(birth, numpy.datetime64("2021-03-01"))
+    array([65, 30])
+"""
+
+import numpy
+
+
+def split(days):
+    """Return the years, and days of the year as `month * 100 + day`, of the dates `days`."""
+    years = days.astype("datetime64[Y]")
+    months = days.astype("datetime64[M]")
+    month_of_year = (months - years.astype("datetime64[M]")).astype(numpy.int16) + 1
+    day_of_month = (days - months.astype("datetime64[D]")).astype(numpy.int16) + 1
+    return years.astype(int) + 1970, month_of_year * 100 + day_of_month
+
+
+def age_from_split(birth_years, birth_days, years, days):
+    """
+    Return ages in years from the split birth dates and the split query dates.
+
+    Persons born on February 29th turn a year older on March 1st of common years.
+    """
+    return years - birth_years - (days < birth_days)
+
+
+def age_on(birth, days):
+    """Return the age in years of each person born on `birth`, on `days` (a date or an array of dates)."""
+    return age_from_split(*split(birth), *split(numpy.asarray(days, dtype = "datetime64[D]")))
+
+
+def birth_split(simulation, birth):
+    """Return the split of the birth dates `birth`, computed once per simulation."""
+    cached = getattr(simulation, "_birth_split", None)
+    if cached is None or cached[0] is not birth:
+        cached = (birth, *split(birth))
+        simulation._birth_split = cached
+    return cached[1:]
+
+
+def birthdays(birth, years):
+    """
+    Return the birthday of each person born on `birth` in the years `years` (as `datetime64[Y]`).
+
+    Persons born on February 29th turn a year older on March 1st of common years.
+    """
+    months = birth.astype("datetime64[M]")
+    month_of_year = months - birth.astype("datetime64[Y]").astype("datetime64[M]")
+    day_of_month = birth - months.astype("datetime64[D]")
+    return (years.astype("datetime64[M]") + month_of_year).astype("datetime64[D]") + day_of_month
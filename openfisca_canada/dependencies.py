@@ -0,0 +1,157 @@
+"""
+This file provides the dependency graph of the variables of a tax and benefit system.
+
+The graph is computed once, statically, from the source of the formulas: a formula
+depends on every variable it names, e.g. `tristate.get(person, "age", period)` or
+`person("income", period)`. Its nodes are the rules and inputs; each `_known`
+variable is folded into the node of the variable it describes.
+
+The graph does not depend on the persons simulated, so explanations, relevant inputs
+or invalidations can be computed from it for a whole population at once.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> graph = dependency_graph(CountryTaxBenefitSystem())
+    >>> graph.dependencies["oas_eligible_age_requirement_satisfied"]
+    ('oas_eligible__age_above_eligibility',)
+    >>> graph.dependencies["age"]
+    ('birth',)
+    >>> "birth" in graph.inputs
+    True
+"""
+
+import ast
+import collections
+import inspect
+import textwrap
+import weakref
+
+from openfisca_canada.tristate import KNOWN_SUFFIX
+
+
+def node_name(tax_benefit_system, name):
+    """Return the node of the graph holding the variable `name`."""
+    if name.endswith(KNOWN_SUFFIX) and name[:-len(KNOWN_SUFFIX)] in tax_benefit_system.variables:
+        return name[:-len(KNOWN_SUFFIX)]
+    return name
+
+
+def formula_dependencies(tax_benefit_system, variable):
+    """Return the set of nodes the formulas of `variable` name."""
+    names = set()
+    for formula in variable.formulas.values():
+        tree = ast.parse(textwrap.dedent(inspect.getsource(formula)))
+        for node in ast.walk(tree):
+            # Python 3.7 parses string literals as `ast.Str`, later versions as `ast.Constant`.
+            value = node.value if isinstance(node, ast.Constant) else getattr(node, "s", None)
+            if isinstance(value, str) and value in tax_benefit_system.variables:
+                names.add(node_name(tax_benefit_system, value))
+    names.discard(variable.name)
+    return names
+
+
+def formula_parameters(variable):
+    """
+    Return the set of parameter paths the formulas of `variable` read, e.g. `benefits.old_age_security.max_income`.
+
+    Only the paths read as `parameters(period).path` are found.
+    """
+    paths = set()
+    for formula in variable.formulas.values():
+        tree = ast.parse(textwrap.dedent(inspect.getsource(formula)))
+        for node in ast.walk(tree):
+            names = []
+            while isinstance(node, ast.Attribute):
+                names.append(node.attr)
+                node = node.value
+            if names and isinstance(node, ast.Call) and getattr(node.func, "id", None) == "parameters":
+                paths.add(".".join(reversed(names)))
+    # `ast.walk` also reaches the beginning of each path: keep complete paths only.
+    return {path for path in paths if not any(other.startswith(path + ".") for other in paths)}
+
+
+def overlap(path, other):
+    """Tell whether the parameter paths `path` and `other` are the same, or one contains the other."""
+    return path == other or path.startswith(other + ".") or other.startswith(path + ".")
+
+
+class DependencyGraph:
+    """
+    The dependencies between the variables of `tax_benefit_system`.
+
+    `dependencies` maps each node to the nodes its formulas use, `dependents` maps each
+    node to the nodes that use it, `inputs` lists the nodes without a formula, `order`
+    lists all nodes so that each node comes after all its dependencies, and
+    `parameters` maps each node to the parameter paths its formulas read.
+    """
+
+    def __init__(self, tax_benefit_system):
+        self.tax_benefit_system = tax_benefit_system
+        nodes = sorted({node_name(tax_benefit_system, name) for name in tax_benefit_system.variables})
+        self.dependencies = {
+            name: tuple(sorted(formula_dependencies(tax_benefit_system, tax_benefit_system.variables[name])))
+            for name in nodes
+            }
+        self.dependents = {name: [] for name in nodes}
+        for name, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                self.dependents[dependency].append(name)
+        self.inputs = tuple(name for name in nodes if not self.dependencies[name])
+        self.parameters = {
+            name: tuple(sorted(formula_parameters(tax_benefit_system.variables[name])))
+            for name in nodes
+            }
+        self.order = self._topological_order()
+
+    def known_variable(self, name):
+        """Return the name of the variable telling whether `name` is known, or None."""
+        known_name = name + KNOWN_SUFFIX
+        return known_name if known_name in self.tax_benefit_system.variables else None
+
+    def upstream(self, goals):
+        """Return `goals` and all the nodes they depend on, directly or not, in dependency order."""
+        return self._closure(goals, self.dependencies)
+
+    def downstream(self, names):
+        """Return `names` and all the nodes depending on them, directly or not, in dependency order."""
+        return self._closure(names, self.dependents)
+
+    def parameter_users(self, paths):
+        """Return the nodes whose formulas read one of the parameters `paths`, or a parameter node containing or contained in one of them."""
+        return [name for name in self.order if any(overlap(path, used) for path in paths for used in self.parameters[name])]
+
+    def _closure(self, names, edges):
+        reached = set(names)
+        stack = list(names)
+        while stack:
+            for neighbour in edges[stack.pop()]:
+                if neighbour not in reached:
+                    reached.add(neighbour)
+                    stack.append(neighbour)
+        return [name for name in self.order if name in reached]
+
+    def _topological_order(self):
+        remaining = {name: len(dependencies) for name, dependencies in self.dependencies.items()}
+        ready = collections.deque(name for name, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(remaining):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Circular dependencies between the variables {cycle}.")
+        return order
+
+
+_graphs = weakref.WeakKeyDictionary()
+
+
+def dependency_graph(tax_benefit_system):
+    """Return the dependency graph of `tax_benefit_system`, computed on first use."""
+    if tax_benefit_system not in _graphs:
+        _graphs[tax_benefit_system] = DependencyGraph(tax_benefit_system)
+    return _graphs[tax_benefit_system]
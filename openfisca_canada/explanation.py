@@ -0,0 +1,155 @@
+"""
+This file provides explanations of the results of a simulation, and the inputs still relevant to them.
+
+Both walk the dependency graph of the tax and benefit system (see
+`openfisca_canada.dependencies`) once, with the value and knownness vectors of every
+variable for the whole population, instead of rebuilding a graph from a `/trace`
+response and enumerating its paths for each person.
+
+An input is relevant to a goal, for a person, when it is unknown and can be reached
+from the goal through variables that are all unknown: as soon as a rule is known,
+nothing below it can change the result. `relevant_input_matrix` tells it for several
+goals, all persons and all inputs at once, e.g. to choose the next questions of every
+session of a questionnaire.
+
+Ages are calculated from birth dates, so the input relevant to an unknown age is
+`birth`, not `age`. An age given as an input is still used, and, being known, settles
+the rules above it like any other input.
+
+Example:
+    >>> from openfisca_canada import batch, CountryTaxBenefitSystem
+    >>> simulation = batch.build_simulation(CountryTaxBenefitSystem(), {"age": [65, 40]}, "2021-12-01")
+    >>> relevant = relevant_inputs(simulation, "oas_eligible_age_requirement_satisfied", "2021-12-01")
+    >>> relevant["birth"]
+    array([False, False])
+    >>> print(explain(simulation, "oas_eligible_age_requirement_satisfied", "2021-12-01", 1))
+    oas_eligible_age_requirement_satisfied as of 2021-12-01 is False, because
+      oas_eligible__age_above_eligibility as of 2021-12-01 is False, because
+        age as of 2021-12-01 is 40
+"""
+
+import numpy
+from openfisca_core import periods
+from openfisca_core.indexed_enums import EnumArray
+
+from openfisca_canada import batch
+from openfisca_canada.dependencies import dependency_graph
+
+
+def node_states(simulation, names, period):
+    """
+    Calculate the nodes `names` of the dependency graph on `period`.
+
+    Return a dictionary mapping each node to its period, its values and whether each
+    value is known. Variables without a `_known` companion are always known.
+    """
+    period = periods.period(period)
+    graph = dependency_graph(simulation.tax_benefit_system)
+    states = {}
+    for name in names:
+        node_period = batch.input_period(simulation.tax_benefit_system.variables[name], period)
+        value = simulation.calculate(name, node_period)
+        known_variable = graph.known_variable(name)
+        known = simulation.calculate(known_variable, node_period) if known_variable else numpy.ones(len(value), dtype = bool)
+        states[name] = (node_period, value, known)
+    return states
+
+
+def open_nodes(graph, states, goals):
+    """
+    Tell, for each node below `goals` and each person, whether it is reached from one of `goals` through unknown nodes only.
+
+    `states` holds the value and knownness of the nodes, as returned by `node_states`.
+    Each dependency is visited once, for all persons at once.
+    """
+    nodes = graph.upstream(goals)
+    count = len(states[goals[0]][1])
+    reached = {name: numpy.zeros(count, dtype = bool) for name in nodes}
+    for goal in goals:
+        reached[goal] = numpy.logical_not(states[goal][2])
+    # Dependents come before their dependencies in the reversed dependency order.
+    for name in reversed(nodes):
+        for dependency in graph.dependencies[name]:
+            reached[dependency] |= reached[name] & numpy.logical_not(states[dependency][2])
+    return reached
+
+
+def relevant_inputs(simulation, goal, period):
+    """Return a dictionary mapping each input `goal` depends on to whether it is still relevant to `goal`, for each person."""
+    inputs, matrix = relevant_input_matrix(simulation, [goal], period)
+    return dict(zip(inputs, matrix.T))
+
+
+def relevant_input_matrix(simulation, goals, period, unaskable = ()):
+    """
+    Tell which inputs are still relevant to at least one of `goals`, for every person at once.
+
+    Return the names of the inputs the goals depend on, except the `unaskable` ones,
+    and a boolean matrix with one row per person and one column per input.
+    """
+    graph = dependency_graph(simulation.tax_benefit_system)
+    nodes = graph.upstream(goals)
+    reached = open_nodes(graph, node_states(simulation, nodes, period), goals)
+    inputs = tuple(name for name in nodes if name in graph.inputs and name not in unaskable)
+    matrix = numpy.column_stack([reached[name] for name in inputs]) if inputs else numpy.zeros((len(reached[goals[0]]), 0), dtype = bool)
+    return inputs, matrix
+
+
+def conditionally_known(simulation, goal, period, unaskable):
+    """
+    Tell, for each person, whether `goal` is unknown only because of `unaskable` inputs.
+
+    The result of such persons cannot be made certain by asking more questions.
+    """
+    graph = dependency_graph(simulation.tax_benefit_system)
+    nodes = graph.upstream([goal])
+    states = node_states(simulation, nodes, period)
+    reached = open_nodes(graph, states, [goal])
+    relevant = [reached[name] for name in nodes if name in graph.inputs]
+    askable = [reached[name] for name in nodes if name in graph.inputs and name not in unaskable]
+    return numpy.logical_not(states[goal][2]) & numpy.any(relevant, axis = 0) & numpy.logical_not(numpy.any(askable, axis = 0))
+
+
+def display(value, known):
+    """Describe `value` for one person, and whether it is known."""
+    text = value.name if hasattr(value, "name") else str(value)
+    return text if known else f"unknown, potentially {text}"
+
+
+def explain(simulation, goal, period, index = 0):
+    """Explain how `goal` was reached on `period` for the person at `index`."""
+    return explanations(simulation, goal, period, [index])[0]
+
+
+def explanations(simulation, goal, period, indices = None):
+    """
+    Explain how `goal` was reached on `period` for the persons at `indices` (all persons by default).
+
+    Each explanation lists the rules `goal` depends on as a tree. A rule used by several
+    others is only explained the first time it appears.
+    """
+    graph = dependency_graph(simulation.tax_benefit_system)
+    states = node_states(simulation, graph.upstream([goal]), period)
+    values = {
+        name: value.decode() if isinstance(value, EnumArray) else value
+        for name, (_, value, _) in states.items()
+        }
+    if indices is None:
+        indices = range(len(values[goal]))
+
+    def lines(name, index, depth, explained):
+        node_period, _, known = states[name]
+        line = f"{'  ' * depth}{name} as of {node_period} is {display(values[name][index], known[index])}"
+        dependencies = graph.dependencies[name]
+        # A rule known while none of its dependencies is, such as an age, was given as an input.
+        if not dependencies or (known[index] and not any(states[dependency][2][index] for dependency in dependencies)):
+            return [line]
+        if name in explained:
+            return [f"{line} (explained above)"]
+        explained.add(name)
+        result = [f"{line}, because"]
+        for dependency in dependencies:
+            result.extend(lines(dependency, index, depth + 1, explained))
+        return result
+
+    return ["\n".join(lines(goal, index, 0, set())) for index in indices]
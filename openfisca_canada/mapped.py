@@ -0,0 +1,146 @@
+"""
+This file provides memory-mapped populations, shared read-only by many processes.
+
+A mapped population is a directory with one `.npy` file per input variable, named after
+the variable, e.g. `age.npy`, `income.npy` or `place_of_residence.npy`, as written by
+`save`. Each file holds the values of the variable in the type OpenFisca stores it in:
+`int16` ages, `int32` incomes, `int16` indices of enumerations, `datetime64[D]`
+birth dates. `load` maps the files read-only instead of reading them, and the holders
+of a simulation built from them store the mapped arrays as they are: no value is
+copied, and pages are only read from disk when a formula uses them. Every process
+mapping the same files shares the same pages of the operating system's cache, so that
+many workers simulating parts of one population (`rows`) need little memory each and
+start at once.
+
+An Arrow IPC file (`.arrow`, `.feather`), as written by `openfisca_canada.columnar` or
+`openfisca_canada.runner.ChunkWriter`, can be mapped the same way, record batch by record
+batch, except for its boolean columns, which Arrow stores with one bit per value and are
+thus unpacked. Rows spanning several record batches are copied: `row_slices` splits a
+population into slices that do not. Arrow requires pyarrow, which is installed with
+`pip install openfisca-canada[batch]`.
+
+Example:
+    >>> import tempfile
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> tax_benefit_system = CountryTaxBenefitSystem()
+    >>> directory = tempfile.mkdtemp()
+    >>> save(tax_benefit_system, {"age": [65, 40], "legal_status": ["CANADIAN_CITIZEN", "OTHER"]}, directory)
+    >>> simulation = build_simulation(tax_benefit_system, directory, "2021-12-01", rows = slice(1, 2))
+    >>> simulation.calculate("legal_status", "2021-12-01").decode_to_str().tolist()
+    ['OTHER']
+    >>> ages = simulation.persons.get_holder("age").get_array("2021-12-01")
+    >>> ages, ages.flags.writeable
+    (array([40], dtype=int16), False)
+"""
+
+import os
+
+import numpy
+from openfisca_core import periods
+from openfisca_core.indexed_enums import Enum
+
+from openfisca_canada import batch, columnar
+
+
+EXTENSION = ".npy"
+
+
+def save(tax_benefit_system, columns, directory):
+    """Write `columns`, as taken by `openfisca_canada.batch`, to `directory`, one file per column in the type of its variable."""
+    os.makedirs(directory, exist_ok = True)
+    for name, column in columns.items():
+        variable = tax_benefit_system.get_variable(name, check_existence = True)
+        array = numpy.asarray(column)
+        if variable.value_type == Enum:
+            array = batch.encode(variable, array)
+        numpy.save(os.path.join(directory, name + EXTENSION), numpy.asarray(array, dtype = variable.dtype))
+
+
+def _open_arrow(path):
+    pyarrow = columnar._pyarrow()
+    return pyarrow.ipc.open_file(pyarrow.memory_map(path))
+
+
+def _record_batch_sizes(reader):
+    return [reader.get_batch(index).num_rows for index in range(reader.num_record_batches)]
+
+
+def _arrow_column(tax_benefit_system, name, array):
+    pyarrow = columnar._pyarrow()
+    variable = tax_benefit_system.variables.get(name)
+    if not pyarrow.types.is_dictionary(array.type) or variable is None or variable.value_type != Enum:
+        return array.to_numpy(zero_copy_only = False)
+    names = array.dictionary.to_pylist()
+    indices = array.indices.to_numpy(zero_copy_only = False)
+    if names != [item.name for item in variable.possible_values][:len(names)]:
+        indices = batch.encode(variable, numpy.array(names))[indices]
+    return indices
+
+
+def _load_arrow(tax_benefit_system, path, rows):
+    reader = _open_arrow(path)
+    sizes = _record_batch_sizes(reader)
+    start, stop, _ = (rows if rows is not None else slice(None)).indices(sum(sizes))
+    # The parts of the record batches holding `rows`: only rows spanning several of them are copied.
+    pieces = []
+    offset = 0
+    for index, size in enumerate(sizes):
+        first, last = max(start - offset, 0), min(stop - offset, size)
+        if first < last:
+            pieces.append(reader.get_batch(index).slice(first, last - first))
+        offset += size
+    columns = {}
+    for position, name in enumerate(reader.schema.names):
+        arrays = [_arrow_column(tax_benefit_system, name, piece.column(position)) for piece in pieces]
+        if len(arrays) == 1:
+            columns[name] = arrays[0]
+        elif arrays:
+            columns[name] = numpy.concatenate(arrays)
+        else:
+            columns[name] = numpy.empty(0)
+    return columns
+
+
+def load(tax_benefit_system, path, rows = None):
+    """
+    Map the population at `path`, a directory of `.npy` files or an Arrow IPC file, read-only.
+
+    Return a mapping from input variable names to arrays, restricted to the persons
+    `rows` (a slice) if given.
+    """
+    if not os.path.isdir(path):
+        if columnar.file_format(path) != "arrow":
+            raise ValueError(f"Only Arrow IPC files can be mapped, not {path}.")
+        return _load_arrow(tax_benefit_system, path, rows)
+    columns = {}
+    for file_name in sorted(os.listdir(path)):
+        name, extension = os.path.splitext(file_name)
+        if extension == EXTENSION:
+            array = numpy.load(os.path.join(path, file_name), mmap_mode = "r")
+            columns[name] = array if rows is None else array[rows]
+    return columns
+
+
+def count(path):
+    """Return the number of persons of the population mapped at `path`."""
+    if not os.path.isdir(path):
+        return sum(_record_batch_sizes(_open_arrow(path)))
+    for file_name in sorted(os.listdir(path)):
+        if file_name.endswith(EXTENSION):
+            return len(numpy.load(os.path.join(path, file_name), mmap_mode = "r"))
+    return 0
+
+
+def row_slices(path, chunk_size):
+    """Yield slices of at most `chunk_size` persons covering the population mapped at `path`, none spanning two record batches of an Arrow file."""
+    sizes = [count(path)] if os.path.isdir(path) else _record_batch_sizes(_open_arrow(path))
+    offset = 0
+    for size in sizes:
+        for start in range(offset, offset + size, chunk_size):
+            yield slice(start, min(start + chunk_size, offset + size))
+        offset += size
+
+
+def build_simulation(tax_benefit_system, path, period, rows = None, mark_known = True):
+    """Build a simulation of the persons `rows` (all by default) of the population mapped at `path`, see `batch.build_simulation`."""
+    return batch.build_simulation(tax_benefit_system, load(tax_benefit_system, path, rows), periods.period(period), mark_known)
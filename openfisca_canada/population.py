@@ -0,0 +1,181 @@
+"""
+This file provides a generator of synthetic populations, to benchmark and load-test the country package.
+
+The inputs of each person are drawn together, so that they are consistent and look like
+the population of adults the benefits are meant for: marital status, income and
+partners receiving OAS depend on age; place of residence depends on legal status; and
+years in Canada since 18 depend on age, legal status and place of residence. The shares
+below are rough orders of magnitude, not official statistics.
+
+Every input is drawn for the whole population at once, so millions of persons are
+generated per second. `generate` returns one column per input and per `_known`
+companion, as taken by `openfisca_canada.batch`, and `situation` turns them into a
+situation for the web API.
+
+Example:
+    >>> from openfisca_canada import batch, CountryTaxBenefitSystem
+    >>> columns = generate(1000, missing = 0.1, seed = 0)
+    >>> bool((columns["years_in_canada_since_18"] <= columns["age"] - 18).all())
+    True
+    >>> len(batch.calculate(CountryTaxBenefitSystem(), columns, "2021-12-01")["oas_eligible"])
+    1000
+"""
+
+import numpy
+from openfisca_core import periods
+
+from openfisca_canada import batch
+from openfisca_canada.tristate import KNOWN_SUFFIX
+
+
+INPUT_VARIABLES = (
+    "age",
+    "income",
+    "marital_status",
+    "legal_status",
+    "place_of_residence",
+    "years_in_canada_since_18",
+    "partner_receiving_oas",
+    "resided_in_agreement_country",
+    "eligible_under_social_agreement",
+    )
+
+# Age bands of adults: first age, first age of the next band, share of the population.
+AGE_BANDS = (
+    (18, 45, 0.44),
+    (45, 65, 0.33),
+    (65, 75, 0.13),
+    (75, 85, 0.07),
+    (85, 101, 0.03),
+    )
+
+# Shares of each marital status in each age band.
+MARITAL_STATUSES = ("SINGLE", "MARRIED", "COMMONLAW", "WIDOWED", "DIVORCED", "SEPERATED")
+MARITAL_STATUS_SHARES = (
+    (0.50, 0.30, 0.15, 0.00, 0.03, 0.02),
+    (0.15, 0.55, 0.12, 0.03, 0.11, 0.04),
+    (0.07, 0.58, 0.06, 0.12, 0.13, 0.04),
+    (0.05, 0.50, 0.03, 0.30, 0.10, 0.02),
+    (0.05, 0.28, 0.02, 0.58, 0.06, 0.01),
+    )
+
+# Median income and share of persons without income in each age band.
+MEDIAN_INCOMES = (42_000, 50_000, 32_000, 26_000, 22_000)
+NO_INCOME_SHARE = 0.06
+INCOME_SPREAD = 0.75
+
+# Shares of each legal status, and share of each status living abroad.
+LEGAL_STATUSES = ("CANADIAN_CITIZEN", "PERMANENT_RESIDENT", "STATUS_INDIAN", "TEMPORARY_RESIDENT", "OTHER")
+LEGAL_STATUS_SHARES = (0.86, 0.08, 0.02, 0.03, 0.01)
+ABROAD_SHARES = (0.03, 0.02, 0.01, 0.05, 0.60)
+
+# Places of residence of persons living abroad.
+COUNTRIES_ABROAD = ("US", "GB", "IN", "FR", "IT", "GR", "PT", "PH", "CN", "DE")
+COUNTRY_ABROAD_SHARES = (0.45, 0.10, 0.08, 0.06, 0.06, 0.05, 0.05, 0.05, 0.05, 0.05)
+
+# Parameters of the beta distributions of the share of their adult life persons lived in
+# Canada: citizens and status Indians living in Canada, other residents of Canada, and
+# persons living abroad.
+YEARS_IN_CANADA_SHARES = ((9.0, 1.0), (1.5, 3.0), (1.5, 4.0))
+
+# Share of persons living in Canada and abroad who ever lived in a social agreement country,
+# and share of those eligible under the agreement.
+RESIDED_IN_AGREEMENT_COUNTRY_SHARES = (0.10, 0.70)
+ELIGIBLE_UNDER_SOCIAL_AGREEMENT_SHARE = 0.60
+
+
+def choose(generator, shares, count):
+    """Draw `count` indices, each index `i` with probability `shares[i]`."""
+    return numpy.searchsorted(numpy.cumsum(shares), generator.random(count) * sum(shares), side = "right")
+
+
+def choose_by_group(generator, shares, groups):
+    """Draw an index for each of `groups`, with the probabilities `shares[group]`."""
+    cumulative = numpy.cumsum(shares, axis = 1)
+    draws = generator.random(len(groups)) * cumulative[groups, -1]
+    return (draws[:, None] >= cumulative[groups]).sum(axis = 1)
+
+
+def generate(count, missing = 0.0, seed = None):
+    """
+    Generate the inputs of `count` persons.
+
+    Return a dictionary mapping each of `INPUT_VARIABLES` and its `_known` companion to a
+    column. Enumerations are given by item names. Each input is unknown for a share
+    `missing` of the persons, or `missing[name]` if `missing` is a dictionary; the value
+    drawn for them is kept, but marked unknown.
+    """
+    generator = numpy.random.default_rng(seed)
+    columns = {}
+
+    band = choose(generator, [share for _, _, share in AGE_BANDS], count)
+    first_ages = numpy.array([first for first, _, _ in AGE_BANDS])
+    band_widths = numpy.array([end - first for first, end, _ in AGE_BANDS])
+    age = first_ages[band] + (generator.random(count) * band_widths[band]).astype(numpy.int32)
+    columns["age"] = age
+
+    median = numpy.array(MEDIAN_INCOMES, dtype = float)[band]
+    income = median * numpy.exp(generator.normal(0, INCOME_SPREAD, count))
+    income[generator.random(count) < NO_INCOME_SHARE] = 0
+    columns["income"] = income.astype(numpy.int32)
+
+    marital_status = choose_by_group(generator, numpy.array(MARITAL_STATUS_SHARES), band)
+    columns["marital_status"] = numpy.array(MARITAL_STATUSES)[marital_status]
+
+    legal_status = choose(generator, LEGAL_STATUS_SHARES, count)
+    columns["legal_status"] = numpy.array(LEGAL_STATUSES)[legal_status]
+
+    abroad = generator.random(count) < numpy.array(ABROAD_SHARES)[legal_status]
+    countries = numpy.array(COUNTRIES_ABROAD)[choose(generator, COUNTRY_ABROAD_SHARES, count)]
+    columns["place_of_residence"] = numpy.where(abroad, countries, "CA")
+
+    # Citizens and status Indians living in Canada, other residents of Canada, persons living abroad.
+    rooted = numpy.isin(columns["legal_status"], ("CANADIAN_CITIZEN", "STATUS_INDIAN"))
+    group = numpy.where(abroad, 2, numpy.where(rooted, 0, 1))
+    first, second = numpy.array(YEARS_IN_CANADA_SHARES).T
+    share_in_canada = generator.beta(first[group], second[group])
+    columns["years_in_canada_since_18"] = ((age - 18) * share_in_canada).astype(numpy.int32)
+
+    partnered = numpy.isin(columns["marital_status"], ("MARRIED", "COMMONLAW"))
+    partner_receiving_oas_share = numpy.clip((age - 57) / 16, 0, 0.95)
+    columns["partner_receiving_oas"] = partnered & (generator.random(count) < partner_receiving_oas_share)
+
+    resided = generator.random(count) < numpy.array(RESIDED_IN_AGREEMENT_COUNTRY_SHARES)[abroad.astype(int)]
+    columns["resided_in_agreement_country"] = resided
+    columns["eligible_under_social_agreement"] = resided & (generator.random(count) < ELIGIBLE_UNDER_SOCIAL_AGREEMENT_SHARE)
+
+    for name in INPUT_VARIABLES:
+        share = missing.get(name, 0.0) if isinstance(missing, dict) else missing
+        columns[name + KNOWN_SUFFIX] = generator.random(count) >= share if share else numpy.ones(count, dtype = bool)
+    return columns
+
+
+def situation(tax_benefit_system, columns, period, variables = ()):
+    """
+    Describe the persons of `columns` as a situation for the web API.
+
+    Unknown inputs are left out, and their `_known` companion set to false. Each of
+    `variables` is requested on `period` for every person.
+    """
+    period = periods.period(period)
+    names = [name for name in columns if not name.endswith(KNOWN_SUFFIX)]
+    count = len(columns[names[0]]) if names else 0
+    values = {name: numpy.asarray(columns[name]).tolist() for name in names}
+    known = {
+        name: numpy.asarray(columns[name + KNOWN_SUFFIX]).tolist() if name + KNOWN_SUFFIX in columns else [True] * count
+        for name in names
+        }
+    input_periods = {name: str(batch.input_period(tax_benefit_system.variables[name], period)) for name in names}
+
+    persons = {}
+    for index in range(count):
+        person = {}
+        for name in names:
+            if known[name][index]:
+                person[name] = {input_periods[name]: values[name][index]}
+            if name + KNOWN_SUFFIX in tax_benefit_system.variables:
+                person[name + KNOWN_SUFFIX] = {input_periods[name]: known[name][index]}
+        for name in variables:
+            person[name] = {str(period): None}
+        persons[f"person{index}"] = person
+    return {"persons": persons}
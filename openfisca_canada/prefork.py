@@ -0,0 +1,80 @@
+"""
+This file provides a pre-fork mode for `openfisca serve`, where the web workers share one tax and benefit system.
+
+By default, each gunicorn worker started by `openfisca serve` imports the country
+package, builds its own `CountryTaxBenefitSystem` with its parameter tree, and resolves
+the parameters of every new instant it is asked about. In pre-fork mode, enabled by
+`serve_prefork_config.py`, the master process loads the web API once (gunicorn's
+`preload_app`), and `when_ready` prepares its tax and benefit system before the workers
+are forked:
+
+- the parameters of every regime, i.e. of every time between two changes of the
+  parameters, are resolved, and the cache of resolved parameters is keyed by regime
+  (see `cache.RegimeCache`), so that workers never resolve parameters again, whatever
+  the date of the requests;
+- the objects of the master are moved out of reach of the garbage collector
+  (`gc.freeze`), whose collections would otherwise write to every page of the workers.
+
+Workers then share the pages of the master copy-on-write, and start serving as soon as
+they are forked. Run `python benchmarks/prefork.py` to measure the private memory and the
+start latency of workers with and without pre-fork.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> tax_benefit_system = CountryTaxBenefitSystem()
+    >>> share_parameters(tax_benefit_system)
+    >>> cache = tax_benefit_system._parameters_at_instant_cache
+    >>> len(cache) == len(regime_instants(tax_benefit_system)) > 0
+    True
+    >>> hits = cache.hits
+    >>> parameters = tax_benefit_system.get_parameters_at_instant("2022-03-14")
+    >>> cache.hits == hits + 1
+    True
+"""
+
+import gc
+import logging
+
+from openfisca_core import periods
+
+from openfisca_canada import cache, CountryTaxBenefitSystem, PARAMETERS_CACHE_SIZE
+
+
+log = logging.getLogger(__name__)
+
+
+def regime_instants(tax_benefit_system):
+    """Return the instants on which a parameter of `tax_benefit_system` changes, in order."""
+    return sorted({
+        periods.instant(value.instant_str)
+        for parameter in tax_benefit_system.parameters.get_descendants()
+        for value in getattr(parameter, "values_list", ())
+        })
+
+
+def share_parameters(tax_benefit_system):
+    """Resolve the parameters of every regime of `tax_benefit_system`, and keep them keyed by regime."""
+    instants = regime_instants(tax_benefit_system)
+    # One more entry for the instants before the first change.
+    tax_benefit_system._parameters_at_instant_cache = cache.RegimeCache(instants, max(len(instants) + 1, PARAMETERS_CACHE_SIZE))
+    for instant in instants:
+        tax_benefit_system.get_parameters_at_instant(instant)
+
+
+def prepare(tax_benefit_systems):
+    """Prepare `tax_benefit_systems` to be shared by processes forked from the current one."""
+    for tax_benefit_system in tax_benefit_systems:
+        share_parameters(tax_benefit_system)
+    gc.collect()
+    # Python 3.6 has no `gc.freeze`: workers then copy the pages the collector writes to.
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def when_ready(server):
+    """Gunicorn hook preparing the tax and benefit systems loaded by the master, before the workers are forked."""
+    # Only the country package resolves parameters through its cache on every OpenFisca-Core version.
+    tax_benefit_systems = [system for system in gc.get_objects() if isinstance(system, CountryTaxBenefitSystem)]
+    if not tax_benefit_systems:
+        log.warning("No tax and benefit system loaded before forking: set `preload_app = True` to share it between workers.")
+    prepare(tax_benefit_systems)
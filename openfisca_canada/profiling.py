@@ -0,0 +1,227 @@
+"""
+This file provides a profiler recording the cost of each variable of the tax and benefit system.
+
+For each variable, the profiler counts how many times it was requested, how many of
+these requests were served from the cache of the simulation (hits) or ran its formula
+(misses), the time spent in its formula, with and without the variables it requested,
+and the number of values and bytes the formula returned.
+
+Every `CountryTaxBenefitSystem` instruments its formulas on construction, but the
+profiler only records anything while it is enabled, which can be toggled at runtime:
+
+    >>> from openfisca_canada import batch, CountryTaxBenefitSystem, profiling
+    >>> profiling.profiler.enable()
+    >>> results = batch.calculate(CountryTaxBenefitSystem(), {"age": [65, 70]}, "2021-12-01", ["oas_eligible"])
+    >>> profiling.profiler.disable()
+    >>> profiling.profiler.statistics()["oas_eligible"]["misses"]
+    1
+    >>> profiling.profiler.reset()
+
+The statistics can be exported as JSON (`to_json`) or in the Prometheus text format
+(`to_prometheus`). When serving the web API with `openfisca_canada/serve_config.py`,
+they are served on `JSON_PATH` and `PROMETHEUS_PATH`, and the profiler is enabled or
+disabled by POST requests to `ENABLE_PATH` and `DISABLE_PATH`, or on start with the
+`OPENFISCA_CANADA_PROFILING` environment variable. The toggles are not authenticated,
+so they are refused unless the `OPENFISCA_CANADA_PROFILING_TOGGLES` environment
+variable is set; the address of a request cannot tell, e.g. behind a reverse proxy.
+
+Each gunicorn worker is a process with its own profiler: a toggle only reaches the
+worker that answers it, and the statistics served are those of the answering worker.
+To profile every worker, set `OPENFISCA_CANADA_PROFILING` before starting the server,
+and aggregate the statistics of the workers, e.g. by summing the Prometheus counters,
+which are labelled by variable only.
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+from openfisca_core.tracers import SimpleTracer
+
+
+PROFILING_VARIABLE = "OPENFISCA_CANADA_PROFILING"
+TOGGLES_VARIABLE = "OPENFISCA_CANADA_PROFILING_TOGGLES"
+
+JSON_PATH = "/profiling"
+PROMETHEUS_PATH = "/profiling/metrics"
+ENABLE_PATH = "/profiling/enable"
+DISABLE_PATH = "/profiling/disable"
+
+STATISTICS = ("requests", "hits", "misses", "seconds", "self_seconds", "cells", "bytes")
+
+PROMETHEUS_METRICS = (
+    ("requests", "openfisca_canada_variable_requests_total", "Number of times the variable was requested."),
+    ("hits", "openfisca_canada_variable_cache_hits_total", "Number of requests served without running a formula."),
+    ("misses", "openfisca_canada_variable_cache_misses_total", "Number of requests that ran the formula of the variable."),
+    ("seconds", "openfisca_canada_variable_formula_seconds_total", "Time spent in the formula, including the variables it requested."),
+    ("self_seconds", "openfisca_canada_variable_formula_self_seconds_total", "Time spent in the formula, excluding the formulas of the variables it requested."),
+    ("cells", "openfisca_canada_variable_formula_cells_total", "Number of values returned by the formula."),
+    ("bytes", "openfisca_canada_variable_formula_bytes_total", "Number of bytes returned by the formula."),
+    )
+
+
+class Profiler:
+    """Statistics on the requests and formulas of each variable, recorded while enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def enable(self):
+        """Start recording."""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording. The statistics recorded so far are kept."""
+        self.enabled = False
+
+    def reset(self):
+        """Forget the statistics recorded so far."""
+        with self._lock:
+            self._statistics = collections.defaultdict(lambda: dict.fromkeys(STATISTICS, 0))
+
+    def statistics(self):
+        """Return a dictionary mapping each variable recorded to its statistics."""
+        with self._lock:
+            statistics = {name: dict(values) for name, values in self._statistics.items()}
+        for values in statistics.values():
+            values["hits"] = values["requests"] - values["misses"]
+        return statistics
+
+    def to_json(self):
+        """Return the statistics as a JSON document."""
+        return json.dumps(self.statistics(), sort_keys = True)
+
+    def to_prometheus(self):
+        """Return the statistics in the Prometheus text exposition format."""
+        statistics = self.statistics()
+        lines = []
+        for key, metric, description in PROMETHEUS_METRICS:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f'{metric}{{variable="{name}"}} {values[key]}' for name, values in sorted(statistics.items()))
+        return "\n".join(lines) + "\n"
+
+    def record_request(self, name):
+        """Count a request of the variable `name`."""
+        with self._lock:
+            self._statistics[name]["requests"] += 1
+
+    def instrument(self, name, formula):
+        """Return `formula` of the variable `name`, recording its statistics while the profiler is enabled."""
+        # OpenFisca only passes the parameters to formulas taking them, as told by their code.
+        takes_parameters = formula.__code__.co_argcount != 2
+
+        def run(population, period, parameters):
+            return formula(population, period, parameters) if takes_parameters else formula(population, period)
+
+        @functools.wraps(formula)
+        def instrumented_formula(population, period, parameters):
+            if not self.enabled:
+                return run(population, period, parameters)
+            _install_tracer(population.simulation, self)
+
+            stack = self._stack()
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = run(population, period, parameters)
+            finally:
+                seconds = time.perf_counter() - start
+                nested_seconds = stack.pop()
+                if stack:
+                    stack[-1] += seconds
+            with self._lock:
+                statistics = self._statistics[name]
+                statistics["misses"] += 1
+                statistics["seconds"] += seconds
+                statistics["self_seconds"] += seconds - nested_seconds
+                statistics["cells"] += getattr(result, "size", 1)
+                statistics["bytes"] += getattr(result, "nbytes", 0)
+            return result
+
+        return instrumented_formula
+
+    def _stack(self):
+        # Time spent in the formulas requested by each formula being run, in this thread.
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+# The profiler shared by all the tax and benefit systems of this process.
+profiler = Profiler()
+
+
+class ProfilingTracer(SimpleTracer):
+    """A tracer counting the requests of each variable, sharing the calculation stack of the tracer it replaces."""
+
+    def __init__(self, profiler, stack):
+        super().__init__()
+        self.profiler = profiler
+        self._stack = stack
+
+    def record_calculation_start(self, variable, period):
+        """Count a request of `variable`."""
+        super().record_calculation_start(variable, period)
+        if self.profiler.enabled:
+            self.profiler.record_request(variable)
+
+
+def _install_tracer(simulation, profiler):
+    # Simulations are created by OpenFisca, so their tracer is replaced when they first run a formula.
+    # Full tracers, used by /trace, are left alone.
+    if type(simulation.tracer) is SimpleTracer:
+        for frame in simulation.tracer.stack:
+            profiler.record_request(frame["name"])
+        simulation.tracer = ProfilingTracer(profiler, simulation.tracer.stack)
+
+
+def instrument(tax_benefit_system):
+    """Instrument the formulas of every variable of `tax_benefit_system` with the shared `profiler`."""
+    for name, variable in tax_benefit_system.variables.items():
+        for instant, formula in variable.formulas.items():
+            variable.formulas[instant] = profiler.instrument(name, formula)
+
+
+class ProfilingMiddleware:
+    """Serve the statistics of the shared `profiler` in front of a WSGI `application`, and toggle it if `toggles` is true."""
+
+    def __init__(self, application, toggles = False):
+        self.application = application
+        self.toggles = toggles
+
+    def __call__(self, environ, start_response):
+        """Handle a request."""
+        path, method = environ.get("PATH_INFO", ""), environ.get("REQUEST_METHOD")
+        if path == JSON_PATH and method == "GET":
+            return self._respond(start_response, "application/json", profiler.to_json())
+        if path == PROMETHEUS_PATH and method == "GET":
+            return self._respond(start_response, "text/plain; version=0.0.4", profiler.to_prometheus())
+        if path in (ENABLE_PATH, DISABLE_PATH) and method == "POST":
+            if not self.toggles:
+                return self._respond(start_response, "application/json", json.dumps({"error": f"Set {TOGGLES_VARIABLE} to toggle profiling."}), "403 FORBIDDEN")
+            if path == ENABLE_PATH:
+                profiler.enable()
+            else:
+                profiler.disable()
+            return self._respond(start_response, "application/json", json.dumps({"enabled": profiler.enabled}))
+        return self.application(environ, start_response)
+
+    @staticmethod
+    def _respond(start_response, content_type, text, status = "200 OK"):
+        content = text.encode("utf-8")
+        start_response(status, [("Content-Type", content_type), ("Content-Length", str(len(content)))])
+        return [content]
+
+
+def post_worker_init(worker):
+    """Gunicorn hook serving the statistics of the profiler of each worker."""
+    if os.environ.get(PROFILING_VARIABLE):
+        profiler.enable()
+    worker.wsgi = ProfilingMiddleware(worker.wsgi, toggles = bool(os.environ.get(TOGGLES_VARIABLE)))
@@ -0,0 +1,106 @@
+"""
+This file provides a solver of the earliest day on which each person becomes eligible to each benefit.
+
+The inputs of a person are considered constant, except their age, which grows on each
+birthday. The rules only compare ages to the thresholds of `AGE_PARAMETERS`, so, as
+long as the parameters do not change, the results of a person only depend on the
+interval between two consecutive thresholds their age falls in. Between two instants
+on which a parameter changes, the whole population is thus simulated once per age
+interval, with a representative age, instead of once per day. Each person is then
+eligible from the first day their age enters an interval in which they are eligible.
+
+The last parameter instant opens a regime that never ends, in which persons go through
+all the intervals above their age: a person not eligible in any of them will never be
+eligible under their current inputs, which the solver reports as `NaT`.
+
+Ages are computed from the `birth` column when there is one; otherwise the `age`
+column is considered constant, and only parameter changes can make persons eligible.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> tax_benefit_system = CountryTaxBenefitSystem()
+    >>> dates = eligibility_dates(tax_benefit_system, {"birth": ["1957-01-10", "1990-06-01"]}, "2021-12-01", ["oas_eligible__age_above_eligibility"])
+    >>> dates["oas_eligible__age_above_eligibility"]
+    array(['2022-01-10', '2055-06-01'], dtype='datetime64[D]')
+    >>> dates = eligibility_dates(tax_benefit_system, {"age": [70, 40]}, "2021-12-01", ["oas_eligible__age_above_eligibility"])
+    >>> dates["oas_eligible__age_above_eligibility"]
+    array(['2021-12-01',        'NaT'], dtype='datetime64[D]')
+"""
+
+import math
+
+import numpy
+
+from openfisca_canada import batch, dates, timeline
+from openfisca_canada.reforms.parametric import parameter
+
+
+AGE_PARAMETERS = (
+    "benefits.old_age_security.eligibility_age",
+    "benefits.old_age_security.allowance.minimum_age",
+    )
+
+# Later than any day a person can become eligible on.
+NEVER = numpy.datetime64("9999-12-31", "D")
+
+
+def age_bounds(tax_benefit_system, day):
+    """Return the sorted ages, in whole years, at which the results of a person can change with the parameters of `day`."""
+    parameters = tax_benefit_system.get_parameters_at_instant(str(day))
+    bounds = set()
+    for path in AGE_PARAMETERS:
+        # Ages are whole numbers of years: `age >= 64.5` holds from 65 years on.
+        bounds.add(math.ceil(parameter(parameters, path)))
+    return sorted(bounds)
+
+
+def eligibility_dates(tax_benefit_system, columns, start, variables = timeline.GOALS, mark_known = True):
+    """
+    Return, for each of `variables` and each row of `columns`, the first day from `start` on which it is true.
+
+    `columns` holds the inputs, as for `batch.calculate`. Days are returned as arrays of
+    `datetime64[D]`, with `NaT` for the persons who never become eligible.
+    """
+    start = numpy.datetime64(start, "D")
+    arrays = {name: numpy.asarray(column) for name, column in columns.items()}
+    birth = arrays.pop("birth", None)
+    if birth is not None:
+        birth = birth.astype("datetime64[D]")
+        count = len(birth)
+    elif "age" in arrays:
+        count = len(arrays["age"])
+    else:
+        raise ValueError("Eligibility dates require a `birth` or an `age` column.")
+    # Ages are as known as the birth dates they are computed from.
+    ages = {"age_known": arrays["birth_known"]} if birth is not None and "birth_known" in arrays else {}
+    firsts = [start, *timeline.parameter_instants(tax_benefit_system, start, NEVER)]
+    first_days = {name: numpy.full(count, NEVER) for name in variables}
+
+    for first, end in zip(firsts, firsts[1:] + [None]):
+        if birth is not None:
+            age_at_first = dates.age_on(birth, numpy.full(count, first))
+            age_at_last = dates.age_on(birth, numpy.full(count, end - 1)) if end is not None else numpy.full(count, numpy.iinfo(int).max)
+        else:
+            age_at_first = age_at_last = arrays["age"].astype(int)
+        bounds = age_bounds(tax_benefit_system, first)
+        for lower, upper in zip([None, *bounds], [*bounds, None]):
+            representative = lower if lower is not None else upper - 1
+            reached = age_at_last >= lower if lower is not None else numpy.ones(count, dtype = bool)
+            if upper is not None:
+                reached &= age_at_first < upper
+            if not reached.any():
+                continue
+            if lower is not None and birth is not None:
+                entry = numpy.maximum(first, dates.birthdays(birth, birth.astype("datetime64[Y]") + lower))
+            else:
+                entry = numpy.full(count, first)
+            # Inputs other than age, and parameters, are the same over the whole regime.
+            results = batch.calculate(tax_benefit_system, {**arrays, **ages, "age": numpy.full(count, representative)}, str(first), variables, mark_known)
+            for name in variables:
+                eligible = reached & results[name].astype(bool)
+                first_days[name] = numpy.where(eligible, numpy.minimum(first_days[name], entry), first_days[name])
+
+    return {
+        name: numpy.where(days == NEVER, numpy.datetime64("NaT"), days).astype("datetime64[D]")
+        for name, days in first_days.items()
+        }
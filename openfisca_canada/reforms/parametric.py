@@ -0,0 +1,43 @@
+"""
+This file defines reforms that only change the values of parameters.
+
+Analysts often ask what the results would be if a threshold, such as
+`benefits.old_age_security.max_income`, had another value. `parametric_reform` builds
+such a reform from a mapping of parameter paths to their new values, without writing
+a `Reform` class for each question.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> reform = parametric_reform(CountryTaxBenefitSystem(), {"benefits.old_age_security.eligibility_age": 67}, "2022-01-01")
+    >>> reform.get_parameters_at_instant("2022-01-01").benefits.old_age_security.eligibility_age
+    67
+"""
+
+from openfisca_core import periods
+from openfisca_core.reforms import Reform
+
+
+def parameter(parameters, path):
+    """Return the parameter at the dotted `path` of `parameters`, a parameter tree or its values at an instant."""
+    node = parameters
+    for name in path.split("."):
+        node = getattr(node, name)
+    return node
+
+
+def parametric_reform(baseline, values, start):
+    """Return `baseline` reformed so that each parameter of `values`, a mapping from paths to values, takes its value from `start` on."""
+    start = periods.instant(start)
+
+    def modify_parameters(parameters):
+        for path, value in values.items():
+            parameter(parameters, path).update(start = start, value = value)
+        return parameters
+
+    class parametric(Reform):
+        name = ", ".join(f"{path} = {value}" for path, value in values.items())
+
+        def apply(self):
+            self.modify_parameters(modifier_function = modify_parameters)
+
+    return parametric(baseline)
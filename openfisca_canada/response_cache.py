@@ -0,0 +1,157 @@
+"""
+This file provides an optional cache of the responses of the web API `/calculate` route.
+
+Front-ends such as the benefits estimator send the same situations over and over. The
+cache is a WSGI middleware that wraps the web API: a request whose JSON body is equal
+(keys order and spacing aside) to a recent one gets the stored response back instead
+of running a new simulation. Entries expire after a time to live, and the least
+recently used ones are evicted when the cache is full.
+
+Keys also include a fingerprint of the variables and parameters the server was
+started with, so that a response computed with other rules is never served. Each
+worker process holds its own cache.
+
+To enable it with `openfisca serve`, pass the configuration file provided next to
+this one, which installs the middleware in every worker:
+
+    openfisca serve --configuration-file openfisca_canada/serve_config.py
+
+Hits, misses and mean latencies are served as JSON on `METRICS_PATH`, and each
+cached route response has an `X-Cache` header telling whether it was a hit. Only
+`/calculate` is cached by default: list other routes, e.g. `/calculate,/trace`, in the
+`OPENFISCA_CANADA_RESPONSE_CACHE_PATHS` environment variable to cache them too. Requests
+without a `Content-Length`, such as chunked ones, are passed to the web API untouched.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+from openfisca_canada import cache, COUNTRY_DIR, snapshot
+
+
+log = logging.getLogger(__name__)
+
+CACHED_PATHS = ("/calculate",)
+METRICS_PATH = "/response-cache/metrics"
+
+SIZE_VARIABLE = "OPENFISCA_CANADA_RESPONSE_CACHE_SIZE"
+TTL_VARIABLE = "OPENFISCA_CANADA_RESPONSE_CACHE_TTL"
+PATHS_VARIABLE = "OPENFISCA_CANADA_RESPONSE_CACHE_PATHS"
+DEFAULT_SIZE = 1024
+DEFAULT_TTL = 3600
+
+
+def canonical_key(path, body, rules):
+    """Return the cache key of a request on `path` with the JSON `body`, for the given `rules` fingerprint."""
+    situation = json.dumps(json.loads(body), sort_keys = True, separators = (",", ":"))
+    return hashlib.sha256(f"{rules}\n{path}\n{situation}".encode("utf-8")).hexdigest()
+
+
+class ResponseCacheMiddleware:
+    """Serve the responses of the wrapped WSGI `application` to repeated situations from memory."""
+
+    def __init__(self, application, maxsize = DEFAULT_SIZE, ttl = DEFAULT_TTL, rules = None, clock = time.monotonic, paths = CACHED_PATHS):
+        self.application = application
+        self.paths = tuple(paths)
+        self.ttl = ttl
+        self.rules = rules or snapshot.fingerprint(os.path.join(COUNTRY_DIR, "variables"), os.path.join(COUNTRY_DIR, "parameters"))
+        self.clock = clock
+        self._responses = cache.LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._counts = {"hit": 0, "miss": 0}
+        self._seconds = {"hit": 0.0, "miss": 0.0}
+
+    def __call__(self, environ, start_response):
+        """Handle a request, from the cache when possible."""
+        path = environ.get("PATH_INFO", "")
+        if path == METRICS_PATH:
+            return self._respond(start_response, "200 OK", [("Content-Type", "application/json")], json.dumps(self.metrics()).encode("utf-8"))
+        if environ.get("REQUEST_METHOD") != "POST" or path not in self.paths:
+            return self.application(environ, start_response)
+        # Without a length, e.g. for a chunked body, the body cannot be read without consuming it.
+        if not environ.get("CONTENT_LENGTH"):
+            return self.application(environ, start_response)
+
+        start = time.perf_counter()
+        body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"]))
+        environ["wsgi.input"] = io.BytesIO(body)
+        try:
+            key = canonical_key(path, body, self.rules)
+        except ValueError:
+            # Not JSON: let the web API answer with its own error.
+            return self.application(environ, start_response)
+
+        response = self._get(key)
+        outcome = "miss" if response is None else "hit"
+        if response is None:
+            response = self._call_application(environ)
+            if response[0].startswith("200"):
+                self._set(key, response)
+
+        status, headers, content = response
+        with self._lock:
+            self._counts[outcome] += 1
+            self._seconds[outcome] += time.perf_counter() - start
+        return self._respond(start_response, status, headers + [("X-Cache", outcome.upper())], content)
+
+    def metrics(self):
+        """Return the number of hits and misses, the hit ratio and the mean latency of each, in seconds."""
+        with self._lock:
+            hits, misses = self._counts["hit"], self._counts["miss"]
+            return {
+                "entries": len(self._responses),
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+                "mean_hit_seconds": self._seconds["hit"] / hits if hits else 0.0,
+                "mean_miss_seconds": self._seconds["miss"] / misses if misses else 0.0,
+                }
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if self.clock() < expires_at:
+                return response
+            del self._responses[key]
+            return None
+
+    def _set(self, key, response):
+        with self._lock:
+            self._responses[key] = (self.clock() + self.ttl, response)
+
+    def _call_application(self, environ):
+        captured = {}
+
+        def capture(status, headers, exc_info = None):
+            captured["status"], captured["headers"] = status, headers
+
+        iterable = self.application(environ, capture)
+        try:
+            content = b"".join(iterable)
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+        headers = [(name, value) for name, value in captured["headers"] if name.lower() != "content-length"]
+        return captured["status"], headers, content
+
+    @staticmethod
+    def _respond(start_response, status, headers, content):
+        start_response(status, headers + [("Content-Length", str(len(content)))])
+        return [content]
+
+
+def post_worker_init(worker):
+    """Gunicorn hook wrapping the web API of each worker in a `ResponseCacheMiddleware`."""
+    maxsize = int(os.environ.get(SIZE_VARIABLE, DEFAULT_SIZE))
+    ttl = float(os.environ.get(TTL_VARIABLE, DEFAULT_TTL))
+    paths = [path.strip() for path in os.environ.get(PATHS_VARIABLE, ",".join(CACHED_PATHS)).split(",") if path.strip()]
+    worker.wsgi = ResponseCacheMiddleware(worker.wsgi, maxsize, ttl, paths = paths)
+    log.info(f"Response cache enabled on {', '.join(paths)}: {maxsize} entries, {ttl:.0f} s time to live")
@@ -0,0 +1,108 @@
+"""
+This file provides an analysis of the sensitivity of eligibility to the income thresholds.
+
+For each threshold of `THRESHOLDS`, e.g.
+`benefits.old_age_security.allowance.income_cap`, the analysis tells each person's
+margin to the threshold that applies to them, and which persons would see a result
+change if the threshold moved by a given amount, e.g. to list the persons close to
+the edge of eligibility.
+
+A threshold only changes a result through the rule comparing it to the income. The
+population is therefore simulated twice per threshold, once with a threshold so high
+that the rule holds for every person it applies to, and once with a threshold so low
+that it holds for none, reusing the rest of the baseline (see
+`openfisca_canada.sweep`). This tells, for each person, whether the threshold applies
+to them, and what their results would be whether the rule holds or not. The results
+for any change of the threshold are then a comparison of the margins with the change,
+without simulating again.
+
+The values of the inputs are used as they are, whether they are known or not.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> columns = {
+    ...     "age": [62, 62],
+    ...     "income": [30000, 40000],
+    ...     "marital_status": ["MARRIED", "MARRIED"],
+    ...     "partner_receiving_oas": [True, True],
+    ...     "legal_status": ["CANADIAN_CITIZEN", "CANADIAN_CITIZEN"],
+    ...     "place_of_residence": ["CA", "CA"],
+    ...     "years_in_canada_since_18": [20, 20],
+    ...     }
+    >>> sensitivity = Sensitivity(CountryTaxBenefitSystem(), columns, "2021-12-01", ["allowance_eligible"])
+    >>> sensitivity.margins["benefits.old_age_security.allowance.income_cap"]
+    array([ 5616., -4384.])
+    >>> sensitivity.flips("benefits.old_age_security.allowance.income_cap", -6000)["allowance_eligible"]
+    array([ True, False])
+"""
+
+import numpy
+from openfisca_core import periods
+
+from openfisca_canada import batch, sweep, timeline
+from openfisca_canada.dependencies import dependency_graph
+from openfisca_canada.reforms.parametric import parameter, parametric_reform
+
+
+# Each income threshold, with the rule comparing it to the income, and whether an income equal to the threshold satisfies the rule.
+THRESHOLDS = {
+    "benefits.old_age_security.max_income": ("oas_eligible__income_not_above_limit", True),
+    "benefits.old_age_security.guaranteed_income_supplement.maximum_income_single": ("gis_eligible_income", False),
+    "benefits.old_age_security.guaranteed_income_supplement.maximum_income_partnered": ("gis_eligible_income", False),
+    "benefits.old_age_security.guaranteed_income_supplement.maximum_income_two_recipients": ("gis_eligible_income", False),
+    "benefits.old_age_security.allowance.income_cap": ("allowance_income_requirement_satisfied", False),
+    "benefits.old_age_security.allowance_for_survivor.income_cap": ("afs_income_requirement_satisfied", False),
+    }
+
+# A threshold above or below every income.
+PROBE = 10 ** 9
+
+
+class Sensitivity:
+    """
+    The sensitivity of `goals` to the income thresholds, for every row of `columns` on `period`.
+
+    `margins` maps each threshold to the amount by which it exceeds each person's
+    income, or NaN for the persons it does not apply to.
+    """
+
+    def __init__(self, tax_benefit_system, columns, period, goals = timeline.GOALS, thresholds = THRESHOLDS, mark_known = True):
+        self.period = periods.period(period)
+        self.goals = tuple(goals)
+        self.thresholds = thresholds
+        graph = dependency_graph(tax_benefit_system)
+        simulation = batch.build_simulation(tax_benefit_system, columns, self.period, mark_known)
+        self.results = {goal: simulation.calculate(goal, self.period) for goal in self.goals}
+        income = simulation.calculate("income", self.period.this_year)
+        parameters = tax_benefit_system.get_parameters_at_instant(self.period.start)
+
+        self.margins = {}
+        self._results_if = {}
+        for path, (rule, _) in thresholds.items():
+            affected = sweep.affected_variables(graph, [path])
+            probes = []
+            for value in (PROBE, -PROBE):
+                reform = parametric_reform(tax_benefit_system, {path: value}, self.period.start)
+                probe = sweep.scenario_simulation(simulation, reform, affected)
+                probes.append((probe.calculate(rule, self.period), {goal: probe.calculate(goal, self.period) for goal in self.goals}))
+            (holds_above, results_above), (holds_below, results_below) = probes
+            applies = holds_above != holds_below
+            threshold = parameter(parameters, path)
+            self.margins[path] = numpy.where(applies, threshold - income, numpy.nan)
+            self._results_if[path] = (results_above, results_below)
+
+    def satisfied(self, path, delta):
+        """Tell, for each person the threshold `path` applies to, whether their income would satisfy it if it changed by `delta`."""
+        margins = self.margins[path] + delta
+        with numpy.errstate(invalid = "ignore"):
+            return margins >= 0 if self.thresholds[path][1] else margins > 0
+
+    def flips(self, path, delta):
+        """Return, for each goal, whether the result of each person would change if the threshold `path` changed by `delta`."""
+        applies = numpy.logical_not(numpy.isnan(self.margins[path]))
+        satisfied = self.satisfied(path, delta)
+        results_above, results_below = self._results_if[path]
+        return {
+            goal: applies & (numpy.where(satisfied, results_above[goal], results_below[goal]) != self.results[goal])
+            for goal in self.goals
+            }
@@ -0,0 +1,18 @@
+"""
+Configuration of `openfisca serve` enabling the response cache and the profiler.
+
+Usage:
+
+    openfisca serve --configuration-file openfisca_canada/serve_config.py
+
+See `openfisca_canada.response_cache` and `openfisca_canada.profiling`.
+"""
+
+
+def post_worker_init(worker):
+    """Gunicorn hook wrapping the web API of each worker in the response cache, then the profiler."""
+    # `openfisca serve` runs this file with separate globals and locals: import here.
+    from openfisca_canada import profiling, response_cache
+
+    response_cache.post_worker_init(worker)
+    profiling.post_worker_init(worker)
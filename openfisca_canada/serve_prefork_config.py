@@ -0,0 +1,22 @@
+"""
+Configuration of `openfisca serve` in pre-fork mode.
+
+The master process loads the web API and prepares its tax and benefit system once, then
+forks the workers, which share it. See `openfisca_canada.prefork`. This only shares the
+resolved parameters: the response cache and the profiler of `serve_config.py` stay off.
+
+Usage:
+
+    openfisca serve --configuration-file openfisca_canada/serve_prefork_config.py --workers 4
+"""
+
+# Load the application in the master, before forking the workers.
+preload_app = True
+
+
+def when_ready(server):
+    """Gunicorn hook preparing the tax and benefit system of the master for its workers."""
+    # `openfisca serve` runs this file with separate globals and locals: import here.
+    from openfisca_canada import prefork
+
+    prefork.when_ready(server)
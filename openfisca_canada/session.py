@@ -0,0 +1,77 @@
+"""
+This file provides questionnaire sessions, which keep their simulation alive from one answer to the next.
+
+A questionnaire asks questions one at a time, and shows the eligibility results after
+each answer. Instead of simulating everything again, a `Session` records each answer
+in the same simulation, and only discards the values of the rules downstream of the
+answered input in the dependency graph (see `openfisca_canada.dependencies`). The
+other rules keep their cached values, so the next results only recompute the rules
+the answer can change. Answering `birth` thus discards a previous answer to `age`,
+which is calculated from it.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> session = Session(CountryTaxBenefitSystem(), "2021-12-01")
+    >>> session.answer("age", 70)  # doctest: +ELLIPSIS
+    ['afs_age_requirement_cap_satisfied', ...]
+    >>> session.results(["oas_eligible_age_requirement_satisfied"])
+    {'oas_eligible_age_requirement_satisfied': array([ True])}
+    >>> session.answer("partner_receiving_oas", True)
+    ['allowance_partner_receiving_requirement_satisfied', 'gis_eligible_income_max', 'gis_eligible_income', 'allowance_eligible', 'gis_eligible', 'allowance_entitlement', 'gis_entitlement']
+"""
+
+import numpy
+from openfisca_core import periods
+from openfisca_core.indexed_enums import Enum
+
+from openfisca_canada import batch
+from openfisca_canada.dependencies import dependency_graph, node_name
+
+
+class Session:
+    """
+    The simulation of `count` persons answering a questionnaire on `period`.
+
+    Sessions of several persons answer the same question at once, with one value per
+    person.
+    """
+
+    def __init__(self, tax_benefit_system, period, count = 1):
+        self.tax_benefit_system = tax_benefit_system
+        self.period = periods.period(period)
+        self.count = count
+        self.graph = dependency_graph(tax_benefit_system)
+        self.simulation = batch.build_simulation(tax_benefit_system, {}, self.period, count = count)
+
+    def answer(self, name, value, known = True):
+        """
+        Record `value` as the answer to the input `name`, and whether it is `known`.
+
+        Return the rules whose values were discarded because they depend on `name`.
+        """
+        node = node_name(self.tax_benefit_system, name)
+        stale = [dependent for dependent in self.graph.downstream([node]) if dependent != node]
+        for dependent in stale:
+            self.simulation.delete_arrays(dependent)
+            known_variable = self.graph.known_variable(dependent)
+            if known_variable:
+                self.simulation.delete_arrays(known_variable)
+
+        self._set_input(name, value)
+        known_variable = self.graph.known_variable(name)
+        if known_variable:
+            self._set_input(known_variable, known)
+        return stale
+
+    def results(self, variables = batch.OUTPUT_VARIABLES):
+        """Return a dictionary mapping each of `variables` to its values, calculated again only if an answer changed them."""
+        return {name: self.simulation.calculate(name, self.period) for name in variables}
+
+    def _set_input(self, name, value):
+        variable = self.tax_benefit_system.get_variable(name, check_existence = True)
+        array = numpy.asarray(value)
+        if array.ndim == 0:
+            array = numpy.full(self.count, value, dtype = variable.dtype if variable.value_type not in (Enum, str) else object)
+        if variable.value_type == Enum:
+            array = batch.encode(variable, array)
+        self.simulation.set_input(name, batch.input_period(variable, self.period), array)
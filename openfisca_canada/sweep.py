@@ -0,0 +1,88 @@
+"""
+This file provides a sweep engine, which evaluates many parameter reforms on the same population.
+
+Running one simulation per reform recalculates every rule for every reform, although a
+reform of, say, `benefits.old_age_security.max_income` can only change the rules that
+read it and the rules depending on them. The engine thus calculates the baseline once,
+and each scenario simulation starts with the values of the baseline for the inputs
+and for every rule that does not depend on the reformed parameters, according to the
+dependency graph (see `openfisca_canada.dependencies`). The arrays are shared, not
+copied, as holders never modify them. Only the rules downstream of the reformed
+parameters are calculated again.
+
+Each scenario is a mapping from parameter paths to their values from the period of
+the sweep on, as for `openfisca_canada.reforms.parametric.parametric_reform`.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> results = sweep(
+    ...     CountryTaxBenefitSystem(),
+    ...     {"age": [65, 66]},
+    ...     "2022-01-01",
+    ...     {"oas_66": {"benefits.old_age_security.eligibility_age": 66}},
+    ...     ["oas_eligible__age_above_eligibility"],
+    ...     )
+    >>> results[BASELINE]["oas_eligible__age_above_eligibility"], results["oas_66"]["oas_eligible__age_above_eligibility"]
+    (array([ True,  True]), array([False,  True]))
+"""
+
+from openfisca_core import periods
+from openfisca_core.simulation_builder import SimulationBuilder
+
+from openfisca_canada import batch
+from openfisca_canada.dependencies import dependency_graph
+from openfisca_canada.reforms.parametric import parametric_reform
+
+
+BASELINE = "baseline"
+
+
+def affected_variables(graph, paths):
+    """Return the names of the variables whose values may change when the parameters `paths` change."""
+    names = set()
+    for node in graph.downstream(graph.parameter_users(paths)):
+        names.add(node)
+        known_variable = graph.known_variable(node)
+        if known_variable:
+            names.add(known_variable)
+    return names
+
+
+def scenario_simulation(baseline_simulation, tax_benefit_system, affected):
+    """
+    Build a simulation of the persons of `baseline_simulation` with the reformed `tax_benefit_system`.
+
+    The values held by `baseline_simulation` are shared with the new simulation, except
+    the ones of the `affected` variables.
+    """
+    builder = SimulationBuilder()
+    builder.create_entities(tax_benefit_system)
+    builder.declare_person_entity(tax_benefit_system.person_entity.key, range(baseline_simulation.persons.count))
+    simulation = builder.build(tax_benefit_system)
+    for population in baseline_simulation.populations.values():
+        for name, holder in population._holders.items():
+            if name in affected:
+                continue
+            target = simulation.get_variable_population(name).get_holder(name)
+            for period in holder.get_known_periods():
+                target.put_in_cache(holder.get_array(period), period)
+    return simulation
+
+
+def sweep(tax_benefit_system, columns, period, scenarios, variables = batch.OUTPUT_VARIABLES, mark_known = True):
+    """
+    Calculate `variables` on `period` for every row of `columns`, with the baseline and each of `scenarios`.
+
+    `scenarios` maps scenario names to mappings from parameter paths to values. Return a
+    dictionary mapping `BASELINE` and each scenario name to the results of its
+    simulation, as returned by `batch.calculate`.
+    """
+    period = periods.period(period)
+    graph = dependency_graph(tax_benefit_system)
+    baseline_simulation = batch.build_simulation(tax_benefit_system, columns, period, mark_known)
+    results = {BASELINE: {name: baseline_simulation.calculate(name, period) for name in variables}}
+    for scenario, values in scenarios.items():
+        reform = parametric_reform(tax_benefit_system, values, period.start)
+        simulation = scenario_simulation(baseline_simulation, reform, affected_variables(graph, values))
+        results[scenario] = {name: simulation.calculate(name, period) for name in variables}
+    return results
@@ -0,0 +1,107 @@
+"""Tests for the columnar batch entry point."""
+
+import numpy
+from numpy import testing
+from openfisca_core.simulation_builder import SimulationBuilder
+import pytest
+
+from openfisca_canada import batch, CountryTaxBenefitSystem
+
+
+PERIOD = "2021-12-01"
+
+COLUMNS = {
+    "age": [65, 62, 70],
+    "income": [10000, 20000, 200000],
+    "place_of_residence": ["CA", "GR", "CA"],
+    "legal_status": ["CANADIAN_CITIZEN", "PERMANENT_RESIDENT", "OTHER"],
+    "years_in_canada_since_18": [20, 12, 40],
+    "marital_status": ["SINGLE", "WIDOWED", "MARRIED"],
+    "partner_receiving_oas": [False, False, True],
+    "eligible_under_social_agreement": [False, True, False],
+    }
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+
+def situation(index):
+    """Describe the person on row `index` of `COLUMNS` the way the web API expects."""
+    person = {}
+    for name, column in COLUMNS.items():
+        period = "2021" if name == "income" else PERIOD
+        person[name] = {period: column[index]}
+        person[f"{name}_known"] = {period: True}
+    return person
+
+
+def test_batch_matches_situations():
+    """Columnar inputs give the same results as the equivalent nested situation."""
+    results = batch.calculate(tax_benefit_system, COLUMNS, PERIOD)
+    simulation = SimulationBuilder().build_from_entities(tax_benefit_system, {
+        "persons": {f"person_{index}": situation(index) for index in range(3)},
+        })
+
+    for name in batch.OUTPUT_VARIABLES:
+        testing.assert_array_equal(results[name], simulation.calculate(name, PERIOD), err_msg = name)
+
+
+def test_missing_known_column_means_unknown_when_not_marked():
+    """Without `mark_known`, inputs without a `_known` column are unknown."""
+    results = batch.calculate(tax_benefit_system, {"age": [65]}, PERIOD, ["oas_eligible_age_requirement_satisfied_known"], mark_known = False)
+    testing.assert_array_equal(results["oas_eligible_age_requirement_satisfied_known"], [False])
+
+
+def test_columns_must_have_the_same_length():
+    """Columns of different lengths cannot describe the same persons."""
+    with pytest.raises(ValueError):
+        batch.calculate(tax_benefit_system, {"age": [65, 66], "income": [0]}, PERIOD)
+
+
+def test_text_columns_of_python_objects_are_encoded():
+    """Text columns, as handed out by pandas or Arrow, are read as enumeration items."""
+    columns = {name: numpy.array(column, dtype = object) for name, column in COLUMNS.items()}
+    results = batch.calculate(tax_benefit_system, columns, PERIOD, ["legal_status", "place_of_residence"])
+
+    testing.assert_array_equal(results["legal_status"].decode_to_str(), COLUMNS["legal_status"])
+    testing.assert_array_equal(results["place_of_residence"].decode_to_str(), COLUMNS["place_of_residence"])
+
+
+def test_unknown_enumeration_items_are_rejected():
+    """A value that is not an item of the enumeration is an error, not the default value."""
+    with pytest.raises(ValueError):
+        batch.calculate(tax_benefit_system, {"place_of_residence": ["Canada"]}, PERIOD)
+
+
+def test_releasing_intermediates_gives_the_same_results():
+    """Releasing intermediate variables changes what the simulation holds, not the results."""
+    results = batch.calculate(tax_benefit_system, COLUMNS, PERIOD, release_intermediates = True)
+    expected = batch.calculate(tax_benefit_system, COLUMNS, PERIOD)
+
+    for name in batch.OUTPUT_VARIABLES:
+        testing.assert_array_equal(results[name], expected[name], err_msg = name)
+
+
+def test_only_inputs_and_requested_variables_are_held():
+    """Intermediate variables are released once all the variables using them are calculated."""
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD)
+    batch.calculate_releasing_intermediates(simulation, PERIOD, ["oas_entitlement", "gis_entitlement"])
+    held = {name for name, holder in simulation.persons._holders.items() if holder.get_known_periods()}
+
+    assert "oas_eligible__age_above_eligibility_known" not in held
+    assert "oas_eligible" not in held
+    assert {"oas_entitlement", "gis_entitlement", "age", "age_known", "income"} <= held
+
+
+def test_packed_booleans_are_released_too():
+    """Packing booleans creates their holders up front, which does not make them inputs."""
+    held = {}
+    for pack_booleans in (False, True):
+        simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD, pack_booleans = pack_booleans)
+        results = batch.calculate_releasing_intermediates(simulation, PERIOD)
+        held[pack_booleans] = {name for name, holder in simulation.persons._holders.items() if holder.get_known_periods()}
+    expected = batch.calculate(tax_benefit_system, COLUMNS, PERIOD, pack_booleans = True)
+
+    assert "oas_eligible__age_above_eligibility" not in held[True]
+    assert held[True] == held[False]
+    for name in batch.OUTPUT_VARIABLES:
+        testing.assert_array_equal(results[name], expected[name], err_msg = name)
@@ -0,0 +1,56 @@
+"""Tests for the bounded cache of parameters."""
+
+from openfisca_core import periods
+
+from openfisca_canada import batch, CountryTaxBenefitSystem
+from openfisca_canada.cache import LRUCache, RegimeCache
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    """Reading an entry keeps it in the cache."""
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.get("a")
+    cache["c"] = 3
+
+    assert list(cache) == ["a", "c"]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_parameters_are_kept_for_a_bounded_number_of_instants():
+    """Running on many dates does not grow the parameters cache without limit."""
+    tax_benefit_system = CountryTaxBenefitSystem()
+    tax_benefit_system._parameters_at_instant_cache.maxsize = 10
+    start = periods.instant("2021-01-01")
+
+    for day in range(50):
+        eligibility_age = tax_benefit_system.get_parameters_at_instant(start.offset(day, "day")).benefits.old_age_security.eligibility_age
+
+    assert len(tax_benefit_system._parameters_at_instant_cache) == 10
+    assert eligibility_age == 65
+
+
+def test_parameters_are_resolved_once_per_instant():
+    """Formulas asking for the parameters of an instant again get the ones resolved the first time."""
+    tax_benefit_system = CountryTaxBenefitSystem()
+    cache = tax_benefit_system._parameters_at_instant_cache
+
+    first = tax_benefit_system.get_parameters_at_instant("2021-12-01")
+    batch.calculate(tax_benefit_system, {"age": [65]}, "2021-12-01")
+
+    assert cache.hits > 0 and cache.misses == 1
+    assert tax_benefit_system.get_parameters_at_instant(periods.period("2021-12-01")) is first
+
+
+def test_instants_of_a_regime_share_their_entry():
+    """Instants between two changes are stored once, under the first instant of their regime."""
+    instants = [periods.instant("2020-01-01"), periods.instant("2021-04-01")]
+    cache = RegimeCache(instants, 10)
+    cache[periods.instant("2020-06-30")] = "2020"
+    cache[periods.instant("1999-12-31")] = "before"
+
+    assert cache.get(periods.instant("2021-03-31")) == "2020"
+    assert cache.get(periods.instant("2021-04-01")) is None
+    assert cache.get(periods.instant("1900-01-01")) == "before"
+    assert list(cache) == [instants[0], None]
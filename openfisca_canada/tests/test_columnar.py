@@ -0,0 +1,57 @@
+"""Tests for the columnar writer of simulation results."""
+
+import numpy
+import pytest
+
+from openfisca_canada import batch, columnar, CountryTaxBenefitSystem
+
+
+pyarrow = pytest.importorskip("pyarrow")
+parquet = pytest.importorskip("pyarrow.parquet")
+
+PERIOD = "2021-12-01"
+COLUMNS = {
+    "age": [65, 40, 70],
+    "income": [10000, 20000, 200000],
+    "legal_status": ["CANADIAN_CITIZEN", "OTHER", "PERMANENT_RESIDENT"],
+    "place_of_residence": ["CA", "GR", "CA"],
+    }
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+
+def test_numeric_columns_share_the_memory_of_the_holders():
+    """Arrow columns point to the arrays held by the simulation."""
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD)
+    results = columnar.results(simulation, PERIOD, ["oas_entitlement", "age"])
+    arrow_table = columnar.table(results)
+
+    assert arrow_table.column("oas_entitlement").chunk(0).buffers()[1].address == results["oas_entitlement"].ctypes.data
+    assert results["age"] is simulation.persons.get_holder("age").get_array(PERIOD)
+
+
+@pytest.mark.parametrize("file_name", ["results.parquet", "results.arrow"])
+def test_written_files_hold_the_results(tmp_path, file_name):
+    """Results read back from the file are the results of the simulation, with enumerations as dictionaries."""
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD)
+    variables = batch.OUTPUT_VARIABLES + ("legal_status", "income")
+    path = str(tmp_path / file_name)
+    columnar.write(simulation, path, PERIOD, variables)
+
+    if file_name.endswith(".parquet"):
+        arrow_table = parquet.read_table(path)
+    else:
+        arrow_table = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+    assert arrow_table.column_names == list(variables)
+    assert pyarrow.types.is_dictionary(arrow_table.schema.field("legal_status").type)
+    assert arrow_table.column("legal_status").to_pylist() == COLUMNS["legal_status"]
+    assert arrow_table.column("income").to_pylist() == COLUMNS["income"]
+    expected = batch.calculate(tax_benefit_system, COLUMNS, PERIOD)
+    for name in batch.OUTPUT_VARIABLES:
+        numpy.testing.assert_array_equal(arrow_table.column(name).to_numpy(), expected[name], err_msg = name)
+
+
+def test_unknown_extensions_are_rejected():
+    """Only Parquet and Arrow IPC files are columnar."""
+    with pytest.raises(ValueError):
+        columnar.file_format("results.json")
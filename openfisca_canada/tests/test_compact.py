@@ -0,0 +1,26 @@
+"""Tests for the compact representations of person variables."""
+
+import numpy
+from numpy import testing
+
+from openfisca_canada import batch, CountryTaxBenefitSystem
+from openfisca_canada.tests.test_batch import COLUMNS, PERIOD
+
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+
+def test_small_integers_are_stored_compactly():
+    """Ages are stored as 16-bit integers."""
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD)
+    assert simulation.calculate("age", PERIOD).dtype == numpy.int16
+
+
+def test_packed_booleans_give_the_same_results():
+    """Packing booleans changes how they are stored, not their values."""
+    expected = batch.calculate(tax_benefit_system, COLUMNS, PERIOD)
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD, pack_booleans = True)
+
+    for name in batch.OUTPUT_VARIABLES:
+        testing.assert_array_equal(simulation.calculate(name, PERIOD), expected[name], err_msg = name)
+    assert simulation.person.get_holder("oas_eligible").get_memory_usage()["total_nb_bytes"] == 1
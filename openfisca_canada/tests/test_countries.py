@@ -0,0 +1,61 @@
+"""Tests for the enumeration of countries."""
+
+import numpy
+import pytest
+from numpy import testing
+from openfisca_core.errors import SituationParsingError
+from openfisca_core.simulation_builder import SimulationBuilder
+
+from openfisca_canada import batch, CountryTaxBenefitSystem
+from openfisca_canada.countries import country_options, is_in
+
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+
+def test_membership_matches_isin_on_codes():
+    """Looking countries up in the membership table is the same as comparing their codes."""
+    codes = [item.name for item in country_options]
+    agreement_countries = tax_benefit_system.parameters("2021-12-01").benefits.social_agreement_countries
+
+    testing.assert_array_equal(
+        is_in(country_options.encode(numpy.array(codes)), agreement_countries),
+        numpy.isin(codes, agreement_countries),
+        )
+
+
+def test_every_agreement_country_is_an_option():
+    """Every country ever listed in the social agreement countries can be a place of residence."""
+    for value_at_instant in tax_benefit_system.parameters.benefits.social_agreement_countries.values_list:
+        for code in value_at_instant.value:
+            assert code in country_options.__members__, code
+
+
+def test_countries_are_distinct_items():
+    """Two codes with the same label would be merged into a single item by `Enum`."""
+    assert len(country_options) == len(country_options.__members__)
+
+
+def test_unknown_and_uk_behave_as_the_former_text_codes():
+    """`ZZ`, the default, and `UK` give the results the former text inputs `""` and `"UK"` gave."""
+    columns = {"place_of_residence": ["ZZ", "UK", "GB", "CA"]}
+    simulation = batch.build_simulation(tax_benefit_system, columns, "2021-12-01")
+    default = batch.build_simulation(tax_benefit_system, {}, "2021-12-01", count = 1)
+
+    # Like "" and the other codes missing from the list, ZZ is neither Canada nor an agreement country; "UK" is listed.
+    testing.assert_array_equal(simulation.calculate("resides_in_agreement_country", "2021-12-01"), [False, True, False, False])
+    testing.assert_array_equal(simulation.calculate("oas_eligible_required_residency_duration_amount", "2021-12-01"), [20, 20, 20, 10])
+    assert default.calculate("place_of_residence", "2021-12-01").decode_to_str().tolist() == ["ZZ"]
+    for name in batch.OUTPUT_VARIABLES:
+        if name.endswith("_known"):
+            # Only the given place of residence is known.
+            continue
+        assert default.calculate(name, "2021-12-01")[0] == simulation.calculate(name, "2021-12-01")[0], name
+
+
+def test_codes_must_be_upper_case_options():
+    """Lower case or unlisted codes, formerly accepted as text, are rejected."""
+    with pytest.raises(ValueError, match = "Unknown values"):
+        batch.build_simulation(tax_benefit_system, {"place_of_residence": ["ca", "XX"]}, "2021-12-01")
+    with pytest.raises(SituationParsingError):
+        SimulationBuilder().build_from_entities(tax_benefit_system, {"persons": {"p": {"place_of_residence": {"2021-12-01": "ca"}}}})
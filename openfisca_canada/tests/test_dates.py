@@ -0,0 +1,44 @@
+"""Tests for the date arithmetic of ages and the `age` formula."""
+
+import numpy
+from numpy import testing
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, dates
+
+
+TAX_BENEFIT_SYSTEM = CountryTaxBenefitSystem()
+
+
+def test_february_29_birthdays_fall_on_march_1_in_common_years():
+    """A person born on February 29th is a year older from March 1st on common years."""
+    birth = numpy.array(["1956-02-29"] * 3, dtype = "datetime64[D]")
+    days = numpy.array(["2021-02-28", "2021-03-01", "2024-02-29"], dtype = "datetime64[D]")
+
+    testing.assert_array_equal(dates.age_on(birth, days), [64, 65, 68])
+    testing.assert_array_equal(dates.birthdays(birth, days.astype("datetime64[Y]")), numpy.array(["2021-03-01", "2021-03-01", "2024-02-29"], dtype = "datetime64[D]"))
+
+
+def test_age_is_calculated_from_birth_and_as_known_as_birth():
+    """Without an age, it is calculated from the birth date, and known if the birth date is."""
+    simulation = batch.build_simulation(TAX_BENEFIT_SYSTEM, {"birth": ["1956-12-01", "1956-12-02"], "birth_known": [True, False]}, "2021-12-01")
+
+    testing.assert_array_equal(simulation.calculate("age", "2021-12-01"), [65, 64])
+    testing.assert_array_equal(simulation.calculate("age_known", "2021-12-01"), [True, False])
+    testing.assert_array_equal(simulation.calculate("oas_eligible__age_above_eligibility", "2021-12-01"), [True, False])
+
+
+def test_birth_dates_are_split_once_per_simulation():
+    """Ages on other days reuse the years and days of the year of the birth dates."""
+    simulation = batch.build_simulation(TAX_BENEFIT_SYSTEM, {"birth": ["1956-12-01"]}, "2021-12-01")
+    simulation.calculate("age", "2021-12-01")
+    split = simulation._birth_split
+
+    testing.assert_array_equal(simulation.calculate("age", "2021-11-30"), [64])
+    assert simulation._birth_split is split
+
+
+def test_given_ages_are_used_instead_of_birth():
+    """An age given as an input is not calculated from the birth date."""
+    results = batch.calculate(TAX_BENEFIT_SYSTEM, {"age": [70], "birth": ["2000-01-01"]}, "2021-12-01", ["age", "age_known"])
+
+    assert (results["age"][0], results["age_known"][0]) == (70, True)
@@ -0,0 +1,103 @@
+"""Tests for the dependency graph and the explanations built on it."""
+
+import numpy
+
+from openfisca_canada import batch, CountryTaxBenefitSystem
+from openfisca_canada.dependencies import dependency_graph
+from openfisca_canada.explanation import conditionally_known, explain, node_states, relevant_input_matrix, relevant_inputs
+
+
+PERIOD = "2021-12-01"
+
+tax_benefit_system = CountryTaxBenefitSystem()
+graph = dependency_graph(tax_benefit_system)
+
+
+def random_simulation(count = 200, seed = 0):
+    """Build a simulation where each input is known for a random half of the persons."""
+    generator = numpy.random.default_rng(seed)
+    columns = {
+        "age": generator.integers(55, 75, count),
+        "income": generator.integers(0, 100000, count),
+        "place_of_residence": generator.choice(["CA", "GR", "ZZ"], count),
+        "legal_status": generator.choice(["CANADIAN_CITIZEN", "OTHER"], count),
+        "years_in_canada_since_18": generator.integers(0, 40, count),
+        "marital_status": generator.choice(["SINGLE", "MARRIED", "WIDOWED"], count),
+        "partner_receiving_oas": generator.integers(0, 2, count).astype(bool),
+        "eligible_under_social_agreement": generator.integers(0, 2, count).astype(bool),
+        }
+    columns.update({f"{name}_known": generator.integers(0, 2, count).astype(bool) for name in list(columns)})
+    return batch.build_simulation(tax_benefit_system, columns, PERIOD)
+
+
+def paths(start, end):
+    """Enumerate every path from `start` down to `end` in the dependency graph."""
+    if start == end:
+        yield [end]
+    for dependency in graph.dependencies[start]:
+        for path in paths(dependency, end):
+            yield [start] + path
+
+
+def test_formulas_dependencies_are_found():
+    """Dependencies are read from the formulas, with `_known` variables folded into their node."""
+    assert graph.dependencies["gis_eligible_income_max"] == ("gis_eligible_income_max_partnered", "marital_status", "partner_receiving_oas")
+    assert graph.order.index("marital_status") < graph.order.index("gis_eligible_income_max")
+    assert "oas_eligible_known" not in graph.dependencies
+
+
+def test_relevant_inputs_match_path_enumeration():
+    """An input is relevant when a path of unknown variables leads to it from the goal."""
+    simulation = random_simulation()
+    for goal in ("oas_eligible", "gis_eligible", "allowance_eligible", "afs_eligible"):
+        states = node_states(simulation, graph.upstream([goal]), PERIOD)
+        relevant = relevant_inputs(simulation, goal, PERIOD)
+        for name, is_relevant in relevant.items():
+            for index in range(len(is_relevant)):
+                expected = any(not any(states[node][2][index] for node in path) for path in paths(goal, name))
+                assert is_relevant[index] == expected, (goal, name, index)
+
+
+def test_shared_rules_are_explained_once():
+    """A rule used twice is only detailed the first time."""
+    simulation = batch.build_simulation(tax_benefit_system, {"age": [70], "marital_status": ["MARRIED"]}, PERIOD)
+    lines = [line.strip() for line in explain(simulation, "allowance_eligible", PERIOD).splitlines()]
+
+    assert lines[0] == "allowance_eligible as of 2021-12-01 is False, because"
+    assert "allowance_residence_duration_satisfied as of 2021-12-01 is unknown, potentially False, because" in lines
+    assert "allowance_residence_duration_satisfied as of 2021-12-01 is unknown, potentially False (explained above)" in lines
+
+
+def test_rules_given_as_inputs_are_not_explained_further():
+    """A given age is not explained by the unknown birth date it could be calculated from."""
+    simulation = batch.build_simulation(tax_benefit_system, {"age": [40]}, PERIOD)
+    lines = explain(simulation, "oas_eligible__age_above_eligibility", PERIOD).splitlines()
+
+    assert lines[-1].strip() == "age as of 2021-12-01 is 40"
+
+
+def test_matrix_holds_the_inputs_relevant_to_any_goal():
+    """Each row tells which askable inputs are relevant to at least one goal for a person."""
+    simulation = random_simulation()
+    goals = ["oas_eligible", "gis_eligible", "allowance_eligible", "afs_eligible"]
+    inputs, matrix = relevant_input_matrix(simulation, goals, PERIOD, unaskable = {"eligible_under_social_agreement"})
+
+    assert matrix.shape == (200, len(inputs))
+    assert "eligible_under_social_agreement" not in inputs
+    for column, name in enumerate(inputs):
+        expected = numpy.any([relevant_inputs(simulation, goal, PERIOD).get(name, numpy.zeros(200, dtype = bool)) for goal in goals], axis = 0)
+        numpy.testing.assert_array_equal(matrix[:, column], expected, err_msg = name)
+
+
+def test_conclusion_waiting_only_for_unaskable_inputs_is_conditionally_known():
+    """Only unaskable inputs remain for the second person, whose residence is known to be abroad."""
+    columns = {
+        "age": [65, 65],
+        "income": [10000, 10000],
+        "place_of_residence": ["CA", "GR"],
+        "years_in_canada_since_18": [20, 20],
+        "legal_status": ["CANADIAN_CITIZEN", "CANADIAN_CITIZEN"],
+        }
+    simulation = batch.build_simulation(tax_benefit_system, columns, PERIOD)
+
+    numpy.testing.assert_array_equal(conditionally_known(simulation, "oas_eligible", PERIOD, {"eligible_under_social_agreement"}), [False, True])
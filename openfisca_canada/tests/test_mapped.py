@@ -0,0 +1,92 @@
+"""Tests for memory-mapped populations."""
+
+import numpy
+import pytest
+from openfisca_core import periods
+
+from openfisca_canada import batch, columnar, CountryTaxBenefitSystem, mapped, population, runner
+
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+PERIOD = periods.period("2021-12-01")
+
+COLUMNS = population.generate(200, missing = 0.1, seed = 0)
+
+
+def held(simulation, name):
+    """Return the array held by `simulation` for the input `name`."""
+    variable = tax_benefit_system.variables[name]
+    return simulation.get_variable_population(name).get_holder(name).get_array(batch.input_period(variable, PERIOD))
+
+
+def test_mapped_populations_give_the_results_of_their_columns(tmp_path):
+    """A saved and mapped population is simulated like its columns."""
+    mapped.save(tax_benefit_system, COLUMNS, str(tmp_path))
+    simulation = mapped.build_simulation(tax_benefit_system, str(tmp_path), PERIOD)
+    expected = batch.calculate(tax_benefit_system, COLUMNS, PERIOD)
+
+    assert mapped.count(str(tmp_path)) == 200
+    for name in batch.OUTPUT_VARIABLES:
+        assert (simulation.calculate(name, PERIOD) == expected[name]).all(), name
+
+
+def test_holders_store_the_mapped_arrays(tmp_path):
+    """Inputs are saved in the types of their variables, so holders keep the read-only mapped arrays."""
+    mapped.save(tax_benefit_system, COLUMNS, str(tmp_path))
+    columns = mapped.load(tax_benefit_system, str(tmp_path), slice(50, 150))
+    simulation = batch.build_simulation(tax_benefit_system, columns, PERIOD)
+
+    for name, array in columns.items():
+        assert isinstance(array, numpy.memmap), name
+        assert numpy.shares_memory(held(simulation, name), array), name
+        assert not held(simulation, name).flags.writeable, name
+    assert held(simulation, "place_of_residence").decode_to_str().tolist() == COLUMNS["place_of_residence"][50:150].tolist()
+
+
+def test_arrow_files_are_mapped(tmp_path):
+    """Numbers and dictionary-encoded enumerations of Arrow IPC files are mapped, in any order of their items."""
+    pyarrow = pytest.importorskip("pyarrow")
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD)
+    arrow_table = columnar.table({name: held(simulation, name) for name in COLUMNS})
+    arrow_table = arrow_table.set_column(
+        arrow_table.column_names.index("legal_status"),
+        "legal_status",
+        pyarrow.array(COLUMNS["legal_status"].astype(str)).dictionary_encode(),
+        )
+    path = str(tmp_path / "persons.arrow")
+    columnar.write_table(arrow_table, path)
+
+    columns = mapped.load(tax_benefit_system, path, slice(20, 120))
+    mapped_simulation = batch.build_simulation(tax_benefit_system, columns, PERIOD)
+
+    assert mapped.count(path) == 200
+    assert not held(mapped_simulation, "age").flags.writeable
+    assert not held(mapped_simulation, "place_of_residence").flags.writeable
+    for name in COLUMNS:
+        assert (held(mapped_simulation, name) == held(simulation, name)[20:120]).all(), name
+
+
+def test_arrow_files_of_several_record_batches_are_mapped(tmp_path):
+    """Files written chunk by chunk are mapped per record batch, and only rows spanning batches are copied."""
+    pytest.importorskip("pyarrow")
+    simulation = batch.build_simulation(tax_benefit_system, COLUMNS, PERIOD)
+    path = str(tmp_path / "persons.arrow")
+    with runner.ChunkWriter(path) as writer:
+        for start in range(0, 200, 80):
+            writer.write({name: held(simulation, name)[start:start + 80] for name in COLUMNS})
+
+    slices = list(mapped.row_slices(path, 50))
+    assert mapped.count(path) == 200
+    assert [(rows.start, rows.stop) for rows in slices] == [(0, 50), (50, 80), (80, 130), (130, 160), (160, 200)]
+    for rows in slices:
+        assert not mapped.load(tax_benefit_system, path, rows)["age"].flags.writeable
+    columns = mapped.load(tax_benefit_system, path, slice(60, 170))
+    for name in COLUMNS:
+        assert (columns[name] == numpy.asarray(held(simulation, name))[60:170]).all(), name
+
+
+def test_only_arrow_files_are_mapped(tmp_path):
+    """Other files are rejected."""
+    with pytest.raises(ValueError, match = "Only Arrow IPC"):
+        mapped.load(tax_benefit_system, str(tmp_path / "persons.parquet"))
@@ -0,0 +1,52 @@
+"""Tests for the generator of synthetic populations."""
+
+import numpy
+from openfisca_core.simulation_builder import SimulationBuilder
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, population
+
+
+PERIOD = "2021-12-01"
+TAX_BENEFIT_SYSTEM = CountryTaxBenefitSystem()
+
+
+def test_inputs_are_consistent():
+    """Adults only, no more years in Canada than years since 18, and only partners receive OAS."""
+    columns = population.generate(100_000, seed = 0)
+
+    assert columns["age"].min() >= 18
+    assert (columns["years_in_canada_since_18"] <= columns["age"] - 18).all()
+    assert not columns["partner_receiving_oas"][numpy.isin(columns["marital_status"], ("SINGLE", "WIDOWED"))].any()
+    assert (columns["place_of_residence"][columns["legal_status"] == "CANADIAN_CITIZEN"] == "CA").mean() > 0.9
+    assert not columns["eligible_under_social_agreement"][~columns["resided_in_agreement_country"]].any()
+
+
+def test_generation_is_reproducible():
+    """The same seed draws the same population."""
+    first, second = population.generate(1000, seed = 1), population.generate(1000, seed = 1)
+    assert all(numpy.array_equal(first[name], second[name]) for name in first)
+
+
+def test_missingness():
+    """Each input is unknown for the share of persons asked, per input if needed."""
+    columns = population.generate(100_000, missing = {"income": 0.5}, seed = 0)
+
+    assert abs(columns["income_known"].mean() - 0.5) < 0.01
+    assert columns["age_known"].all()
+    assert set(columns) == set(population.INPUT_VARIABLES) | {name + "_known" for name in population.INPUT_VARIABLES}
+
+
+def test_situation_gives_the_results_of_the_columns():
+    """The web API situation of a population gives the known results of its columns."""
+    columns = population.generate(50, missing = 0.3, seed = 0)
+    situation = population.situation(TAX_BENEFIT_SYSTEM, columns, PERIOD, ["oas_eligible"])
+
+    assert situation["persons"]["person0"]["oas_eligible"] == {PERIOD: None}
+    simulation = SimulationBuilder().build_from_entities(TAX_BENEFIT_SYSTEM, situation)
+    results = batch.calculate(TAX_BENEFIT_SYSTEM, columns, PERIOD)
+    for benefit in batch.BENEFITS:
+        known = simulation.calculate(f"{benefit}_eligible_known", PERIOD)
+        assert numpy.array_equal(known, results[f"{benefit}_eligible_known"])
+        for name in (f"{benefit}_eligible", f"{benefit}_entitlement"):
+            # Unknown inputs are left out of the situation, but keep the value drawn in the columns.
+            assert numpy.array_equal(simulation.calculate(name, PERIOD)[known], results[name][known]), name
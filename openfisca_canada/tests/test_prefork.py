@@ -0,0 +1,65 @@
+"""Tests for the pre-fork mode of the web API."""
+
+import gc
+import os
+
+import numpy
+from openfisca_core import periods
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, population, prefork
+
+
+COLUMNS = population.generate(100, seed = 0)
+
+
+def test_parameters_resolved_by_regime_give_the_same_results():
+    """Sharing the parameters by regime changes no result, on any day."""
+    shared = CountryTaxBenefitSystem()
+    prefork.share_parameters(shared)
+    instants = prefork.regime_instants(shared)
+    cache = shared._parameters_at_instant_cache
+    assert len(cache) > 0
+
+    for day in (str(instants[-1]), "2013-07-15", "2021-12-01", "2030-02-28"):
+        expected = batch.calculate(CountryTaxBenefitSystem(), COLUMNS, day)
+        results = batch.calculate(shared, COLUMNS, day)
+        for name in batch.OUTPUT_VARIABLES:
+            assert numpy.array_equal(results[name], expected[name]), (day, name)
+    assert len(cache) <= len(instants) + 1
+    assert cache.hits > 0
+
+
+def test_regimes_are_resolved_before_forking():
+    """Workers find the parameters of every regime already resolved."""
+    tax_benefit_system = CountryTaxBenefitSystem()
+    prefork.share_parameters(tax_benefit_system)
+    cache = tax_benefit_system._parameters_at_instant_cache
+    hits, misses = cache.hits, cache.misses
+    assert len(cache) == len(prefork.regime_instants(tax_benefit_system))
+
+    tax_benefit_system.get_parameters_at_instant(periods.instant("2022-03-14"))
+
+    assert cache.hits == hits + 1
+    assert cache.misses == misses
+
+
+def test_master_systems_are_prepared_and_frozen():
+    """The hook prepares every tax and benefit system of the master, and freezes the collected objects."""
+    tax_benefit_system = CountryTaxBenefitSystem()
+    try:
+        prefork.when_ready(server = None)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+    assert tax_benefit_system._parameters_at_instant_cache.instants == prefork.regime_instants(tax_benefit_system)
+
+
+def test_configuration_preloads_the_application():
+    """The configuration file loads the web API in the master, and wraps it in no other middleware."""
+    configuration = {}
+    with open(os.path.join(os.path.dirname(prefork.__file__), "serve_prefork_config.py")) as file:
+        exec(file.read(), {}, configuration)  # noqa: S102
+
+    assert configuration["preload_app"] is True
+    assert callable(configuration["when_ready"])
+    assert "post_worker_init" not in configuration
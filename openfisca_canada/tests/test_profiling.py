@@ -0,0 +1,90 @@
+"""Tests for the profiler of variables."""
+
+import io
+import json
+
+import pytest
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, profiling
+
+
+PERIOD = "2021-12-01"
+TAX_BENEFIT_SYSTEM = CountryTaxBenefitSystem()
+
+
+@pytest.fixture
+def profiler():
+    """The shared profiler, enabled and empty, and disabled again after the test."""
+    profiling.profiler.reset()
+    profiling.profiler.enable()
+    yield profiling.profiler
+    profiling.profiler.disable()
+    profiling.profiler.reset()
+
+
+def test_requests_hits_and_misses_are_counted(profiler):
+    """Each formula runs once per simulation; the other requests of its variable are hits."""
+    batch.calculate(TAX_BENEFIT_SYSTEM, {"age": [65, 70, 40]}, PERIOD)
+    statistics = profiler.statistics()
+
+    assert statistics["oas_eligible"]["misses"] == 1
+    assert statistics["oas_eligible"]["hits"] == statistics["oas_eligible"]["requests"] - 1 > 0
+    assert statistics["oas_eligible"]["cells"] == 3
+    assert statistics["oas_entitlement"]["bytes"] == 3 * 8
+    for values in statistics.values():
+        assert 0 <= values["self_seconds"] <= values["seconds"]
+    # Inputs have no formula: all their requests are hits.
+    assert statistics["age"]["misses"] == 0 < statistics["age"]["requests"]
+
+
+def test_nothing_is_recorded_while_disabled(profiler):
+    """Disabling the profiler keeps the statistics, but records nothing more."""
+    profiler.disable()
+    batch.calculate(TAX_BENEFIT_SYSTEM, {"age": [65]}, PERIOD)
+    assert profiler.statistics() == {}
+
+
+def test_prometheus_export(profiler):
+    """Each statistic is a counter labelled by variable."""
+    batch.calculate(TAX_BENEFIT_SYSTEM, {"age": [65]}, PERIOD, ["oas_eligible"])
+    text = profiler.to_prometheus()
+
+    assert "# TYPE openfisca_canada_variable_cache_misses_total counter" in text
+    samples = [line for line in text.splitlines() if line.startswith("openfisca_canada_variable_cache_misses_total") and '"oas_eligible"' in line]
+    assert samples[0].endswith(" 1")
+    assert json.loads(profiler.to_json())["oas_eligible"]["misses"] == 1
+
+
+def request(application, method, path):
+    """Send an empty request to `application`, and return the status and the decoded response."""
+    environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "CONTENT_LENGTH": "0", "wsgi.input": io.BytesIO()}
+    response = {}
+
+    def start_response(status, headers):
+        response["status"] = status
+
+    content = b"".join(application(environ, start_response)).decode("utf-8")
+    return response["status"], content
+
+
+def test_middleware_toggles_and_serves_the_profiler(profiler):
+    """Profiling routes are answered by the middleware, other routes by the web API."""
+    application = profiling.ProfilingMiddleware(lambda environ, start_response: start_response("404 NOT FOUND", []) or [b""], toggles = True)
+
+    assert json.loads(request(application, "POST", profiling.DISABLE_PATH)[1]) == {"enabled": False}
+    assert not profiler.enabled
+    assert json.loads(request(application, "POST", profiling.ENABLE_PATH)[1]) == {"enabled": True}
+    batch.calculate(TAX_BENEFIT_SYSTEM, {"age": [65]}, PERIOD, ["oas_eligible"])
+
+    assert json.loads(request(application, "GET", profiling.JSON_PATH)[1])["oas_eligible"]["misses"] == 1
+    assert "oas_eligible" in request(application, "GET", profiling.PROMETHEUS_PATH)[1]
+    assert request(application, "GET", "/calculate")[0] == "404 NOT FOUND"
+
+
+def test_profiler_is_only_toggled_when_allowed(profiler):
+    """Toggles are refused by default, even from the local machine, and leave the profiler as it was."""
+    application = profiling.ProfilingMiddleware(lambda environ, start_response: start_response("404 NOT FOUND", []) or [b""])
+
+    assert request(application, "POST", profiling.DISABLE_PATH)[0] == "403 FORBIDDEN"
+    assert profiler.enabled
+    assert request(application, "GET", profiling.JSON_PATH)[0] == "200 OK"
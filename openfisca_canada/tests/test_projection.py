@@ -0,0 +1,66 @@
+"""Tests for the solver of eligibility dates."""
+
+import numpy
+from numpy import testing
+from openfisca_core import periods
+import pytest
+
+from openfisca_canada import CountryTaxBenefitSystem, projection, timeline
+
+
+START = "2021-12-01"
+STOP = "2040-12-31"
+
+COLUMNS = {
+    "birth": ["1957-01-10", "1961-12-15", "1956-02-29", "1990-06-01", "1970-03-01"],
+    "income": [10000, 20000, 200000, 10000, 10000],
+    "marital_status": ["SINGLE", "MARRIED", "WIDOWED", "SINGLE", "WIDOWED"],
+    "partner_receiving_oas": [False, True, False, False, False],
+    "legal_status": ["CANADIAN_CITIZEN", "PERMANENT_RESIDENT", "CANADIAN_CITIZEN", "CANADIAN_CITIZEN", "CANADIAN_CITIZEN"],
+    "place_of_residence": ["CA", "CA", "CA", "CA", "CA"],
+    "years_in_canada_since_18": [40, 30, 40, 1, 20],
+    }
+
+
+def first_eligible_days(points, name, count):
+    """Return the first day on which `name` is true for each person in the change points `points`, or NaT."""
+    days = numpy.full(count, numpy.datetime64("NaT"), dtype = "datetime64[D]")
+    for person, day, eligible in zip(points["person"][::-1], points["date"][::-1], points[name][::-1]):
+        if eligible:
+            days[person] = day
+    return days
+
+
+@pytest.mark.parametrize("later_eligibility_age", [False, True])
+def test_dates_match_change_points(later_eligibility_age):
+    """The solver finds the first eligible day that a day-by-day evaluation would find, across parameter changes too."""
+    tax_benefit_system = CountryTaxBenefitSystem()
+    if later_eligibility_age:
+        tax_benefit_system.parameters.benefits.old_age_security.eligibility_age.update(start = periods.instant("2025-04-01"), value = 67)
+    dates = projection.eligibility_dates(tax_benefit_system, COLUMNS, START)
+    points = timeline.change_points(tax_benefit_system, COLUMNS, START, STOP)
+
+    for name in timeline.GOALS:
+        testing.assert_array_equal(dates[name], first_eligible_days(points, name, 5), err_msg = name)
+
+
+def test_persons_never_eligible_get_no_date():
+    """A person who will not meet a requirement whatever their age gets no date."""
+    dates = projection.eligibility_dates(CountryTaxBenefitSystem(), COLUMNS, START)
+
+    assert numpy.isnat(dates["oas_eligible"][3])
+    assert numpy.isnat(dates["allowance_eligible"][0])
+
+
+def test_ages_are_known_where_birth_dates_are():
+    """Ages computed from unknown birth dates stay unknown."""
+    columns = {"birth": ["1957-01-10", "1957-01-10"], "birth_known": [True, False]}
+    dates = projection.eligibility_dates(CountryTaxBenefitSystem(), columns, START, ["age_known"])
+
+    testing.assert_array_equal(dates["age_known"], numpy.array([START, "NaT"], dtype = "datetime64[D]"))
+
+
+def test_an_age_or_a_birth_column_is_required():
+    """Without age, eligibility dates cannot be projected."""
+    with pytest.raises(ValueError):
+        projection.eligibility_dates(CountryTaxBenefitSystem(), {"income": [0]}, START)
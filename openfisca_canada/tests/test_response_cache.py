@@ -0,0 +1,99 @@
+"""Tests for the cache of web API responses."""
+
+import io
+import json
+
+from openfisca_canada.response_cache import METRICS_PATH, ResponseCacheMiddleware
+
+
+class FakeWebAPI:
+    """A WSGI application answering with the number of simulations it has run."""
+
+    def __init__(self, status = "200 OK"):
+        self.status = status
+        self.calls = 0
+
+    def __call__(self, environ, start_response):
+        """Answer a request."""
+        self.calls += 1
+        start_response(self.status, [("Content-Type", "application/json")])
+        return [json.dumps({"calls": self.calls}).encode("utf-8")]
+
+
+def request(application, body, path = "/calculate"):
+    """Send `body` to `application`, and return the status, headers and decoded JSON response."""
+    data = body.encode("utf-8")
+    environ = {"REQUEST_METHOD": "POST", "PATH_INFO": path, "CONTENT_LENGTH": str(len(data)), "wsgi.input": io.BytesIO(data)}
+    response = {}
+
+    def start_response(status, headers):
+        response["status"], response["headers"] = status, dict(headers)
+
+    content = b"".join(application(environ, start_response))
+    return response["status"], response["headers"], json.loads(content)
+
+
+def test_equal_situations_are_answered_from_the_cache():
+    """Keys order and spacing do not matter, but the route does."""
+    web_api = FakeWebAPI()
+    application = ResponseCacheMiddleware(web_api, rules = "rules", paths = ["/calculate", "/trace"])
+
+    person = {"age": {"2021-12-01": 65}, "oas_eligible": {"2021-12-01": None}}
+
+    assert request(application, json.dumps({"persons": {"a": person}}))[1]["X-Cache"] == "MISS"
+    status, headers, content = request(application, json.dumps({"persons": {"a": dict(reversed(person.items()))}}, indent = 2))
+    assert (headers["X-Cache"], content) == ("HIT", {"calls": 1})
+    assert request(application, json.dumps({"persons": {"a": person}}), "/trace")[1]["X-Cache"] == "MISS"
+    assert web_api.calls == 2
+
+    metrics = request(application, "{}", METRICS_PATH)[2]
+    assert (metrics["hits"], metrics["misses"], metrics["entries"]) == (1, 2, 2)
+
+
+def test_entries_expire():
+    """Once its time to live has elapsed, a response is computed again."""
+    now = [0.0]
+    web_api = FakeWebAPI()
+    application = ResponseCacheMiddleware(web_api, ttl = 10, rules = "rules", clock = lambda: now[0])
+
+    request(application, "{}")
+    now[0] = 11.0
+    assert request(application, "{}")[2] == {"calls": 2}
+
+
+def test_errors_are_not_cached():
+    """Only successful responses are stored."""
+    web_api = FakeWebAPI("400 BAD REQUEST")
+    application = ResponseCacheMiddleware(web_api, rules = "rules")
+
+    request(application, "{}")
+    assert request(application, "{}")[0] == "400 BAD REQUEST"
+    assert web_api.calls == 2
+
+
+def test_only_calculations_are_cached_by_default():
+    """Traces are passed through unless their route is listed."""
+    web_api = FakeWebAPI()
+    application = ResponseCacheMiddleware(web_api, rules = "rules")
+
+    request(application, "{}", "/trace")
+    status, headers, content = request(application, "{}", "/trace")
+    assert "X-Cache" not in headers and content == {"calls": 2}
+
+
+def test_requests_without_length_are_passed_through():
+    """A chunked body, without `Content-Length`, reaches the web API untouched and is not cached."""
+    received = []
+
+    def web_api(environ, start_response):
+        received.append(environ["wsgi.input"].read())
+        start_response("200 OK", [])
+        return [b"{}"]
+
+    application = ResponseCacheMiddleware(web_api, rules = "rules")
+    for _ in range(2):
+        environ = {"REQUEST_METHOD": "POST", "PATH_INFO": "/calculate", "HTTP_TRANSFER_ENCODING": "chunked", "wsgi.input": io.BytesIO(b'{"persons": {}}')}
+        application(environ, lambda status, headers: None)
+
+    assert received == [b'{"persons": {}}', b'{"persons": {}}']
+    assert application.metrics()["entries"] == 0
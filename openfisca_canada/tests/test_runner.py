@@ -0,0 +1,104 @@
+"""Tests for the chunked file runner."""
+
+import pytest
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, mapped, runner
+
+
+pandas = pytest.importorskip("pandas")
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+
+PERSONS = {
+    "client_id": ["a", "b", "c", "d", "e"],
+    "age": [65, 62, 70, 61, 80],
+    "income": [10000, 20000, 200000, 15000, 5000],
+    "place_of_residence": ["CA", "GR", "CA", "NA", "CA"],
+    "legal_status": ["CANADIAN_CITIZEN", "PERMANENT_RESIDENT", "OTHER", "CANADIAN_CITIZEN", "STATUS_INDIAN"],
+    "years_in_canada_since_18": [20, 12, 40, 30, 5],
+    "marital_status": ["SINGLE", "WIDOWED", "MARRIED", "MARRIED", "SINGLE"],
+    "partner_receiving_oas": [False, False, True, True, False],
+    }
+
+
+def test_chunked_run_matches_a_single_batch(tmp_path):
+    """Results do not depend on the chunk size, and identifiers are kept."""
+    persons = pandas.DataFrame(PERSONS)
+    persons.to_csv(tmp_path / "persons.csv", index = False)
+
+    stats = runner.run(tax_benefit_system, str(tmp_path / "persons.csv"), str(tmp_path / "results.csv"), "2021-12-01", chunk_size = 2, keep = ["client_id"])
+    results = pandas.read_csv(tmp_path / "results.csv", keep_default_na = False)
+    expected = batch.calculate(tax_benefit_system, persons.drop(columns = "client_id"), "2021-12-01")
+
+    assert stats["rows"] == 5
+    assert results["client_id"].tolist() == persons["client_id"].tolist()
+    for name in batch.OUTPUT_VARIABLES:
+        assert results[name].tolist() == pytest.approx(expected[name].tolist()), name
+
+
+def test_parallel_run_matches_a_serial_run(tmp_path):
+    """Chunks simulated by several workers are written in the input order."""
+    pandas.DataFrame(PERSONS).to_csv(tmp_path / "persons.csv", index = False)
+
+    runner.run(tax_benefit_system, str(tmp_path / "persons.csv"), str(tmp_path / "serial.csv"), "2021-12-01", chunk_size = 2, keep = ["client_id"])
+    stats = runner.run_parallel(str(tmp_path / "persons.csv"), str(tmp_path / "parallel.csv"), "2021-12-01", workers = 2, chunk_size = 2, keep = ["client_id"])
+
+    assert stats["rows"] == 5
+    assert (tmp_path / "parallel.csv").read_text() == (tmp_path / "serial.csv").read_text()
+
+
+def test_arrow_files_are_read_and_written(tmp_path):
+    """Arrow IPC files can be screened like CSV files, with dictionary-encoded enumerations."""
+    pyarrow = pytest.importorskip("pyarrow")
+    persons = pandas.DataFrame(PERSONS)
+    arrow_table = pyarrow.Table.from_pandas(persons, preserve_index = False)
+    arrow_table = arrow_table.set_column(arrow_table.column_names.index("legal_status"), "legal_status", arrow_table.column("legal_status").dictionary_encode())
+    with pyarrow.ipc.new_file(str(tmp_path / "persons.arrow"), arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+
+    runner.run(tax_benefit_system, str(tmp_path / "persons.arrow"), str(tmp_path / "results.arrow"), "2021-12-01", chunk_size = 2, keep = ["client_id"])
+    runner.run_parallel(str(tmp_path / "persons.arrow"), str(tmp_path / "parallel.arrow"), "2021-12-01", workers = 2, chunk_size = 2, keep = ["client_id"])
+    expected = batch.calculate(tax_benefit_system, persons.drop(columns = "client_id"), "2021-12-01")
+
+    for output in ("results.arrow", "parallel.arrow"):
+        results = pyarrow.ipc.open_file(str(tmp_path / output)).read_pandas()
+        assert results["client_id"].tolist() == PERSONS["client_id"]
+        for name in batch.OUTPUT_VARIABLES:
+            assert results[name].tolist() == pytest.approx(expected[name].tolist()), name
+
+
+def test_mapped_directories_are_screened_by_every_worker(tmp_path):
+    """A directory of `.npy` files gives the same results as a CSV file, serially or in parallel."""
+    persons = {name: column for name, column in PERSONS.items() if name != "client_id"}
+    pandas.DataFrame(persons).to_csv(tmp_path / "persons.csv", index = False)
+    mapped.save(tax_benefit_system, persons, str(tmp_path / "persons"))
+
+    runner.run(tax_benefit_system, str(tmp_path / "persons.csv"), str(tmp_path / "expected.csv"), "2021-12-01", chunk_size = 2)
+    stats = runner.run(tax_benefit_system, str(tmp_path / "persons"), str(tmp_path / "serial.csv"), "2021-12-01", chunk_size = 2)
+    runner.run_parallel(str(tmp_path / "persons"), str(tmp_path / "parallel.csv"), "2021-12-01", workers = 2, chunk_size = 2)
+
+    assert stats["rows"] == 5
+    assert (tmp_path / "serial.csv").read_text() == (tmp_path / "expected.csv").read_text()
+    assert (tmp_path / "parallel.csv").read_text() == (tmp_path / "expected.csv").read_text()
+
+
+def test_blank_numbers_are_unknown(tmp_path):
+    """A blank income in a CSV file, or a null one in a Parquet file, is screened as an unknown income."""
+    (tmp_path / "persons.csv").write_text("client_id,age,income,income_known,place_of_residence\na,70,10000,true,NA\nb,70,,false,CA\nc,70,,,CA\n")
+    expected = batch.calculate(tax_benefit_system, {"age": [70, 70, 70], "income": [10000, 0, 0], "income_known": [True, False, False], "place_of_residence": ["NA", "CA", "CA"]}, "2021-12-01")
+
+    runner.run(tax_benefit_system, str(tmp_path / "persons.csv"), str(tmp_path / "results.csv"), "2021-12-01", keep = ["client_id"])
+    results = pandas.read_csv(tmp_path / "results.csv")
+
+    assert results["client_id"].tolist() == ["a", "b", "c"]
+    for name in batch.OUTPUT_VARIABLES:
+        assert results[name].tolist() == pytest.approx(expected[name].tolist()), name
+
+    pytest.importorskip("pyarrow")
+    pandas.DataFrame({"age": [70, 70, 70], "income": [10000, None, None], "place_of_residence": ["NA", "CA", "CA"]}).to_parquet(tmp_path / "persons.parquet")
+    runner.run(tax_benefit_system, str(tmp_path / "persons.parquet"), str(tmp_path / "results.parquet"), "2021-12-01")
+    results = pandas.read_parquet(tmp_path / "results.parquet")
+
+    for name in batch.OUTPUT_VARIABLES:
+        assert results[name].tolist() == pytest.approx(expected[name].tolist()), name
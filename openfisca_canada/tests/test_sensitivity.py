@@ -0,0 +1,34 @@
+"""Tests for the sensitivity of eligibility to the income thresholds."""
+
+import numpy
+import pytest
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, population, sensitivity
+from openfisca_canada.reforms.parametric import parameter, parametric_reform
+
+
+PERIOD = "2021-12-01"
+TAX_BENEFIT_SYSTEM = CountryTaxBenefitSystem()
+COLUMNS = population.generate(3000, missing = 0.1, seed = 1)
+SENSITIVITY = sensitivity.Sensitivity(TAX_BENEFIT_SYSTEM, COLUMNS, PERIOD)
+
+
+@pytest.mark.parametrize("path", sensitivity.THRESHOLDS)
+@pytest.mark.parametrize("delta", [-5000, -1, 0, 2500])
+def test_flips_match_reformed_simulations(path, delta):
+    """The persons whose results flip are the ones whose results differ in a simulation with the moved threshold."""
+    value = parameter(TAX_BENEFIT_SYSTEM.get_parameters_at_instant(PERIOD), path) + delta
+    reformed = batch.calculate(parametric_reform(TAX_BENEFIT_SYSTEM, {path: value}, PERIOD), COLUMNS, PERIOD, SENSITIVITY.goals)
+    flips = SENSITIVITY.flips(path, delta)
+
+    for goal in SENSITIVITY.goals:
+        numpy.testing.assert_array_equal(flips[goal], reformed[goal] != SENSITIVITY.results[goal], err_msg = goal)
+
+
+def test_margins_only_cover_the_persons_a_threshold_applies_to():
+    """Each person is compared to one of the GIS maximum incomes."""
+    prefix = "benefits.old_age_security.guaranteed_income_supplement."
+    applies = [~numpy.isnan(SENSITIVITY.margins[prefix + name]) for name in ("maximum_income_single", "maximum_income_partnered", "maximum_income_two_recipients")]
+
+    numpy.testing.assert_array_equal(numpy.sum(applies, axis = 0), 1)
+    assert numpy.isnan(SENSITIVITY.margins["benefits.old_age_security.max_income"]).sum() == 0
@@ -0,0 +1,65 @@
+"""Tests for questionnaire sessions."""
+
+from numpy import testing
+
+from openfisca_canada import batch, CountryTaxBenefitSystem
+from openfisca_canada.explanation import relevant_inputs
+from openfisca_canada.session import Session
+
+
+PERIOD = "2021-12-01"
+
+ANSWERS = [
+    ("age", 66),
+    ("legal_status", "CANADIAN_CITIZEN"),
+    ("income", 15000),
+    ("place_of_residence", "CA"),
+    ("years_in_canada_since_18", 30),
+    ("marital_status", "MARRIED"),
+    ("partner_receiving_oas", True),
+    ("marital_status", "WIDOWED"),
+    ]
+
+tax_benefit_system = CountryTaxBenefitSystem()
+
+
+def test_results_match_a_new_simulation_after_each_answer():
+    """Discarding the rules downstream of each answer is enough to get up to date results."""
+    session = Session(tax_benefit_system, PERIOD)
+    answers = {}
+    for name, value in ANSWERS:
+        session.answer(name, value)
+        answers[name] = [value]
+        expected = batch.calculate(tax_benefit_system, answers, PERIOD)
+        for variable, values in session.results().items():
+            testing.assert_array_equal(values, expected[variable], err_msg = f"{variable} after answering {name}")
+
+
+def test_rules_not_depending_on_the_answer_are_kept():
+    """Answering about a partner leaves the age rules untouched."""
+    session = Session(tax_benefit_system, PERIOD)
+    session.answer("age", 66)
+    session.results()
+
+    stale = session.answer("partner_receiving_oas", True)
+
+    assert "gis_eligible_income_max" in stale
+    assert "oas_eligible" not in stale
+    assert session.simulation.person.get_holder("oas_eligible").get_array(PERIOD) is not None
+    assert session.simulation.person.get_holder("gis_eligible").get_array(PERIOD) is None
+
+
+def test_ages_are_asked_as_birth_dates():
+    """The age rules ask for a birth date, and answering either a birth date or an age settles them."""
+    goal = "oas_eligible_age_requirement_satisfied"
+    session = Session(tax_benefit_system, PERIOD)
+    assert list(relevant_inputs(session.simulation, goal, PERIOD)) == ["birth"]
+    assert relevant_inputs(session.simulation, goal, PERIOD)["birth"].all()
+
+    session.answer("birth", "1950-01-01")
+    assert not relevant_inputs(session.simulation, goal, PERIOD)["birth"].any()
+    testing.assert_array_equal(session.results([goal, "age"])["age"], [71])
+
+    session.answer("age", 40)
+    assert not relevant_inputs(session.simulation, goal, PERIOD)["birth"].any()
+    testing.assert_array_equal(session.results([goal])[goal], [False])
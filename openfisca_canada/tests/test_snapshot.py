@@ -0,0 +1,43 @@
+"""Tests for the on-disk parameter snapshot."""
+
+from openfisca_canada import CountryTaxBenefitSystem, snapshot
+
+
+def test_snapshot_is_reused_until_sources_change(tmp_path):
+    """A snapshot is loaded while its sources are unchanged, and rebuilt afterwards."""
+    sources = tmp_path / "sources"
+    sources.mkdir()
+    (sources / "value.yaml").write_text("1")
+    builds = []
+
+    def build():
+        builds.append(None)
+        return len(builds)
+
+    assert snapshot.cached("test", [str(sources)], build, str(tmp_path / "snapshots")) == 1
+    assert snapshot.cached("test", [str(sources)], build, str(tmp_path / "snapshots")) == 1
+
+    (sources / "value.yaml").write_text("2")
+    assert snapshot.cached("test", [str(sources)], build, str(tmp_path / "snapshots")) == 2
+    assert len(list((tmp_path / "snapshots").iterdir())) == 1
+
+
+def test_system_built_from_snapshot_has_the_same_parameters(tmp_path, monkeypatch):
+    """The parameters loaded from a snapshot are the ones parsed from the YAML files."""
+    monkeypatch.setenv(snapshot.SNAPSHOT_DIR_VARIABLE, str(tmp_path))
+    CountryTaxBenefitSystem()
+    from_snapshot = CountryTaxBenefitSystem()
+    monkeypatch.delenv(snapshot.SNAPSHOT_DIR_VARIABLE)
+    from_yaml = CountryTaxBenefitSystem()
+
+    for instant in ["1990-01-01", "2021-12-01"]:
+        assert str(from_snapshot.parameters(instant)) == str(from_yaml.parameters(instant))
+
+
+def test_unwritable_snapshot_directory_is_ignored(tmp_path, caplog):
+    """A snapshot directory that cannot be created or written to does not prevent building."""
+    (tmp_path / "file").write_text("")
+    snapshot_dir = str(tmp_path / "file" / "snapshots")
+
+    assert snapshot.cached("test", [str(tmp_path)], lambda: 1, snapshot_dir) == 1
+    assert "Unable to write snapshot" in caplog.text
@@ -0,0 +1,45 @@
+"""Tests for the sweep engine of parameter reforms."""
+
+import numpy
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, population, sweep
+from openfisca_canada.dependencies import dependency_graph
+from openfisca_canada.reforms.parametric import parametric_reform
+
+
+PERIOD = "2022-01-01"
+TAX_BENEFIT_SYSTEM = CountryTaxBenefitSystem()
+
+SCENARIOS = {
+    "max_income": {"benefits.old_age_security.max_income": 50000},
+    "income_cap": {"benefits.old_age_security.allowance.income_cap": 20000},
+    "eligibility_age": {"benefits.old_age_security.eligibility_age": 67},
+    "both": {"benefits.old_age_security.eligibility_age": 60, "benefits.old_age_security.guaranteed_income_supplement.maximum_income_single": 10000},
+    }
+
+
+def test_scenarios_match_independent_simulations():
+    """Sharing the baseline values gives the results of a simulation per reform."""
+    columns = population.generate(2000, missing = 0.2, seed = 0)
+    results = sweep.sweep(TAX_BENEFIT_SYSTEM, columns, PERIOD, SCENARIOS)
+
+    for scenario, values in SCENARIOS.items():
+        expected = batch.calculate(parametric_reform(TAX_BENEFIT_SYSTEM, values, PERIOD), columns, PERIOD)
+        for name in batch.OUTPUT_VARIABLES:
+            numpy.testing.assert_array_equal(results[scenario][name], expected[name], err_msg = f"{scenario}: {name}")
+    assert not numpy.array_equal(results["eligibility_age"]["oas_eligible"], results[sweep.BASELINE]["oas_eligible"])
+
+
+def test_rules_not_reading_the_reformed_parameters_are_shared():
+    """Only the rules downstream of the reformed parameters are calculated again."""
+    graph = dependency_graph(TAX_BENEFIT_SYSTEM)
+    affected = sweep.affected_variables(graph, ["benefits.old_age_security.max_income"])
+    baseline = batch.build_simulation(TAX_BENEFIT_SYSTEM, {"age": [70], "income": [60000]}, PERIOD)
+    baseline.calculate("oas_eligible", PERIOD)
+    simulation = sweep.scenario_simulation(baseline, parametric_reform(TAX_BENEFIT_SYSTEM, SCENARIOS["max_income"], PERIOD), affected)
+
+    assert {"oas_eligible__income_not_above_limit", "oas_eligible_known", "oas_entitlement"} <= affected
+    assert "oas_eligible_age_requirement_satisfied" not in affected
+    assert simulation.persons.get_holder("oas_eligible_age_requirement_satisfied").get_array(PERIOD) is baseline.persons.get_holder("oas_eligible_age_requirement_satisfied").get_array(PERIOD)
+    assert simulation.persons.get_holder("oas_eligible").get_array(PERIOD) is None
+    assert not simulation.calculate("oas_eligible", PERIOD)[0]
@@ -0,0 +1,56 @@
+"""Tests for the evaluation of eligibility over a span of days."""
+
+import numpy
+from numpy import testing
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, dates, timeline
+
+
+TAX_BENEFIT_SYSTEM = CountryTaxBenefitSystem()
+
+COLUMNS = {
+    "birth": ["1957-01-10", "1961-12-15", "1956-02-29", "1990-06-01"],
+    "income": [10000, 20000, 200000, 10000],
+    "marital_status": ["SINGLE", "MARRIED", "WIDOWED", "SINGLE"],
+    "partner_receiving_oas": [False, True, False, False],
+    "legal_status": ["CANADIAN_CITIZEN", "PERMANENT_RESIDENT", "CANADIAN_CITIZEN", "CANADIAN_CITIZEN"],
+    "place_of_residence": ["CA", "CA", "CA", "CA"],
+    "years_in_canada_since_18": [40, 30, 40, 10],
+    }
+
+
+def test_change_points_match_day_by_day_evaluation():
+    """The change points are the days on which a simulation per day would give a different result."""
+    start, stop = numpy.datetime64("2021-11-20"), numpy.datetime64("2022-01-20")
+    points = timeline.change_points(TAX_BENEFIT_SYSTEM, COLUMNS, start, stop)
+
+    birth = numpy.array(COLUMNS["birth"], dtype = "datetime64[D]")
+    inputs = {name: column for name, column in COLUMNS.items() if name != "birth"}
+    previous = None
+    expected = []
+    for day in numpy.arange(start, stop + 1):
+        results = batch.calculate(TAX_BENEFIT_SYSTEM, {**inputs, "age": dates.age_on(birth, numpy.full(4, day))}, str(day), timeline.GOALS)
+        for person in range(4):
+            values = tuple(results[name][person] for name in timeline.GOALS)
+            if previous is None or previous[person] != values:
+                expected.append((person, day, values))
+        previous = [tuple(results[name][person] for name in timeline.GOALS) for person in range(4)]
+
+    expected.sort(key = lambda point: (point[0], point[1]))
+    testing.assert_array_equal(points["person"], [point[0] for point in expected])
+    testing.assert_array_equal(points["date"], [point[1] for point in expected])
+    for index, name in enumerate(timeline.GOALS):
+        testing.assert_array_equal(points[name], [point[2][index] for point in expected], err_msg = name)
+    # Persons turning 65 and 60 within the span get a change point on their birthday.
+    assert numpy.datetime64("2022-01-10") in points["date"][points["person"] == 0]
+    assert numpy.datetime64("2021-12-15") in points["date"][points["person"] == 1]
+
+
+def test_ages_are_known_where_birth_dates_are():
+    """Ages computed from unknown birth dates stay unknown, as the `age` formula would make them."""
+    columns = {"birth": ["1957-01-10", "1957-01-10"], "birth_known": [True, False]}
+    points = timeline.change_points(TAX_BENEFIT_SYSTEM, columns, "2021-12-01", "2021-12-31", ["age_known", "oas_eligible_known"])
+
+    expected = batch.calculate(TAX_BENEFIT_SYSTEM, columns, "2021-12-01", ["age_known", "oas_eligible_known"])
+    testing.assert_array_equal(points["age_known"], [True, False])
+    testing.assert_array_equal(points["oas_eligible_known"], expected["oas_eligible_known"])
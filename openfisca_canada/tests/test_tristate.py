@@ -0,0 +1,55 @@
+"""Tests for the three-valued logic shared by the eligibility rules."""
+
+from numpy import array, testing
+from openfisca_core import periods
+
+from openfisca_canada import batch, CountryTaxBenefitSystem, tristate
+
+
+# Each position is one of the nine combinations of two true/false/unknown operands.
+LEFT = tristate.TriState(
+    array([True, True, True, False, False, False, True, False, True]),
+    array([True, True, True, True, True, True, False, False, False]),
+    )
+RIGHT = tristate.TriState(
+    array([True, False, True, True, False, False, True, True, False]),
+    array([True, True, False, True, True, False, True, True, False]),
+    )
+
+
+def test_all_of_is_known_when_any_element_is_known_false():
+    """A conjunction is known if all of its elements are known, or if any is known false."""
+    result = tristate.all_of(LEFT, RIGHT)
+    testing.assert_array_equal(result.value, LEFT.value * RIGHT.value)
+    testing.assert_array_equal(result.known, [True, True, False, True, True, True, False, False, False])
+
+
+def test_any_of_is_known_when_any_element_is_known_true():
+    """A disjunction is known if all of its elements are known, or if any is known true."""
+    result = tristate.any_of(LEFT, RIGHT)
+    testing.assert_array_equal(result.value, LEFT.value + RIGHT.value)
+    testing.assert_array_equal(result.known, [True, True, True, True, True, False, True, True, False])
+
+
+def test_operators_match_functions():
+    """Operators are shorthands for `all_of` and `any_of`, and negation keeps what is known."""
+    testing.assert_array_equal((LEFT & RIGHT).known, tristate.all_of(LEFT, RIGHT).known)
+    testing.assert_array_equal((LEFT | RIGHT).known, tristate.any_of(LEFT, RIGHT).known)
+    testing.assert_array_equal((~LEFT).known, LEFT.known)
+
+
+def test_calculated_knownness_is_read_from_its_holder_unless_traced():
+    """Once a fused rule is calculated, `get` reads its knownness from its holder, except when requests are traced."""
+    simulation = batch.build_simulation(CountryTaxBenefitSystem(), {"age": [65, 40]}, "2021-12-01")
+    simulation.calculate("oas_eligible__age_above_eligibility", "2021-12-01")
+    requested = []
+    calculate = simulation.calculate
+    simulation.calculate = lambda name, period: requested.append(name) or calculate(name, period)
+
+    state = tristate.get(simulation.persons, "oas_eligible__age_above_eligibility", periods.period("2021-12-01"))
+    testing.assert_array_equal(state.known, [True, True])
+    assert requested == []
+
+    simulation.trace = True
+    tristate.get(simulation.persons, "oas_eligible__age_above_eligibility", periods.period("2021-12-01"))
+    assert requested == ["oas_eligible__age_above_eligibility", "oas_eligible__age_above_eligibility_known"]
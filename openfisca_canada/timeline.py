@@ -0,0 +1,111 @@
+"""
+This file provides the evaluation of eligibility over a span of days, e.g. to tell on which day a person becomes eligible.
+
+Every rule of this package is defined on a day, but its result only changes when one
+of its inputs or parameters does. The parameters change on the instants listed in
+their YAML files, yearly inputs such as `income` change on January 1st, and the age of
+a person changes on their birthday. The other inputs are considered constant over the
+span.
+
+The span is thus split into segments over which the parameters and yearly inputs are
+constant. Each segment is simulated once, with a row per person for its first day
+and an extra row for each person having their birthday within the segment, instead of
+one simulation per day. Ages are computed from the `birth` column when there is one,
+and known where `birth_known` is; otherwise the `age` column is used for the whole span.
+
+Example:
+    >>> from openfisca_canada import CountryTaxBenefitSystem
+    >>> points = change_points(
+    ...     CountryTaxBenefitSystem(),
+    ...     {"birth": ["1957-01-10"], "income": [10000]},
+    ...     "2021-12-01",
+    ...     "2022-12-31",
+    ...     ["oas_eligible__age_above_eligibility"],
+    ...     )
+    >>> points["date"], points["oas_eligible__age_above_eligibility"]
+    (array(['2021-12-01', '2022-01-10'], dtype='datetime64[D]'), array([False,  True]))
+"""
+
+import numpy
+
+from openfisca_canada import batch, dates
+
+
+GOALS = tuple(f"{benefit}_eligible" for benefit in batch.BENEFITS)
+
+
+def parameter_instants(tax_benefit_system, start, stop):
+    """Return the days, after `start` and up to `stop`, on which a parameter of `tax_benefit_system` changes."""
+    days = {
+        numpy.datetime64(value.instant_str, "D")
+        for parameter in tax_benefit_system.parameters.get_descendants()
+        for value in getattr(parameter, "values_list", ())
+        }
+    return sorted(day for day in days if start < day <= stop)
+
+
+def segments(tax_benefit_system, start, stop):
+    """
+    Split the days from `start` to `stop` included into segments over which parameters and yearly inputs are constant.
+
+    Return the first day of each segment, and the day following its last day.
+    """
+    new_years = numpy.arange(start.astype("datetime64[Y]") + 1, stop.astype("datetime64[Y]") + 1).astype("datetime64[D]")
+    firsts = numpy.array(sorted({start, *new_years, *parameter_instants(tax_benefit_system, start, stop)}), dtype = "datetime64[D]")
+    return firsts, numpy.append(firsts[1:], stop + 1)
+
+
+def change_points(tax_benefit_system, columns, start, stop, variables = GOALS, mark_known = True):
+    """
+    Evaluate `variables` on every day from `start` to `stop` included, for every row of `columns`.
+
+    `columns` holds the inputs, as for `batch.calculate`. Return columns with a row for
+    the first day of each person, and a row for each day on which one of `variables`
+    changes for that person: `person` (the index of the person in `columns`), `date`,
+    and one column per variable with its value from that day on.
+    """
+    start = numpy.datetime64(start, "D")
+    stop = numpy.datetime64(stop, "D")
+    arrays = {name: numpy.asarray(column) for name, column in columns.items()}
+    birth = arrays.pop("birth", None)
+    if birth is not None:
+        birth = birth.astype("datetime64[D]")
+    count = len(birth) if birth is not None else len(next(iter(arrays.values()), ()))
+
+    persons, days, results = [], [], {name: [] for name in variables}
+    for first, end in zip(*segments(tax_benefit_system, start, stop)):
+        rows = numpy.arange(count)
+        row_days = numpy.full(count, first)
+        if birth is not None:
+            birthday = dates.birthdays(birth, first.astype("datetime64[Y]"))
+            turning = numpy.flatnonzero((first < birthday) & (birthday < end))
+            rows = numpy.concatenate([rows, turning])
+            row_days = numpy.concatenate([row_days, birthday[turning]])
+        segment = {name: array[rows] for name, array in arrays.items()}
+        if birth is not None:
+            segment["age"] = dates.age_on(birth[rows], row_days)
+            # Ages are as known as the birth dates they are computed from.
+            if "birth_known" in segment:
+                segment["age_known"] = segment["birth_known"]
+        # Parameters and inputs other than age are the same on every day of the segment.
+        values = batch.calculate(tax_benefit_system, segment, str(first), variables, mark_known)
+        persons.append(rows)
+        days.append(row_days)
+        for name in variables:
+            results[name].append(values[name])
+
+    person = numpy.concatenate(persons)
+    day = numpy.concatenate(days)
+    order = numpy.lexsort((day, person))
+    person, day = person[order], day[order]
+    results = {name: numpy.concatenate(arrays)[order] for name, arrays in results.items()}
+
+    changed = numpy.ones(len(person), dtype = bool)
+    changed[1:] = person[1:] != person[:-1]
+    for values in results.values():
+        changed[1:] |= values[1:] != values[:-1]
+    return {
+        "person": person[changed],
+        "date": day[changed],
+        **{name: values[changed] for name, values in results.items()},
+        }
@@ -0,0 +1,150 @@
+"""
+This file defines the three-valued logic used by the eligibility rules.
+
+Every rule of this package comes as a pair of variables: `oas_eligible` holds the
+conclusion, and `oas_eligible_known` holds whether that conclusion is certain given
+the inputs provided. A `TriState` carries both vectors at once, so that a rule is
+declared a single time and its value and its knownness are computed together.
+
+A rule formula decorated with `fused` returns a `TriState`. The value is returned to
+OpenFisca as usual, and the knownness is put in the cache of the `_known` variable,
+so that requesting the `_known` variable afterwards does not run any other formula.
+"""
+
+import functools
+
+import numpy
+from openfisca_core.tracers import SimpleTracer
+
+
+KNOWN_SUFFIX = "_known"
+
+
+class TriState:
+    """
+    A vector of true, false or unknown values, one per entity.
+
+    `value` is the conclusion reached with the inputs available, and `known` tells
+    whether that conclusion would stand whatever the values of the missing inputs.
+    Boolean operators follow Kleene's logic: a conjunction is known if all of its
+    elements are known, or if any of them is known to be false; a disjunction is known
+    if all of its elements are known, or if any of them is known to be true.
+    """
+
+    __slots__ = ("value", "known")
+
+    def __init__(self, value, known):
+        self.value = value
+        self.known = known
+
+    def __and__(self, other):
+        """Conjunction of two tri-state vectors."""
+        return all_of(self, other)
+
+    def __or__(self, other):
+        """Disjunction of two tri-state vectors."""
+        return any_of(self, other)
+
+    def __invert__(self):
+        """Negation of a tri-state vector, which does not change what is known."""
+        return TriState(numpy.logical_not(self.value), self.known)
+
+    def __repr__(self):
+        """Show both vectors."""
+        return f"TriState(value={self.value!r}, known={self.known!r})"
+
+    def apply(self, function):
+        """Apply `function` to the value, which is as known as the original one."""
+        return TriState(function(self.value), self.known)
+
+
+def all_of(*states):
+    """Conjunction of any number of tri-state vectors, computed in one pass."""
+    value = states[0].value
+    all_known = states[0].known
+    any_false = states[0].known * numpy.logical_not(states[0].value)
+    for state in states[1:]:
+        value = value * state.value
+        all_known = all_known * state.known
+        any_false = any_false + state.known * numpy.logical_not(state.value)
+    return TriState(value, all_known + any_false)
+
+
+def any_of(*states):
+    """Disjunction of any number of tri-state vectors, computed in one pass."""
+    value = states[0].value
+    all_known = states[0].known
+    any_true = states[0].known * states[0].value
+    for state in states[1:]:
+        value = value + state.value
+        all_known = all_known * state.known
+        any_true = any_true + state.known * state.value
+    return TriState(value, all_known + any_true)
+
+
+def holders(population, variable_name):
+    """Return the holders of `variable_name` and of `variable_name_known`, looked up once per population."""
+    pairs = population.__dict__.setdefault("_tristate_holders", {})
+    pair = pairs.get(variable_name)
+    if pair is None:
+        pair = pairs[variable_name] = (population.get_holder(variable_name), population.get_holder(variable_name + KNOWN_SUFFIX))
+    return pair
+
+
+def get(population, variable_name, period):
+    """
+    Get `variable_name` and `variable_name_known` as a single tri-state vector.
+
+    When `variable_name` is a fused rule, its knownness is already cached once its
+    value has been calculated, so this does not run the rule twice. Values already
+    calculated are read from the pair of holders of the variables, found with a single
+    lookup. When the requests are traced, e.g. by `/trace` or the profiler, both
+    variables are requested through the simulation, so that they appear in the trace.
+    """
+    if type(population.simulation.tracer) is not SimpleTracer:
+        return TriState(population(variable_name, period), population(variable_name + KNOWN_SUFFIX, period))
+    value_holder, known_holder = holders(population, variable_name)
+    value = value_holder.get_array(period)
+    if value is None:
+        value = population(variable_name, period)
+    known = known_holder.get_array(period)
+    if known is None:
+        known = population(variable_name + KNOWN_SUFFIX, period)
+    return TriState(value, known)
+
+
+def fused(rule):
+    """
+    Turn a formula returning a `TriState` into the formula of the value variable.
+
+    The decorated formula must be defined in the class of the value variable, and a
+    variable with the same name suffixed with `_known` must exist; its formula is
+    `known`.
+    """
+    variable_name = rule.__qualname__.split(".")[0]
+
+    @functools.wraps(rule)
+    def formula(population, period, parameters):
+        state = rule(population, period, parameters)
+        holder = holders(population, variable_name)[1]
+        if holder.get_array(period) is None:
+            holder.put_in_cache(state.known, period)
+        return state.value
+
+    formula.rule = rule
+    return formula
+
+
+def known(population, variable_name, period, parameters):
+    """
+    Formula of the `_known` variable paired with the fused rule `variable_name`.
+
+    Calculating the value fills in the knownness. The rule is only run again if the
+    value was provided as an input, in which case its formula never ran.
+    """
+    population(variable_name, period)
+    array = holders(population, variable_name)[1].get_array(period)
+    if array is not None:
+        return array
+    variable = population.simulation.tax_benefit_system.get_variable(variable_name)
+    return variable.get_formula(period).rule(population, period, parameters).known
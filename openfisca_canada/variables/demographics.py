@@ -8,12 +8,11 @@ See https://openfisca.org/doc/key-concepts/variables.html
 
 from datetime import date
 
-# Import from numpy the operations you need to apply on OpenFisca's population vectors
 # Import from openfisca-core the Python objects used to code the legislation in OpenFisca
-from numpy import where
-from openfisca_core.periods import ETERNITY, MONTH, DAY
+from openfisca_core.periods import ETERNITY, DAY
 from openfisca_core.variables import Variable
 
+from openfisca_canada import dates, tristate
 # Import the Entities specifically defined for this tax and benefit system
 from openfisca_canada.entities import Person
 
@@ -28,23 +27,27 @@ class birth(Variable):
     reference = "https://en.wiktionary.org/wiki/birthdate"
 
 
+class birth_known(Variable):
+    value_type = bool
+    entity = Person
+    label = "Whether we know the Person's birth date"
+    definition_period = ETERNITY
+
+
 class age(Variable):
     value_type = int
     entity = Person
     definition_period = DAY
     label = "Person's age (in years)"
 
-    # def formula(person, period, _parameters):
-    #     """
-    #     Person's age (in years).
-
-    #     A person's age is computed according to its birth date.
-    #     """
-    #     birth = person("birth", period)
-    #     birth_year = birth.astype("datetime64[Y]").astype(int) + 1970
-    #     birth_month = birth.astype("datetime64[M]").astype(int) % 12 + 1
-    #     birth_day = (birth - birth.astype("datetime64[M]") + 1).astype(int)
-
-    #     is_birthday_past = (birth_month < period.start.month) + (birth_month == period.start.month) * (birth_day <= period.start.day)
-
-    #     return (period.start.year - birth_year) - where(is_birthday_past, 0, 1)  # If the birthday is not passed this year, subtract one year
+    @tristate.fused
+    def formula(person, period, _parameters):
+        """
+        Person's age (in years).
+
+        A person's age is computed according to its birth date. The birth dates are
+        split into years and days of the year once per simulation, see `openfisca_canada.dates`.
+        """
+        birth = tristate.get(person, "birth", period)
+        start = period.start
+        return birth.apply(lambda birth: dates.age_from_split(*dates.birth_split(person.simulation, birth), start.year, start.month * 100 + start.day))
@@ -3,8 +3,10 @@ from openfisca_core.periods import DAY, YEAR
 from openfisca_core.variables import Variable
 from openfisca_core.indexed_enums import Enum
 from datetime import date, datetime
-from numpy import bool, float, int, str, where, isin
+from numpy import bool, float, int, str, where
 
+from openfisca_canada import tristate
+from openfisca_canada.countries import country_options, is_in
 from openfisca_canada.entities import Person
 
 
@@ -14,8 +16,13 @@ class age_known(Variable):
   definition_period = DAY
   label = "Whether we know the Person's age"
 
+  def formula(person, period, parameters):
+    return tristate.known(person, "age", period, parameters)
+
 class place_of_residence(Variable):
-  value_type = str
+  value_type = Enum
+  possible_values = country_options
+  default_value = country_options.ZZ
   entity = Person
   definition_period = DAY
   label = "Person's place of residence, expressed as a 2 letter ISO-3166-1 code"
@@ -121,16 +128,33 @@ class eligible_under_social_agreement_known(Variable):
   definition_period = DAY
   label = "Whether we know if the Person is eligible under the social agreement between Canada and their place of residence"
 
+
+def has_qualifying_legal_status(legal_status):
+  # The four legal statuses that satisfy the status requirement of OAS, Allowance and Allowance for Survivor.
+  citizen = legal_status == legal_status_options.CANADIAN_CITIZEN
+  indian = legal_status == legal_status_options.STATUS_INDIAN
+  perm = legal_status == legal_status_options.PERMANENT_RESIDENT
+  temp = legal_status == legal_status_options.TEMPORARY_RESIDENT
+  return citizen + indian + perm + temp
+
+def is_partnered(marital_status):
+  married = marital_status == marital_status_options.MARRIED
+  common_law = marital_status == marital_status_options.COMMONLAW
+  return married + common_law
+
+
 class resides_in_agreement_country(Variable):
   value_type = bool
   entity = Person
   definition_period = DAY
   label = "Whether Person's place of residence has a social agreement with Canada"
 
+  @tristate.fused
   def formula(person, period, parameters):
     # The person's country of residence is valid if they were on the list of countries with which Canada had
     # agreements at the time. That will be created as a parameter, so it can vary by date.
-    return isin(person("place_of_residence", period), parameters(period).benefits.social_agreement_countries)
+    residence = tristate.get(person, "place_of_residence", period)
+    return residence.apply(lambda place: is_in(place, parameters(period).benefits.social_agreement_countries))
 
 class resides_in_agreement_country_known(Variable):
   value_type = bool
@@ -139,7 +163,7 @@ class resides_in_agreement_country_known(Variable):
   label = "Whether we know if the Person's place of residence has a social agreement with Canada"
 
   def formula(person, period, parameters):
-    return person("place_of_residence_known", period)
+    return tristate.known(person, "resides_in_agreement_country", period, parameters)
 
 class resided_in_agreement_country(Variable):
   value_type = bool
@@ -159,9 +183,15 @@ class oas_eligible(Variable):
   definition_period = DAY
   label = "Whether Person is eligible for OAS"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person('oas_eligible_income_requirement_satisfied', period) * person('oas_eligible_age_requirement_satisfied', period) * person('oas_eligible_legal_status_satisfied', period) * person('oas_eligible_required_residency_duration_satisfied', period) \
-            * person('oas_eligible_residency_requirement_satisfied', period)
+    return tristate.all_of(
+      tristate.get(person, 'oas_eligible_income_requirement_satisfied', period),
+      tristate.get(person, 'oas_eligible_age_requirement_satisfied', period),
+      tristate.get(person, 'oas_eligible_legal_status_satisfied', period),
+      tristate.get(person, 'oas_eligible_required_residency_duration_satisfied', period),
+      tristate.get(person, 'oas_eligible_residency_requirement_satisfied', period),
+      )
 
 class oas_eligible_known(Variable):
   value_type = bool
@@ -170,17 +200,7 @@ class oas_eligible_known(Variable):
   label = "Whether the Person's eligibility for OAS is known"
 
   def formula(person, period, parameters):
-    # The answer to a conjunction is known if a) all of the conclusions are known,
-    # or b) if any of the conclusions is known to be false.
-    all_true = person('oas_eligible_income_requirement_satisfied_known', period) * person('oas_eligible_age_requirement_satisfied_known', period) * person('oas_eligible_legal_status_satisfied_known', period) * person('oas_eligible_required_residency_duration_satisfied_known', period) \
-            * person('oas_eligible_residency_requirement_satisfied_known', period)
-    income_false = person('oas_eligible_income_requirement_satisfied_known', period) * not_(person('oas_eligible_income_requirement_satisfied', period))
-    age_false = person('oas_eligible_age_requirement_satisfied_known', period) * not_(person('oas_eligible_age_requirement_satisfied', period))
-    legal_status_false = person('oas_eligible_legal_status_satisfied_known', period) * not_(person('oas_eligible_legal_status_satisfied_known', period))
-    residency_duration_false = person('oas_eligible_required_residency_duration_satisfied_known', period) * not_(person('oas_eligible_required_residency_duration_satisfied', period))
-    residency_false = person('oas_eligible_residency_requirement_satisfied_known', period) * not_(person('oas_eligible_residency_requirement_satisfied', period))
-    any_false = income_false + age_false + legal_status_false + residency_duration_false + residency_false
-    return all_true + any_false
+    return tristate.known(person, "oas_eligible", period, parameters)
 
 class oas_eligible_required_residency_duration_amount(Variable):
   value_type = int
@@ -188,9 +208,10 @@ class oas_eligible_required_residency_duration_amount(Variable):
   definition_period = DAY
   label = "How many years the person is required to have resided in Canada to qualify for OAS"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    required_years = where(person("place_of_residence", period) == "CA",10,20)
-    return required_years
+    residence = tristate.get(person, "place_of_residence", period)
+    return residence.apply(lambda place: where(place == country_options.CA,10,20))
 
 class oas_eligible_required_residency_duration_amount_known(Variable):
   value_type = bool
@@ -199,8 +220,7 @@ class oas_eligible_required_residency_duration_amount_known(Variable):
   label = "Whether we know how many years the person is required to have resided in Canada to qualify for OAS"
 
   def formula(person, period, parameters):
-    known = person("place_of_residence_known", period)
-    return known
+    return tristate.known(person, "oas_eligible_required_residency_duration_amount", period, parameters)
 
 class oas_eligible_required_residency_duration_satisfied(Variable):
   value_type = bool
@@ -208,8 +228,11 @@ class oas_eligible_required_residency_duration_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person has resided in Canada long enough to qualify for OAS"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("years_in_canada_since_18", period) >= person("oas_eligible_required_residency_duration_amount", period)
+    years = tristate.get(person, "years_in_canada_since_18", period)
+    required_years = tristate.get(person, "oas_eligible_required_residency_duration_amount", period)
+    return tristate.TriState(years.value >= required_years.value, years.known * required_years.known)
 
 class oas_eligible_required_residency_duration_satisfied_known(Variable):
   value_type = bool
@@ -218,7 +241,7 @@ class oas_eligible_required_residency_duration_satisfied_known(Variable):
   label = "Whether we know if the person has resided in Canada long enough to qualify for OAS"
 
   def formula(person, period, parameters):
-    return person("years_in_canada_since_18_known", period) * person("oas_eligible_required_residency_duration_amount_known", period)
+    return tristate.known(person, "oas_eligible_required_residency_duration_satisfied", period, parameters)
 
 class oas_eligible_legal_status_satisfied(Variable):
   value_type = bool
@@ -226,9 +249,9 @@ class oas_eligible_legal_status_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person has the required legal status in Canada for OAS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    satisfied = person("oas_eligible_legal_status__qualifies", period)
-    return satisfied
+    return tristate.get(person, "oas_eligible_legal_status__qualifies", period)
 
 class oas_eligible_legal_status_satisfied_known(Variable):
   value_type = bool
@@ -237,8 +260,7 @@ class oas_eligible_legal_status_satisfied_known(Variable):
   label = "Whether we know if the person has the required legal status in Canada for OAS eligibility"
 
   def formula(person, period, parameters):
-    known = person("oas_eligible_legal_status__qualifies_known", period)
-    return known
+    return tristate.known(person, "oas_eligible_legal_status_satisfied", period, parameters)
 
 class oas_eligible_legal_status__qualifies(Variable):
   value_type = bool
@@ -246,12 +268,9 @@ class oas_eligible_legal_status__qualifies(Variable):
   definition_period = DAY
   label = "Whether the person has one of the four qualifying legal status for OAS Eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    citizen = person("legal_status",period) == legal_status_options.CANADIAN_CITIZEN
-    indian = person("legal_status",period) == legal_status_options.STATUS_INDIAN
-    perm = person("legal_status",period) == legal_status_options.PERMANENT_RESIDENT
-    temp = person("legal_status",period) == legal_status_options.TEMPORARY_RESIDENT
-    return citizen + indian + perm + temp
+    return tristate.get(person, "legal_status", period).apply(has_qualifying_legal_status)
 
 class oas_eligible_legal_status__qualifies_known(Variable):
   value_type = bool
@@ -260,7 +279,7 @@ class oas_eligible_legal_status__qualifies_known(Variable):
   label = "Whether we know if the person has one of the four qualifying legal status for OAS Eligibility"
 
   def formula(person, period, parameters):
-    return person("legal_status_known",period)
+    return tristate.known(person, "oas_eligible_legal_status__qualifies", period, parameters)
 
 class oas_eligible_residency_requirement_satisfied(Variable):
   value_type = bool
@@ -268,9 +287,12 @@ class oas_eligible_residency_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the residency requirement for OAS is satisfied by the Person"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    satisfied = person('oas_eligible_canadian_residency_requirement_satisfied', period) + person('oas_eligible_foreign_residency_requirement_satisfied', period)
-    return satisfied
+    return tristate.any_of(
+      tristate.get(person, 'oas_eligible_canadian_residency_requirement_satisfied', period),
+      tristate.get(person, 'oas_eligible_foreign_residency_requirement_satisfied', period),
+      )
 
 class oas_eligible_residency_requirement_satisfied_known(Variable):
   value_type = bool
@@ -279,14 +301,7 @@ class oas_eligible_residency_requirement_satisfied_known(Variable):
   label = "Whether we know if the residency requirement for OAS is satisfied by the Person"
 
   def formula(person, period, parameters):
-    # A disjunction is known if all of the components are known, or if any of
-    # the components is known and true.
-    canadian_true = person('oas_eligible_canadian_residency_requirement_satisfied_known', period) * person('oas_eligible_canadian_residency_requirement_satisfied', period)
-    foreign_true = person('oas_eligible_foreign_residency_requirement_satisfied_known', period) * person('oas_eligible_foreign_residency_requirement_satisfied', period)
-    all_known = person('oas_eligible_canadian_residency_requirement_satisfied_known', period) * person('oas_eligible_foreign_residency_requirement_satisfied_known', period)
-    one_true = canadian_true + foreign_true
-    known = one_true + all_known
-    return known
+    return tristate.known(person, "oas_eligible_residency_requirement_satisfied", period, parameters)
 
 class oas_eligible_canadian_residency_requirement_satisfied(Variable):
   value_type = bool
@@ -294,8 +309,9 @@ class oas_eligible_canadian_residency_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the Person satisfies the canadian residency option of the residency requirement for Old Age Security"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("place_of_residence", period) == "CA"
+    return tristate.get(person, "place_of_residence", period).apply(lambda place: place == country_options.CA)
 
 class oas_eligible_canadian_residency_requirement_satisfied_known(Variable):
   value_type = bool
@@ -304,7 +320,7 @@ class oas_eligible_canadian_residency_requirement_satisfied_known(Variable):
   label = "Whether we know if the Person satisfies the canadian residency option of the residency requirement for Old Age Security"
 
   def formula(person, period, parameters):
-    return person("place_of_residence_known", period)
+    return tristate.known(person, "oas_eligible_canadian_residency_requirement_satisfied", period, parameters)
 
 class oas_eligible_foreign_residency_requirement_satisfied(Variable):
   value_type = bool
@@ -312,8 +328,12 @@ class oas_eligible_foreign_residency_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person satisfies the foreign residency option of the residency requirement for Old Age Security"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("resides_in_agreement_country", period) * person("eligible_under_social_agreement", period)
+    return tristate.all_of(
+      tristate.get(person, "resides_in_agreement_country", period),
+      tristate.get(person, "eligible_under_social_agreement", period),
+      )
 
 class oas_eligible_foreign_residency_requirement_satisfied_known(Variable):
   value_type = bool
@@ -322,12 +342,7 @@ class oas_eligible_foreign_residency_requirement_satisfied_known(Variable):
   label = "Whether we know if the person satisfies the foreign residency option of the residency requirement for Old Age Security"
 
   def formula(person, period, parameters):
-    # A conjunction is known if one of its elements is known false, or if all of its elements are known.
-    not_resides_in_country = person("resides_in_agreement_country_known", period) * not_(person("resides_in_agreement_country", period))
-    not_eligible = person("eligible_under_social_agreement_known", period) * not_(person("eligible_under_social_agreement", period))
-    one_false = not_resides_in_country + not_eligible
-    all_known = person("resides_in_agreement_country_known", period) * person("eligible_under_social_agreement_known", period)
-    return all_known + one_false
+    return tristate.known(person, "oas_eligible_foreign_residency_requirement_satisfied", period, parameters)
 
 class oas_eligible_income_requirement_satisfied(Variable):
   value_type = bool
@@ -335,9 +350,9 @@ class oas_eligible_income_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the income requirement for OAS is satisfied"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    satisfied = person('oas_eligible__income_not_above_limit',period)
-    return satisfied
+    return tristate.get(person, 'oas_eligible__income_not_above_limit', period)
 
 class oas_eligible_income_requirement_satisfied_known(Variable):
   value_type = bool
@@ -346,8 +361,7 @@ class oas_eligible_income_requirement_satisfied_known(Variable):
   label = "Whether we know if the income requirement for OAS is satisfied"
 
   def formula(person, period, parameters):
-    known = person('oas_eligible__income_not_above_limit_known',period)
-    return known
+    return tristate.known(person, "oas_eligible_income_requirement_satisfied", period, parameters)
 
 class oas_eligible__income_not_above_limit(Variable):
   value_type = bool
@@ -355,9 +369,10 @@ class oas_eligible__income_not_above_limit(Variable):
   definition_period = DAY
   label = "Whether the peron's income is not above the limit for OAS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    not_income_too_high = not_(person("income",period.this_year) > parameters(period).benefits.old_age_security.max_income)
-    return not_income_too_high
+    income = tristate.get(person, "income", period.this_year)
+    return income.apply(lambda amount: not_(amount > parameters(period).benefits.old_age_security.max_income))
 
 class oas_eligible__income_not_above_limit_known(Variable):
   value_type = bool
@@ -366,8 +381,7 @@ class oas_eligible__income_not_above_limit_known(Variable):
   label = "Whether we know if the peron's income is not above the limit for OAS eligibility"
 
   def formula(person, period, parameters):
-    known = person("income_known",period.this_year)
-    return known
+    return tristate.known(person, "oas_eligible__income_not_above_limit", period, parameters)
 
 class oas_eligible_age_requirement_satisfied(Variable):
   value_type = bool
@@ -375,9 +389,9 @@ class oas_eligible_age_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the age requirement for OAS is satisfied"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    satisfied = person('oas_eligible__age_above_eligibility', period)
-    return satisfied
+    return tristate.get(person, 'oas_eligible__age_above_eligibility', period)
 
 class oas_eligible_age_requirement_satisfied_known(Variable):
   value_type = bool
@@ -386,8 +400,7 @@ class oas_eligible_age_requirement_satisfied_known(Variable):
   label = "Whether we know if the age requirement for OAS is satisfied"
 
   def formula(person, period, parameters):
-    known = person('oas_eligible__age_above_eligibility_known', period)
-    return known
+    return tristate.known(person, "oas_eligible_age_requirement_satisfied", period, parameters)
 
 
 class oas_eligible__age_above_eligibility(Variable):
@@ -396,9 +409,10 @@ class oas_eligible__age_above_eligibility(Variable):
   definition_period = DAY
   label = "Whether the person's age is above the OAS age minimum for eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    age_requirement_met = person("age", period) >= parameters(period).benefits.old_age_security.eligibility_age
-    return age_requirement_met
+    age = tristate.get(person, "age", period)
+    return age.apply(lambda years: years >= parameters(period).benefits.old_age_security.eligibility_age)
 
 class oas_eligible__age_above_eligibility_known(Variable):
   value_type = bool
@@ -407,18 +421,22 @@ class oas_eligible__age_above_eligibility_known(Variable):
   label = "Whether we know if the person's age is above the OAS age minimum for eligibility"
 
   def formula(person, period, parameters):
-    known = person("age_known", period)
-    return known
+    return tristate.known(person, "oas_eligible__age_above_eligibility", period, parameters)
+
 
-    
 class gis_eligible(Variable):
   value_type = bool
   entity = Person
   definition_period = DAY
   label = "Whether Person is eligible for Guaranteed Income Supplement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person('oas_eligible',period) * person('gis_eligible_income',period) * person('gis_eligible_age', period)
+    return tristate.all_of(
+      tristate.get(person, 'oas_eligible', period),
+      tristate.get(person, 'gis_eligible_income', period),
+      tristate.get(person, 'gis_eligible_age', period),
+      )
 
 class gis_eligible_known(Variable):
   value_type = bool
@@ -427,11 +445,7 @@ class gis_eligible_known(Variable):
   label = "Whether it is known if the Person is eligible for Guaranteed Income Supplement"
 
   def formula(person, period, parameters):
-    all_known = person('oas_eligible_known',period) * person('gis_eligible_income_known', period) * person('gis_eligible_age_known', period)
-    oas_false = person('oas_eligible_known',period) * not_(person('oas_eligible',period))
-    income_false = person('gis_eligible_income_known', period) * not_(person('gis_eligible_income', period))
-    age_false = person('gis_eligible_age_known', period) * person('gis_eligible_age', period)
-    any_false = oas_false + income_false + age_false
+    return tristate.known(person, "gis_eligible", period, parameters)
 
 class gis_eligible_age(Variable):
   value_type = bool
@@ -439,8 +453,10 @@ class gis_eligible_age(Variable):
   definition_period = DAY
   label = "Whether the person's age meets the requirements for Guaranteed Income Supplement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("age",period) >= parameters(period).benefits.old_age_security.eligibility_age
+    age = tristate.get(person, "age", period)
+    return age.apply(lambda years: years >= parameters(period).benefits.old_age_security.eligibility_age)
 
 class gis_eligible_age_known(Variable):
   value_type = bool
@@ -449,7 +465,7 @@ class gis_eligible_age_known(Variable):
   label = "Whether we know if the person's age meets the requirements for Guaranteed Income Supplement"
 
   def formula(person, period, parameters):
-    return person("age_known",period)
+    return tristate.known(person, "gis_eligible_age", period, parameters)
 
 class gis_eligible_income(Variable):
   value_type = bool
@@ -457,9 +473,11 @@ class gis_eligible_income(Variable):
   definition_period = DAY
   label = "Whether the person's income meets the requirements for Guaranteed Income Supplement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    income_requirement = person("income",period.this_year) < person("gis_eligible_income_max", period)
-    return income_requirement
+    income = tristate.get(person, "income", period.this_year)
+    max_income = tristate.get(person, "gis_eligible_income_max", period)
+    return tristate.TriState(income.value < max_income.value, income.known * max_income.known)
 
 class gis_eligible_income_known(Variable):
   value_type = bool
@@ -468,7 +486,7 @@ class gis_eligible_income_known(Variable):
   label = "Whether we know if the person's income meets the requirements for Guaranteed Income Supplement"
 
   def formula(person, period, parameters):
-    return person("income_known", period.this_year) * person("gis_eligible_income_max_known", period)
+    return tristate.known(person, "gis_eligible_income", period, parameters)
 
 class gis_eligible_income_max(Variable):
   value_type = int
@@ -476,14 +494,20 @@ class gis_eligible_income_max(Variable):
   definition_period = DAY
   label = "The person's maximum income for GIS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     max_single = parameters(period).benefits.old_age_security.guaranteed_income_supplement.maximum_income_single
     max_partner = parameters(period).benefits.old_age_security.guaranteed_income_supplement.maximum_income_partnered
     max_both = parameters(period).benefits.old_age_security.guaranteed_income_supplement.maximum_income_two_recipients
 
-    max_income = where(person('gis_eligible_income_max_partnered', period),max_partner,max_single)
+    partnered = tristate.get(person, 'gis_eligible_income_max_partnered', period)
+    max_income = where(partnered.value,max_partner,max_single)
     max_income = where(person("partner_receiving_oas",period),max_both,max_income)
-    return max_income
+
+    # The max is known if the person is not partnered, or if their marital status and partner receiving is known
+    not_partnered = not_(partnered.value) * partnered.known
+    both_known = person('marital_status_known',period) * person("partner_receiving_oas_known", period)
+    return tristate.TriState(max_income, not_partnered + both_known)
 
 class gis_eligible_income_max_known(Variable):
   value_type = bool
@@ -492,11 +516,7 @@ class gis_eligible_income_max_known(Variable):
   label = "Whether we know the person's maximum income for GIS eligibility"
 
   def formula(person, period, parameters):
-    # The max is known if the person is not partnered, or if their marital status and partner receiving is known
-
-    not_partnered = not_(person('gis_eligible_income_max_partnered',period)) * person('gis_eligible_income_max_partnered_known',period)
-    both_known = person('marital_status_known',period) * person("partner_receiving_oas_known", period)
-    return not_partnered + both_known
+    return tristate.known(person, "gis_eligible_income_max", period, parameters)
 
 class gis_eligible_income_max_partnered(Variable):
   value_type = bool
@@ -504,10 +524,9 @@ class gis_eligible_income_max_partnered(Variable):
   definition_period = DAY
   label = "Whether the person has a partner for GIS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    married = person('marital_status',period) == marital_status_options.MARRIED
-    common_law = person('marital_status',period) == marital_status_options.COMMONLAW
-    return married + common_law
+    return tristate.get(person, 'marital_status', period).apply(is_partnered)
 
 class gis_eligible_income_max_partnered_known(Variable):
   value_type = bool
@@ -516,7 +535,7 @@ class gis_eligible_income_max_partnered_known(Variable):
   label = "Whether we know if the person has a partner for GIS eligibility"
 
   def formula(person, period, parameters):
-    return person('marital_status_known',period)
+    return tristate.known(person, "gis_eligible_income_max_partnered", period, parameters)
 
 # class gis_eligible_reason(Variable):
 #   value_type = str
@@ -550,13 +569,15 @@ class allowance_eligible(Variable):
   definition_period = DAY
   label = "Whether Person is eligible for allowance"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    residence_requirement = person("allowance_residence_requirement_satisfied", period)
-    partnered_requirement = person("allowance_partnered_requirement_satisfied", period)
-    partner_receiving_requirement = person("allowance_partner_receiving_requirement_satisfied", period)
-    income_requirement = person("allowance_income_requirement_satisfied", period)
-    age_requirement = person("allowance_age_requirement_satisfied", period)
-    return residence_requirement * partnered_requirement * partner_receiving_requirement * income_requirement * age_requirement 
+    return tristate.all_of(
+      tristate.get(person, "allowance_residence_requirement_satisfied", period),
+      tristate.get(person, "allowance_partnered_requirement_satisfied", period),
+      tristate.get(person, "allowance_partner_receiving_requirement_satisfied", period),
+      tristate.get(person, "allowance_income_requirement_satisfied", period),
+      tristate.get(person, "allowance_age_requirement_satisfied", period),
+      )
 
 
 class allowance_eligible_known(Variable):
@@ -566,15 +587,7 @@ class allowance_eligible_known(Variable):
   label = "Whether it is known if Person is eligible for Allowance"
 
   def formula(person, period, parameters):
-    # A conjunction is known if any part is known false, or all parts are known
-    age_false = person('allowance_age_requirement_satisfied_known', period) * not_(person('allowance_age_requirement_satisfied', period))
-    partnered_false = person('allowance_partnered_requirement_satisfied_known', period) * not_(person('allowance_partnered_requirement_satisfied', period))
-    partner_receiving_false = person('allowance_partner_receiving_requirement_satisfied_known', period) * not_(person('allowance_partner_receiving_requirement_satisfied', period))
-    income_false = person('allowance_income_requirement_satisfied_known', period) * not_(person('allowance_income_requirement_satisfied', period))
-    residence_false = person('allowance_residence_requirement_satisfied_known', period) * not_(person('allowance_residence_requirement_satisfied', period))
-    any_false = age_false + partnered_false + income_false + residence_false + partner_receiving_false
-    all_known = person('allowance_age_requirement_satisfied_known', period) * person('allowance_partnered_requirement_satisfied_known', period) * person('allowance_income_requirement_satisfied_known', period) * person('allowance_residence_requirement_satisfied_known', period) * person('allowance_partner_receiving_requirement_satisfied_known', period)
-    return any_false + all_known
+    return tristate.known(person, "allowance_eligible", period, parameters)
 
 class allowance_residence_requirement_satisfied(Variable):
   value_type = bool
@@ -582,8 +595,12 @@ class allowance_residence_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("allowance_residence_canadian_satisfied", period) + person("allowance_residence_foreign_satisfied", period)
+    return tristate.any_of(
+      tristate.get(person, "allowance_residence_canadian_satisfied", period),
+      tristate.get(person, "allowance_residence_foreign_satisfied", period),
+      )
 
 class allowance_residence_requirement_satisfied_known(Variable):
   value_type = bool
@@ -592,12 +609,7 @@ class allowance_residence_requirement_satisfied_known(Variable):
   label = "Whether the person meets the residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    # A disjunction is known if either is known true, or both are known
-    canadian_true = person("allowance_residence_canadian_satisfied_known", period) * person("allowance_residence_canadian_satisfied", period)
-    foreign_true = person("allowance_residence_foreign_satisfied_known", period) * person("allowance_residence_foreign_satisfied", period)
-    either_true = canadian_true + foreign_true
-    both_known = person("allowance_residence_canadian_satisfied_known", period) * person("allowance_residence_foreign_satisfied_known", period)
-    return either_true + both_known
+    return tristate.known(person, "allowance_residence_requirement_satisfied", period, parameters)
 
 class allowance_residence_canadian_satisfied(Variable):
   value_type = bool
@@ -605,8 +617,12 @@ class allowance_residence_canadian_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the Canadian residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("allowance_residence_canadian_status_satisfied", period) * person("allowance_residence_duration_satisfied", period)
+    return tristate.all_of(
+      tristate.get(person, "allowance_residence_canadian_status_satisfied", period),
+      tristate.get(person, "allowance_residence_duration_satisfied", period),
+      )
 
 class allowance_residence_canadian_satisfied_known(Variable):
   value_type = bool
@@ -615,12 +631,7 @@ class allowance_residence_canadian_satisfied_known(Variable):
   label = "Whether it is known if the person meets the Canadian residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    # A conjunction is known if either is known false or both are known
-    canadian_false = person("allowance_residence_canadian_status_satisfied_known", period) * not_(person("allowance_residence_canadian_status_satisfied", period))
-    duration_false = person("allowance_residence_duration_satisfied_known", period) * not_(person("allowance_residence_duration_satisfied", period))
-    either_false = canadian_false + duration_false
-    both_known = person("allowance_residence_canadian_status_satisfied_known", period) * person("allowance_residence_duration_satisfied_known", period)
-    return either_false + both_known
+    return tristate.known(person, "allowance_residence_canadian_satisfied", period, parameters)
 
 class allowance_residence_canadian_status_satisfied(Variable):
   value_type = bool
@@ -628,12 +639,9 @@ class allowance_residence_canadian_status_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    citizen = person("legal_status",period) == legal_status_options.CANADIAN_CITIZEN
-    indian = person("legal_status",period) == legal_status_options.STATUS_INDIAN
-    perm = person("legal_status",period) == legal_status_options.PERMANENT_RESIDENT
-    temp = person("legal_status",period) == legal_status_options.TEMPORARY_RESIDENT
-    return citizen + indian + perm + temp
+    return tristate.get(person, "legal_status", period).apply(has_qualifying_legal_status)
 
 class allowance_residence_canadian_status_satisfied_known(Variable):
   value_type = bool
@@ -642,7 +650,7 @@ class allowance_residence_canadian_status_satisfied_known(Variable):
   label = "Whether it is known if the person meets the residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    return person("legal_status_known",period)
+    return tristate.known(person, "allowance_residence_canadian_status_satisfied", period, parameters)
 
 
 class allowance_residence_duration_satisfied(Variable):
@@ -651,9 +659,10 @@ class allowance_residence_duration_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     minimum_years = parameters(period).benefits.old_age_security.allowance.minimum_years
-    return person("years_in_canada_since_18", period) >= minimum_years
+    return tristate.get(person, "years_in_canada_since_18", period).apply(lambda years: years >= minimum_years)
 
 
 class allowance_residence_duration_satisfied_known(Variable):
@@ -663,7 +672,7 @@ class allowance_residence_duration_satisfied_known(Variable):
   label = "Whether we know if the person meets the residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    return person("years_in_canada_since_18_known", period)
+    return tristate.known(person, "allowance_residence_duration_satisfied", period, parameters)
 
 class allowance_residence_foreign_satisfied(Variable):
   value_type = bool
@@ -671,8 +680,13 @@ class allowance_residence_foreign_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the foreign residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("allowance_residence_foreign_in_agreement_country_satisfied", period) * person("allowance_residence_foreign_qualified_satisfied", period) * person("allowance_residence_duration_satisfied", period)
+    return tristate.all_of(
+      tristate.get(person, "allowance_residence_foreign_in_agreement_country_satisfied", period),
+      tristate.get(person, "allowance_residence_foreign_qualified_satisfied", period),
+      tristate.get(person, "allowance_residence_duration_satisfied", period),
+      )
 
 class allowance_residence_foreign_satisfied_known(Variable):
   value_type = bool
@@ -681,13 +695,7 @@ class allowance_residence_foreign_satisfied_known(Variable):
   label = "Whether it is known if the person meets the foreign residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    # Conjunctions are known if any are known false or all are known.
-    in_agreement_false = person("allowance_residence_foreign_in_agreement_country_satisfied_known", period) * not_(person("allowance_residence_foreign_in_agreement_country_satisfied", period)) 
-    qualified_false = person("allowance_residence_foreign_qualified_satisfied_known", period) * not_(person("allowance_residence_foreign_qualified_satisfied", period))
-    duration_false = person("allowance_residence_duration_satisfied_known", period) * not_(person("allowance_residence_duration_satisfied", period))
-    any_false = in_agreement_false + qualified_false + duration_false
-    all_known = person("allowance_residence_foreign_in_agreement_country_satisfied_known", period) * person("allowance_residence_foreign_qualified_satisfied_known", period) * person("allowance_residence_duration_satisfied_known", period)
-    return any_false + all_known
+    return tristate.known(person, "allowance_residence_foreign_satisfied", period, parameters)
 
 class allowance_residence_foreign_in_agreement_country_satisfied(Variable):
   value_type = bool
@@ -695,8 +703,9 @@ class allowance_residence_foreign_in_agreement_country_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the foreign residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("resides_in_agreement_country", period)
+    return tristate.get(person, "resides_in_agreement_country", period)
 
 class allowance_residence_foreign_in_agreement_country_satisfied_known(Variable):
   value_type = bool
@@ -705,7 +714,7 @@ class allowance_residence_foreign_in_agreement_country_satisfied_known(Variable)
   label = "Whether it is known if the person meets the foreign residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    return person("resides_in_agreement_country_known", period)
+    return tristate.known(person, "allowance_residence_foreign_in_agreement_country_satisfied", period, parameters)
 
 
 class allowance_residence_foreign_qualified_satisfied(Variable):
@@ -714,8 +723,9 @@ class allowance_residence_foreign_qualified_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the foreign residence requirements for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("eligible_under_social_agreement", period)
+    return tristate.get(person, "eligible_under_social_agreement", period)
 
 
 class allowance_residence_foreign_qualified_satisfied_known(Variable):
@@ -725,7 +735,7 @@ class allowance_residence_foreign_qualified_satisfied_known(Variable):
   label = "Whether it is known if the person meets the foreign residence requirements for Allowance eligibility"
 
   def formula(person, period, parameters):
-    return person("eligible_under_social_agreement_known", period)
+    return tristate.known(person, "allowance_residence_foreign_qualified_satisfied", period, parameters)
 
 
 class allowance_partnered_requirement_satisfied(Variable):
@@ -734,10 +744,9 @@ class allowance_partnered_requirement_satisfied(Variable):
   definition_period = DAY
   label = ""
 
+  @tristate.fused
   def formula(person, period, parameters):
-    married = person('marital_status',period) == marital_status_options.MARRIED
-    common_law = person('marital_status',period) == marital_status_options.COMMONLAW
-    return married + common_law
+    return tristate.get(person, 'marital_status', period).apply(is_partnered)
 
 class allowance_partnered_requirement_satisfied_known(Variable):
   value_type = bool
@@ -746,11 +755,7 @@ class allowance_partnered_requirement_satisfied_known(Variable):
   label = ""
 
   def formula(person, period, parameters):
-    married_true = (person('marital_status',period) == marital_status_options.MARRIED) * person('marital_status_known', period)
-    common_law_true = (person('marital_status',period) == marital_status_options.COMMONLAW) * person('marital_status_known', period)
-    either_true = married_true + common_law_true
-    both_known = person("marital_status_known", period)
-    return either_true + both_known
+    return tristate.known(person, "allowance_partnered_requirement_satisfied", period, parameters)
 
 class allowance_partner_receiving_requirement_satisfied(Variable):
   value_type = bool
@@ -758,8 +763,9 @@ class allowance_partner_receiving_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the requirement for Allowance that the partner be receiving OAS is satisfied"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person('partner_receiving_oas',period)
+    return tristate.get(person, 'partner_receiving_oas', period)
 
 class allowance_partner_receiving_requirement_satisfied_known(Variable):
   value_type = bool
@@ -768,7 +774,7 @@ class allowance_partner_receiving_requirement_satisfied_known(Variable):
   label = "Whether it is known if the requirement for Allowance that the partner be receiving OAS is satisfied"
 
   def formula(person, period, parameters):
-    return person('partner_receiving_oas_known',period)
+    return tristate.known(person, "allowance_partner_receiving_requirement_satisfied", period, parameters)
 
 class allowance_income_requirement_satisfied(Variable):
   value_type = bool
@@ -776,10 +782,10 @@ class allowance_income_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the peron's income meets the requirement for allowance"
 
+  @tristate.fused
   def formula(person, period, parameters):
     income_cap = parameters(period).benefits.old_age_security.allowance.income_cap
-    income_requirement = person('income',period.this_year) < income_cap
-    return income_requirement
+    return tristate.get(person, 'income', period.this_year).apply(lambda income: income < income_cap)
 
 class allowance_income_requirement_satisfied_known(Variable):
   value_type = bool
@@ -788,7 +794,7 @@ class allowance_income_requirement_satisfied_known(Variable):
   label = "Whether it is known if the person's income meets the requirement for allowance"
 
   def formula(person, period, parameters):
-    return person('income_known',period.this_year)
+    return tristate.known(person, "allowance_income_requirement_satisfied", period, parameters)
 
 class allowance_age_requirement_satisfied(Variable):
   value_type = bool
@@ -796,8 +802,12 @@ class allowance_age_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the age requirement is satisfied for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("allowance_age_requirement_minimum_satisfied", period) * person("allowance_age_requirement_cap_satisfied", period)
+    return tristate.all_of(
+      tristate.get(person, "allowance_age_requirement_minimum_satisfied", period),
+      tristate.get(person, "allowance_age_requirement_cap_satisfied", period),
+      )
 
 class allowance_age_requirement_satisfied_known(Variable):
   value_type = bool
@@ -806,12 +816,7 @@ class allowance_age_requirement_satisfied_known(Variable):
   label = "Whether it is known if the age requirement is satisfied for Allowance eligibility"
 
   def formula(person, period, parameters):
-    # A conjunction is known if all the elements are known or any element in known false.
-    min_false = person("allowance_age_requirement_minimum_satisfied_known", period) * not_(person("allowance_age_requirement_minimum_satisfied", period))
-    cap_false = person("allowance_age_requirement_cap_satisfied_known", period) * not_(person("allowance_age_requirement_cap_satisfied", period))
-    any_false = min_false + cap_false
-    all_known = person("allowance_age_requirement_minimum_satisfied_known", period) * person("allowance_age_requirement_cap_satisfied_known", period)
-    return any_false + all_known
+    return tristate.known(person, "allowance_age_requirement_satisfied", period, parameters)
 
 class allowance_age_requirement_minimum_satisfied(Variable):
   value_type = bool
@@ -819,9 +824,10 @@ class allowance_age_requirement_minimum_satisfied(Variable):
   definition_period = DAY
   label = "Whether the minimum age requirement is satisfied for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     minimum_age = parameters(period).benefits.old_age_security.allowance.minimum_age
-    return person("age", period) >= minimum_age 
+    return tristate.get(person, "age", period).apply(lambda age: age >= minimum_age)
 
 class allowance_age_requirement_minimum_satisfied_known(Variable):
   value_type = bool
@@ -830,7 +836,7 @@ class allowance_age_requirement_minimum_satisfied_known(Variable):
   label = "Whether it is known if the minimum age requirement is satisfied for Allowance eligibility"
 
   def formula(person, period, parameters):
-    return person("age_known", period) 
+    return tristate.known(person, "allowance_age_requirement_minimum_satisfied", period, parameters)
 
 class allowance_age_requirement_cap_satisfied(Variable):
   value_type = bool
@@ -838,9 +844,10 @@ class allowance_age_requirement_cap_satisfied(Variable):
   definition_period = DAY
   label = "Whether the maximum age requirement is satisfied for Allowance eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     cap = parameters(period).benefits.old_age_security.eligibility_age
-    return person("age", period) < cap
+    return tristate.get(person, "age", period).apply(lambda age: age < cap)
 
 
 class allowance_age_requirement_cap_satisfied_known(Variable):
@@ -850,7 +857,7 @@ class allowance_age_requirement_cap_satisfied_known(Variable):
   label = "Whether it is known if the maximum age requirement is satisfied for Allowance eligibility"
 
   def formula(person, period, parameters):
-    return person("age_known", period)
+    return tristate.known(person, "allowance_age_requirement_cap_satisfied", period, parameters)
 
 
 # class allowance_eligible_reason(Variable):
@@ -903,13 +910,14 @@ class afs_eligible(Variable):
   definition_period = DAY
   label = "Whether Person is eligible for allowance for survivor"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    age_requirement = person('afs_age_requirement_satisfied', period)
-    widowed_requirement = person('afs_widowed_requirement_satisfied', period)
-    income_requirement = person('afs_income_requirement_satisfied', period)
-    residence_requirement = person('afs_residence_requirement_satisfied', period)
-
-    return age_requirement * widowed_requirement * income_requirement * residence_requirement
+    return tristate.all_of(
+      tristate.get(person, 'afs_age_requirement_satisfied', period),
+      tristate.get(person, 'afs_widowed_requirement_satisfied', period),
+      tristate.get(person, 'afs_income_requirement_satisfied', period),
+      tristate.get(person, 'afs_residence_requirement_satisfied', period),
+      )
 
 class afs_eligible_known(Variable):
   value_type = bool
@@ -918,14 +926,7 @@ class afs_eligible_known(Variable):
   label = "Whether it is known if Person is eligible for allowance for survivor"
 
   def formula(person, period, parameters):
-    # A conjunction is known if any part is known false, or all parts are known
-    age_false = person('afs_age_requirement_satisfied_known', period) * not_(person('afs_age_requirement_satisfied', period))
-    widowed_false = person('afs_widowed_requirement_satisfied_known', period) * not_(person('afs_widowed_requirement_satisfied', period))
-    income_false = person('afs_income_requirement_satisfied_known', period) * not_(person('afs_income_requirement_satisfied', period))
-    residence_false = person('afs_residence_requirement_satisfied_known', period) * not_(person('afs_residence_requirement_satisfied', period))
-    any_false = age_false + widowed_false + income_false + residence_false
-    all_known = person('afs_age_requirement_satisfied_known', period) * person('afs_widowed_requirement_satisfied_known', period) * person('afs_income_requirement_satisfied_known', period) * person('afs_residence_requirement_satisfied_known', period)
-    return any_false + all_known
+    return tristate.known(person, "afs_eligible", period, parameters)
 
 class afs_age_requirement_satisfied(Variable):
   value_type = bool
@@ -933,8 +934,12 @@ class afs_age_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the age requirement is satisfied for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("afs_age_requirement_minimum_satisfied", period) * person("afs_age_requirement_cap_satisfied", period)
+    return tristate.all_of(
+      tristate.get(person, "afs_age_requirement_minimum_satisfied", period),
+      tristate.get(person, "afs_age_requirement_cap_satisfied", period),
+      )
 
 class afs_age_requirement_satisfied_known(Variable):
   value_type = bool
@@ -943,12 +948,7 @@ class afs_age_requirement_satisfied_known(Variable):
   label = "Whether it is known if the age requirement is satisfied for AFS eligibility"
 
   def formula(person, period, parameters):
-    # A conjunction is known if all the elements are known or any element in known false.
-    min_false = person("afs_age_requirement_minimum_satisfied_known", period) * not_(person("afs_age_requirement_minimum_satisfied", period))
-    cap_false = person("afs_age_requirement_cap_satisfied_known", period) * not_(person("afs_age_requirement_cap_satisfied", period))
-    any_false = min_false + cap_false
-    all_known = person("afs_age_requirement_minimum_satisfied_known", period) * person("afs_age_requirement_cap_satisfied_known", period)
-    return any_false + all_known
+    return tristate.known(person, "afs_age_requirement_satisfied", period, parameters)
 
 class afs_age_requirement_minimum_satisfied(Variable):
   value_type = bool
@@ -956,9 +956,10 @@ class afs_age_requirement_minimum_satisfied(Variable):
   definition_period = DAY
   label = "Whether the minimum age requirement is satisfied for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     minimum_age = parameters(period).benefits.old_age_security.allowance.minimum_age
-    return person("age", period) >= minimum_age 
+    return tristate.get(person, "age", period).apply(lambda age: age >= minimum_age)
 
 class afs_age_requirement_minimum_satisfied_known(Variable):
   value_type = bool
@@ -967,7 +968,7 @@ class afs_age_requirement_minimum_satisfied_known(Variable):
   label = "Whether it is known if the minimum age requirement is satisfied for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person("age_known", period) 
+    return tristate.known(person, "afs_age_requirement_minimum_satisfied", period, parameters)
 
 class afs_age_requirement_cap_satisfied(Variable):
   value_type = bool
@@ -975,9 +976,10 @@ class afs_age_requirement_cap_satisfied(Variable):
   definition_period = DAY
   label = "Whether the maximum age requirement is satisfied for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     cap = parameters(period).benefits.old_age_security.eligibility_age
-    return person("age", period) < cap
+    return tristate.get(person, "age", period).apply(lambda age: age < cap)
 
 
 class afs_age_requirement_cap_satisfied_known(Variable):
@@ -987,7 +989,7 @@ class afs_age_requirement_cap_satisfied_known(Variable):
   label = "Whether it is known if the maximum age requirement is satisfied for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person("age_known", period)
+    return tristate.known(person, "afs_age_requirement_cap_satisfied", period, parameters)
 
 
 class afs_widowed_requirement_satisfied(Variable):
@@ -996,12 +998,9 @@ class afs_widowed_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the widowed requirement for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    married = person('marital_status',period) == marital_status_options.MARRIED
-    common_law = person('marital_status',period) == marital_status_options.COMMONLAW
-    widowed = person('marital_status',period) == marital_status_options.WIDOWED
-    widowed_requirement = widowed * not_(married + common_law)
-    return widowed_requirement
+    return tristate.get(person, 'marital_status', period).apply(lambda marital_status: marital_status == marital_status_options.WIDOWED)
 
 class afs_widowed_requirement_satisfied_known(Variable):
   value_type = bool
@@ -1010,7 +1009,7 @@ class afs_widowed_requirement_satisfied_known(Variable):
   label = "Whether it is known if the person meets the widowed requirement for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person('marital_status_known', period)
+    return tristate.known(person, "afs_widowed_requirement_satisfied", period, parameters)
 
 class afs_income_requirement_satisfied(Variable):
   value_type = bool
@@ -1018,10 +1017,10 @@ class afs_income_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the income requirement for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     income_cap = parameters(period).benefits.old_age_security.allowance_for_survivor.income_cap
-    income_requirement = person('income',period.this_year) < income_cap
-    return income_requirement
+    return tristate.get(person, 'income', period.this_year).apply(lambda income: income < income_cap)
 
 class afs_income_requirement_satisfied_known(Variable):
   value_type = bool
@@ -1030,7 +1029,7 @@ class afs_income_requirement_satisfied_known(Variable):
   label = "Whether it is known if the person meets the income requirement for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person('income_known', period.this_year)
+    return tristate.known(person, "afs_income_requirement_satisfied", period, parameters)
 
 
 class afs_residence_requirement_satisfied(Variable):
@@ -1039,8 +1038,12 @@ class afs_residence_requirement_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("afs_residence_canadian_satisfied", period) + person("afs_residence_foreign_satisfied", period)
+    return tristate.any_of(
+      tristate.get(person, "afs_residence_canadian_satisfied", period),
+      tristate.get(person, "afs_residence_foreign_satisfied", period),
+      )
 
 class afs_residence_requirement_satisfied_known(Variable):
   value_type = bool
@@ -1049,12 +1052,7 @@ class afs_residence_requirement_satisfied_known(Variable):
   label = "Whether the person meets the residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    # A disjunction is known if either is known true, or both are known
-    canadian_true = person("afs_residence_canadian_satisfied_known", period) * person("afs_residence_canadian_satisfied", period)
-    foreign_true = person("afs_residence_foreign_satisfied_known", period) * person("afs_residence_foreign_satisfied", period)
-    either_true = canadian_true + foreign_true
-    both_known = person("afs_residence_canadian_satisfied_known", period) * person("afs_residence_foreign_satisfied_known", period)
-    return either_true + both_known
+    return tristate.known(person, "afs_residence_requirement_satisfied", period, parameters)
 
 class afs_residence_canadian_satisfied(Variable):
   value_type = bool
@@ -1062,8 +1060,12 @@ class afs_residence_canadian_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the Canadian residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("afs_residence_canadian_status_satisfied", period) * person("afs_residence_duration_satisfied", period)
+    return tristate.all_of(
+      tristate.get(person, "afs_residence_canadian_status_satisfied", period),
+      tristate.get(person, "afs_residence_duration_satisfied", period),
+      )
 
 class afs_residence_canadian_satisfied_known(Variable):
   value_type = bool
@@ -1072,12 +1074,7 @@ class afs_residence_canadian_satisfied_known(Variable):
   label = "Whether it is known if the person meets the Canadian residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    # A conjunction is known if either is known false or both are known
-    canadian_false = person("afs_residence_canadian_status_satisfied_known", period) * not_(person("afs_residence_canadian_status_satisfied", period))
-    duration_false = person("afs_residence_duration_satisfied_known", period) * not_(person("afs_residence_duration_satisfied", period))
-    either_false = canadian_false + duration_false
-    both_known = person("afs_residence_canadian_status_satisfied_known", period) * person("afs_residence_duration_satisfied_known", period)
-    return either_false + both_known
+    return tristate.known(person, "afs_residence_canadian_satisfied", period, parameters)
 
 class afs_residence_canadian_status_satisfied(Variable):
   value_type = bool
@@ -1085,12 +1082,9 @@ class afs_residence_canadian_status_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    citizen = person("legal_status",period) == legal_status_options.CANADIAN_CITIZEN
-    indian = person("legal_status",period) == legal_status_options.STATUS_INDIAN
-    perm = person("legal_status",period) == legal_status_options.PERMANENT_RESIDENT
-    temp = person("legal_status",period) == legal_status_options.TEMPORARY_RESIDENT
-    return citizen + indian + perm + temp
+    return tristate.get(person, "legal_status", period).apply(has_qualifying_legal_status)
 
 class afs_residence_canadian_status_satisfied_known(Variable):
   value_type = bool
@@ -1099,7 +1093,7 @@ class afs_residence_canadian_status_satisfied_known(Variable):
   label = "Whether it is known if the person meets the residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person("legal_status_known",period)
+    return tristate.known(person, "afs_residence_canadian_status_satisfied", period, parameters)
 
 
 class afs_residence_duration_satisfied(Variable):
@@ -1108,9 +1102,10 @@ class afs_residence_duration_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
     minimum_years = parameters(period).benefits.old_age_security.allowance.minimum_years
-    return person("years_in_canada_since_18", period) >= minimum_years
+    return tristate.get(person, "years_in_canada_since_18", period).apply(lambda years: years >= minimum_years)
 
 
 class afs_residence_duration_satisfied_known(Variable):
@@ -1120,7 +1115,7 @@ class afs_residence_duration_satisfied_known(Variable):
   label = "Whether we know if the person meets the residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person("years_in_canada_since_18_known", period)
+    return tristate.known(person, "afs_residence_duration_satisfied", period, parameters)
 
 class afs_residence_foreign_satisfied(Variable):
   value_type = bool
@@ -1128,8 +1123,13 @@ class afs_residence_foreign_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the foreign residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("afs_residence_foreign_in_agreement_country_satisfied", period) * person("afs_residence_foreign_qualified_satisfied", period) * person("afs_residence_duration_satisfied", period)
+    return tristate.all_of(
+      tristate.get(person, "afs_residence_foreign_in_agreement_country_satisfied", period),
+      tristate.get(person, "afs_residence_foreign_qualified_satisfied", period),
+      tristate.get(person, "afs_residence_duration_satisfied", period),
+      )
 
 class afs_residence_foreign_satisfied_known(Variable):
   value_type = bool
@@ -1138,13 +1138,7 @@ class afs_residence_foreign_satisfied_known(Variable):
   label = "Whether it is known if the person meets the foreign residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    # Conjunctions are known if any are known false or all are known.
-    in_agreement_false = person("afs_residence_foreign_in_agreement_country_satisfied_known", period) * not_(person("afs_residence_foreign_in_agreement_country_satisfied", period)) 
-    qualified_false = person("afs_residence_foreign_qualified_satisfied_known", period) * not_(person("afs_residence_foreign_qualified_satisfied", period))
-    duration_false = person("afs_residence_duration_satisfied_known", period) * not_(person("afs_residence_duration_satisfied", period))
-    any_false = in_agreement_false + qualified_false + duration_false
-    all_known = person("afs_residence_foreign_in_agreement_country_satisfied_known", period) * person("afs_residence_foreign_qualified_satisfied_known", period) * person("afs_residence_duration_satisfied_known", period)
-    return any_false + all_known
+    return tristate.known(person, "afs_residence_foreign_satisfied", period, parameters)
 
 class afs_residence_foreign_in_agreement_country_satisfied(Variable):
   value_type = bool
@@ -1152,8 +1146,9 @@ class afs_residence_foreign_in_agreement_country_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the foreign residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("resides_in_agreement_country", period)
+    return tristate.get(person, "resides_in_agreement_country", period)
 
 class afs_residence_foreign_in_agreement_country_satisfied_known(Variable):
   value_type = bool
@@ -1162,7 +1157,7 @@ class afs_residence_foreign_in_agreement_country_satisfied_known(Variable):
   label = "Whether it is known if the person meets the foreign residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person("resides_in_agreement_country_known", period)
+    return tristate.known(person, "afs_residence_foreign_in_agreement_country_satisfied", period, parameters)
 
 
 class afs_residence_foreign_qualified_satisfied(Variable):
@@ -1171,8 +1166,9 @@ class afs_residence_foreign_qualified_satisfied(Variable):
   definition_period = DAY
   label = "Whether the person meets the foreign residence requirements for AFS eligibility"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    return person("eligible_under_social_agreement", period)
+    return tristate.get(person, "eligible_under_social_agreement", period)
 
 
 class afs_residence_foreign_qualified_satisfied_known(Variable):
@@ -1182,7 +1178,7 @@ class afs_residence_foreign_qualified_satisfied_known(Variable):
   label = "Whether it is known if the person meets the foreign residence requirements for AFS eligibility"
 
   def formula(person, period, parameters):
-    return person("eligible_under_social_agreement_known", period)
+    return tristate.known(person, "afs_residence_foreign_qualified_satisfied", period, parameters)
 
 
 # class afs_eligible_reason(Variable):
@@ -1239,9 +1235,9 @@ class oas_entitlement(Variable):
   definition_period = DAY
   label = "The amount of the person's Old Age Security entitlement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    entitlement = 400.75 * person('oas_eligible',period)
-    return entitlement
+    return tristate.get(person, 'oas_eligible', period).apply(lambda eligible: 400.75 * eligible)
 
 class oas_entitlement_known(Variable):
   value_type = bool
@@ -1250,7 +1246,7 @@ class oas_entitlement_known(Variable):
   label = "Whether we know the amount of the person's Old Age Security entitlement"
 
   def formula(person, period, parameters):
-    return person('oas_eligible_known', period)
+    return tristate.known(person, "oas_entitlement", period, parameters)
 
 class gis_entitlement(Variable):
   value_type = float
@@ -1258,9 +1254,9 @@ class gis_entitlement(Variable):
   definition_period = DAY
   label = "The amount of the person's Guaranteed Income Supplement entitlement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    entitlement = 123.45 * person('gis_eligible',period)
-    return entitlement
+    return tristate.get(person, 'gis_eligible', period).apply(lambda eligible: 123.45 * eligible)
 
 class gis_entitlement_known(Variable):
   value_type = bool
@@ -1269,7 +1265,7 @@ class gis_entitlement_known(Variable):
   label = "Whether we know the amount of the person's Guaranteed Income Supplement entitlement"
 
   def formula(person, period, parameters):
-    return person('gis_eligible_known',period)
+    return tristate.known(person, "gis_entitlement", period, parameters)
 
 class allowance_entitlement(Variable):
   value_type = float
@@ -1277,9 +1273,9 @@ class allowance_entitlement(Variable):
   definition_period = DAY
   label = "The amount of the person's old age security allowance entitlement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    entitlement = 23.45 * person('allowance_eligible', period)
-    return entitlement
+    return tristate.get(person, 'allowance_eligible', period).apply(lambda eligible: 23.45 * eligible)
 
 class allowance_entitlement_known(Variable):
   value_type = bool
@@ -1288,7 +1284,7 @@ class allowance_entitlement_known(Variable):
   label = "Whether we know the amount of the person's old age security allowance entitlement"
 
   def formula(person, period, parameters):
-    return person('allowance_eligible_known',period)
+    return tristate.known(person, "allowance_entitlement", period, parameters)
 
 class afs_entitlement(Variable):
   value_type = float
@@ -1296,9 +1292,9 @@ class afs_entitlement(Variable):
   definition_period = DAY
   label = "The amount of the person's allowance for survivors entitlement"
 
+  @tristate.fused
   def formula(person, period, parameters):
-    entitlement = 12.34 * person('afs_eligible',period)
-    return entitlement
+    return tristate.get(person, 'afs_eligible', period).apply(lambda eligible: 12.34 * eligible)
 
 class afs_entitlement_known(Variable):
   value_type = bool
@@ -1307,4 +1303,4 @@ class afs_entitlement_known(Variable):
   label = "Whether we know the amount of the person's allowance for survivors entitlement"
 
   def formula(person, period, parameters):
-    return person('afs_eligible_known', period)
\ No newline at end of file
+    return tristate.known(person, "afs_entitlement", period, parameters)
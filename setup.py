@@ -32,6 +32,10 @@ setup(
         "OpenFisca-Core[web-api] >= 35.0.0, < 36.0.0",
         ],
     extras_require = {
+        "batch": [
+            "pandas >= 1.1.0, < 2.0.0",
+            "pyarrow >= 3.0.0, < 13.0.0",
+            ],
         "dev": [
             "autopep8 >= 1.5.4, < 2.0.0",
             "flake8 >= 3.8.0, < 4.0.0",